@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.deadlines import DeadlineExceeded, remaining
+from app.metrics import LATENCY_BUCKETS, Counter, Histogram
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted
+
+    ``status_code`` is 429 when the wait queue is full and 503 when the
+    request waited ``max_wait_ms`` without getting a slot; ``retry_after``
+    is the number of seconds a client should back off.
+    """
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Caps how many requests are in inference at once, with a bounded wait queue
+
+    Requests ``async with controller.slot():`` around their model work.
+    Up to ``max_concurrency`` hold a slot; up to ``max_queue`` more wait
+    for one in arrival order. A request arriving to a full queue is
+    rejected at once, and a queued one that hasn't got a slot within
+    ``max_wait_ms`` gives up, so overload turns into fast rejections
+    instead of ever-growing latency. A released slot is handed directly
+    to the oldest waiter. ``max_concurrency <= 0`` disables the limit.
+
+    A request with a ``deadline`` waits no longer than its deadline
+    allows, and raises DeadlineExceeded instead of AdmissionRejected when
+    the deadline, not ``max_wait_ms``, ran out.
+
+    ``last_shed`` is the ``time.perf_counter()`` of the most recent
+    rejection (None before the first), so readiness can report the
+    instance saturated while it is shedding.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, max_wait_ms: float = 1000,
+                 retry_after_seconds: int = 1):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.retry_after_seconds = max(1, retry_after_seconds)
+        self.in_flight = 0
+        self.last_shed = None
+        self._waiters = deque()
+
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self.admitted = Counter()
+        self.rejected_queue_full = Counter()
+        self.rejected_timeout = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self._admit(0.0)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full.inc()
+            self.last_shed = time.perf_counter()
+            raise AdmissionRejected(429, "admission queue is full", self.retry_after_seconds)
+
+        timeout = self.max_wait
+        left = remaining(deadline)
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded("admission")
+            timeout = min(timeout, left)
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot arrived just as we gave up: pass it on
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            self.queue_wait.observe(time.perf_counter() - started)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            if timeout < self.max_wait:
+                raise DeadlineExceeded("admission")
+            self.rejected_timeout.inc()
+            self.last_shed = time.perf_counter()
+            raise AdmissionRejected(503, f"no inference slot within {self.max_wait * 1000:.0f} ms",
+                                    self.retry_after_seconds)
+        self._admit(time.perf_counter() - started)
+
+    def release(self) -> None:
+        if not self.enabled:
+            return
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)  # the slot moves to the waiter; in_flight is unchanged
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, deadline: Optional[float] = None):
+        await self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def shed_within(self, seconds: float) -> bool:
+        """Whether a request was rejected in the last ``seconds``"""
+        return self.last_shed is not None and time.perf_counter() - self.last_shed < seconds
+
+    def _admit(self, waited: float) -> None:
+        self.admitted.inc()
+        self.queue_wait.observe(waited)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_wait_ms": self.max_wait * 1000,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted.value,
+            "rejected_queue_full": self.rejected_queue_full.value,
+            "rejected_timeout": self.rejected_timeout.value,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+        }
@@ -0,0 +1,79 @@
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+from app.feature_encoder import FeatureEncoder
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# pyarrow is optional and only imported when an Arrow request arrives
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def read_arrow_stream(body: bytes) -> "pa.Table":
+    """Read an Arrow IPC stream; the table's buffers point into ``body`` (no copy)"""
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+
+
+def _as_array(column: "pa.ChunkedArray") -> "pa.Array":
+    # A single chunk is used as is; combine_chunks would copy it
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def arrow_columns(table: "pa.Table", encoder: FeatureEncoder) -> dict:
+    """The model inputs of ``table`` in the form FeatureEncoder.encode_columns takes
+
+    A float32 column without nulls held in one chunk is handed over as a
+    view of the request buffer; other numeric types are cast once, with
+    nulls becoming NaN. Categorical columns are dictionary encoded by
+    Arrow (already dictionary-typed columns are used as they are), so the
+    one-hot encoding is one vectorized assignment per field. Raises
+    ValueError for missing columns or values that can't be read as numbers.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    missing = [name for name in encoder.input_names if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Arrow table is missing columns: {missing}")
+
+    columns = {}
+    for name, _ in encoder.numeric:
+        column = _as_array(table.column(name))
+        if column.type != pa.float32():
+            column = pc.cast(column, pa.float32(), safe=False)
+        columns[name] = column.to_numpy(zero_copy_only=False)
+    for name, _ in encoder.categorical:
+        column = _as_array(table.column(name))
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        codes = pc.fill_null(column.indices, -1).to_numpy(zero_copy_only=False)
+        columns[name] = (codes, column.dictionary.cast(pa.string()).to_pylist())
+    return columns
+
+
+def arrow_predictions(labels: Sequence[str], probabilities: np.ndarray,
+                      return_probabilities: bool = False, top_k: Optional[List[list]] = None) -> bytes:
+    """Predictions as an Arrow IPC stream: ``prediction`` plus optional probability and top-k columns"""
+    import pyarrow as pa
+
+    predicted = probabilities.argmax(axis=1).astype(np.int32)
+    arrays = [pa.DictionaryArray.from_arrays(pa.array(predicted), pa.array(list(labels)))]
+    names = ["prediction"]
+    if return_probabilities:
+        for i, label in enumerate(labels):
+            arrays.append(pa.array(np.ascontiguousarray(probabilities[:, i], dtype=np.float32)))
+            names.append(f"probability_{label}")
+    if top_k is not None:
+        arrays.append(pa.array(top_k, type=pa.list_(pa.struct([("label", pa.string()),
+                                                                ("probability", pa.float32())]))))
+        names.append("top_k")
+    table = pa.Table.from_arrays(arrays, names=names)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
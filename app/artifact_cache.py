@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Optional
+from urllib.parse import quote
+
+from app.metrics import Counter
+
+
+class ArtifactCache:
+    """Content-addressed on-disk cache of downloaded model artifacts
+
+    Layout under ``directory``::
+
+        objects/<sha256>      artifact bytes, named by their own hash
+        refs/<quoted key>     the sha256 a key (e.g. bucket/blob@generation) points to
+
+    Reads re-hash the bytes and drop anything that no longer matches, so a
+    truncated or corrupted file is never served. Writes go through a temp
+    file and os.replace, so concurrent workers sharing the directory only
+    ever see complete files. When objects exceed ``max_bytes`` the least
+    recently used ones (by mtime, refreshed on every hit) are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(directory, "objects")
+        self.refs_dir = os.path.join(directory, "refs")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = Counter()
+        self.corrupt = Counter()
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.refs_dir, quote(key, safe=""))
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the verified bytes stored for ``key``, or None"""
+        try:
+            with open(self._ref_path(key)) as f:
+                digest = f.read().strip()
+            with open(self._object_path(digest), "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            self.misses.inc()
+            return None
+
+        if hashlib.sha256(content).hexdigest() != digest:
+            logging.warning(f"⚠️ Cached artifact {digest[:12]} failed verification, discarding")
+            self.corrupt.inc()
+            self.misses.inc()
+            self._remove(self._object_path(digest))
+            self._remove(self._ref_path(key))
+            return None
+
+        os.utime(self._object_path(digest))  # mark as recently used
+        self.hits.inc()
+        return content
+
+    def put(self, key: str, content: bytes) -> str:
+        """Store ``content`` under ``key``; returns its sha256"""
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._atomic_write(object_path, content)
+        else:
+            os.utime(object_path)
+        self._atomic_write(self._ref_path(key), digest.encode())
+        self._evict(keep=digest)
+        return digest
+
+    def _atomic_write(self, path: str, content: bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            self._remove(temp_path)
+            raise
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for name in os.listdir(self.objects_dir):
+            if name.startswith(".tmp-"):
+                continue
+            try:
+                stat = os.stat(self._object_path(name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            self._remove(self._object_path(name))
+            self.evictions.inc()
+            total -= size
+        # refs to evicted objects are cleaned up lazily, as misses in get()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def size_bytes(self) -> int:
+        total = 0
+        for name in os.listdir(self.objects_dir):
+            try:
+                total += os.stat(self._object_path(name)).st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "size_bytes": self.size_bytes(),
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+            "evictions": self.evictions.value,
+            "corrupt": self.corrupt.value,
+        }
@@ -0,0 +1,253 @@
+"""Offline batch scoring of CSV/Parquet files with a process pool
+
+Reads the input in chunks, scores each chunk in a worker process and
+writes the input columns plus ``prediction`` (and optionally one
+``probability_<label>`` column per class) as Parquet, or CSV when the
+output path ends in ``.csv``. Every worker loads the model once, from the
+same sources as the API (GCS when configured, then MODEL_PATH), and runs
+XGBoost with CPUs / workers threads so processes don't oversubscribe the
+machine. Rows with a missing or unknown feature value get a null
+prediction instead of failing the run. Parquet needs pyarrow.
+
+    python -m app.batch_score survey.parquet scored.parquet --workers 8
+    python -m app.batch_score survey.csv scored.csv --chunk-rows 20000 --probabilities
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from app.executor import xgboost_threads
+from app.model_registry import ModelRegistry
+from app.penguin_model import feature_encoder, label_classes, model_sources
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Set in each worker process by init_worker
+_registry = None
+
+
+def file_format(path: str) -> str:
+    name = path.lower()
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    if name.endswith((".csv", ".csv.gz")):
+        return "csv"
+    raise ValueError(f"Unsupported file type {path!r}: expected .csv or .parquet")
+
+
+def read_chunks(path: str, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+    """The input file as DataFrames of up to ``chunk_rows`` rows"""
+    if file_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def output_schema(input_path: str, first: "pd.DataFrame") -> "pa.Schema":
+    """The Parquet schema every scored chunk is cast to
+
+    Each chunk goes through pandas, whose dtypes depend on the values in
+    that chunk (an int column with a gap reads back as float, a text
+    column with no values as float, an all-invalid chunk's predictions as
+    nulls), so the file's schema is fixed once up front instead of taken
+    from whichever chunk comes first. Parquet input keeps its own column
+    types; for CSV the model inputs are pinned to float64 / string (see
+    ChunkWriter for values that aren't numbers) and other columns with no
+    values in the first chunk become strings.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {name: pa.float64() for name, _ in feature_encoder.numeric}
+    types.update((name, pa.string()) for name, _ in feature_encoder.categorical)
+    if file_format(input_path) == "parquet":
+        types.update((field.name, field.type) for field in pq.ParquetFile(input_path).schema_arrow)
+    types["prediction"] = pa.string()
+    types.update((f"probability_{label}", pa.float32()) for label in label_classes)
+    inferred = pa.Schema.from_pandas(first, preserve_index=False)
+    return pa.schema([(field.name, types.get(field.name, pa.string() if pa.types.is_null(field.type) else field.type))
+                      for field in inferred])
+
+
+class ChunkWriter:
+    """Appends scored chunks to a Parquet or CSV file
+
+    When CSV input is written as Parquet, numeric model inputs are written
+    as they were scored: a value that isn't a number (whose row already
+    gets a null prediction) becomes null instead of failing the cast to
+    the column's pinned float64 type.
+    """
+
+    def __init__(self, path: str, input_path: str):
+        self.path = path
+        self.format = file_format(path)
+        self.input_path = input_path
+        self._parquet = None
+        self._schema = None
+        self._numeric = []
+        self._started = False
+
+    def write(self, frame: "pd.DataFrame") -> None:
+        if self.format == "parquet":
+            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                self._schema = output_schema(self.input_path, frame)
+                self._parquet = pq.ParquetWriter(self.path, self._schema)
+                if file_format(self.input_path) == "csv":
+                    self._numeric = [name for name, _ in feature_encoder.numeric]
+            frame = frame.assign(**{name: pd.to_numeric(frame[name], errors="coerce") for name in self._numeric})
+            self._parquet.write_table(pa.Table.from_pandas(frame, preserve_index=False).cast(self._schema))
+        else:
+            frame.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def init_worker(nthread: int, backend: str) -> None:
+    """Load the model once in this worker process"""
+    global _registry
+    _registry = ModelRegistry(model_sources(), nthread=nthread, backend=backend)
+    _registry.get()
+
+
+def score_columns(columns: dict):
+    """Class probabilities of one chunk (NaN rows where the input is invalid), and the valid mask"""
+    X, valid = feature_encoder.encode_columns(columns)
+    probabilities = np.full((len(valid), len(label_classes)), np.nan, dtype=np.float32)
+    if valid.any():
+        probabilities[valid] = _registry.get_model().predict_proba(X[valid])
+    return probabilities, valid
+
+
+def feature_columns(frame: "pd.DataFrame") -> dict:
+    """Just the model inputs of a chunk, as NumPy arrays (cheap to send to a worker)"""
+    import pandas as pd
+
+    missing = [name for name in feature_encoder.input_names if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {missing}")
+    columns = {name: pd.to_numeric(frame[name], errors="coerce").to_numpy(np.float32)
+               for name, _ in feature_encoder.numeric}
+    for name, _ in feature_encoder.categorical:
+        codes, categories = pd.factorize(frame[name])
+        columns[name] = (codes, categories.tolist())
+    return columns
+
+
+def with_predictions(frame: "pd.DataFrame", probabilities: np.ndarray, valid: np.ndarray,
+                     return_probabilities: bool) -> "pd.DataFrame":
+    labels = np.array(label_classes, dtype=object)
+    out = frame.copy()
+    out["prediction"] = np.where(valid, labels[np.nan_to_num(probabilities, nan=0.0).argmax(axis=1)], None)
+    if return_probabilities:
+        for i, label in enumerate(label_classes):
+            out[f"probability_{label}"] = probabilities[:, i]
+    return out
+
+
+def run_inline(fn, *args) -> Future:
+    future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+def score_file(input_path: str, output_path: str, workers: int = 0, chunk_rows: int = 50000,
+               return_probabilities: bool = False, nthread: Optional[int] = None,
+               backend: str = "xgboost") -> dict:
+    """Score ``input_path`` into ``output_path``; returns row counts and throughput
+
+    ``workers=0`` scores in this process. Otherwise at most two chunks per
+    worker are in flight, so memory stays bounded for any input size, and
+    chunks are written in input order.
+    """
+    file_format(input_path)
+    writer = ChunkWriter(output_path, input_path)
+    nthread = nthread or xgboost_threads(max(1, workers))
+    pool = None
+    if workers > 0:
+        # spawn: workers must not inherit the reader's native thread pools
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(nthread, backend))
+        submit = pool.submit
+    else:
+        init_worker(nthread, backend)
+        submit = run_inline
+
+    rows = invalid = 0
+    in_flight = deque()
+
+    def drain_one():
+        nonlocal rows, invalid
+        frame, future = in_flight.popleft()
+        probabilities, valid = future.result()
+        writer.write(with_predictions(frame, probabilities, valid, return_probabilities))
+        rows += len(frame)
+        invalid += int((~valid).sum())
+
+    started = time.perf_counter()
+    try:
+        for frame in read_chunks(input_path, chunk_rows):
+            in_flight.append((frame, submit(score_columns, feature_columns(frame))))
+            while len(in_flight) >= 2 * max(1, workers):
+                drain_one()
+        while in_flight:
+            drain_one()
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "invalid_rows": invalid,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else 0.0,
+        "workers": workers,
+    }
+
+
+def main(argv=None) -> None:
+    # Same settings as the API, including GCS_* from a .env file
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or Parquet file to score")
+    parser.add_argument("output", help="where to write predictions (.parquet, or .csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU); 0 scores in this process")
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="rows read and scored at a time")
+    parser.add_argument("--probabilities", action="store_true", help="also write each class's probability")
+    parser.add_argument("--nthread", type=int, help="XGBoost threads per worker (default: CPUs / workers)")
+    parser.add_argument("--backend", default=os.getenv("INFERENCE_BACKEND", "xgboost"),
+                        choices=["xgboost", "compiled", "auto"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    result = score_file(args.input, args.output, workers=args.workers, chunk_rows=args.chunk_rows,
+                        return_probabilities=args.probabilities, nthread=args.nthread, backend=args.backend)
+    print(f"Scored {result['rows']} rows ({result['invalid_rows']} invalid) in {result['seconds']:.2f}s: "
+          f"{result['rows_per_second']:.0f} rows/s with {result['workers']} workers -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.deadlines import DeadlineExceeded, expired
+from app.metrics import Counter, Histogram
+
+
+class QueueFullError(Exception):
+    """Raised when the micro-batch queue is at its depth limit"""
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-row predictions into one model call
+
+    Callers ``await submit(row)`` with an encoded feature row. A worker task
+    waits until ``max_batch_size`` rows are queued or ``max_wait_ms`` has
+    passed since it started collecting, stacks the rows into one matrix,
+    calls ``predict_fn`` once and resolves every caller's future with its
+    own output row. The worker exits when the queue is empty and is
+    restarted by the next submit, so nothing needs starting or stopping.
+
+    With an ``executor``, ``predict_fn`` runs there instead of on the event
+    loop, and up to ``max_concurrent_batches`` batches are in flight at once
+    (normally the executor's size).
+
+    A row submitted with a ``deadline`` that passes while it is queued is
+    skipped when its batch is formed: it never reaches ``predict_fn`` and
+    its caller gets DeadlineExceeded.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray], max_batch_size: int = 32,
+                 max_wait_ms: float = 2.0, max_queue_depth: int = 1000,
+                 executor: Optional[Executor] = None, max_concurrent_batches: int = 1):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_queue_depth = max_queue_depth
+        self.executor = executor
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+
+        self._pending = deque()
+        self._worker = None
+        self._batch_full = None
+        self._in_flight = set()
+
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.rows = Counter()
+        self.rejected = Counter()
+        self.expired = Counter()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, row: np.ndarray, deadline: Optional[float] = None) -> np.ndarray:
+        if len(self._pending) >= self.max_queue_depth:
+            self.rejected.inc()
+            raise QueueFullError(f"Prediction queue is full ({self.max_queue_depth} rows)")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future, deadline))
+
+        if len(self._pending) >= self.max_batch_size and self._batch_full is not None:
+            self._batch_full.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._drain())
+        return await future
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch_size:
+                await self._wait_for_batch()
+
+            self._in_flight = {task for task in self._in_flight if not task.done()}
+            while len(self._in_flight) >= self.max_concurrent_batches:
+                # Every slot is busy; rows keep queueing meanwhile
+                _, self._in_flight = await asyncio.wait(
+                    self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            batch = self._take_batch()
+            if not batch:
+                continue
+            if self.executor is None:
+                self._run_batch(batch)
+            else:
+                self._in_flight.add(loop.create_task(self._run_batch_in_executor(batch)))
+
+    def _take_batch(self) -> list:
+        """Up to max_batch_size live rows from the queue; expired ones are failed and skipped"""
+        batch = []
+        while self._pending and len(batch) < self.max_batch_size:
+            row, future, deadline = self._pending.popleft()
+            if expired(deadline):
+                self.expired.inc()
+                if not future.done():
+                    future.set_exception(DeadlineExceeded("batch_queue"))
+            elif not future.done():
+                batch.append((row, future))
+        return batch
+
+    async def _wait_for_batch(self) -> None:
+        if self.max_wait == 0:
+            # Still yield once so requests already in flight can join
+            await asyncio.sleep(0)
+            return
+        self._batch_full = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), self.max_wait)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._batch_full = None
+
+    def _run_batch(self, batch) -> None:
+        self._record(batch)
+        try:
+            outputs = self.predict_fn(np.vstack([row for row, _ in batch]))
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._resolve(batch, outputs)
+
+    async def _run_batch_in_executor(self, batch) -> None:
+        self._record(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            X = np.vstack([row for row, _ in batch])
+            outputs = await loop.run_in_executor(self.executor, self.predict_fn, X)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._resolve(batch, outputs)
+
+    def _record(self, batch) -> None:
+        self.batch_sizes.observe(len(batch))
+        self.rows.inc(len(batch))
+
+    def _fail(self, batch, error: Exception) -> None:
+        logging.error(f"Batched prediction failed: {error}")
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _resolve(self, batch, outputs) -> None:
+        for i, (_, future) in enumerate(batch):
+            # The caller may have gone away (cancelled) while we were batching
+            if not future.done():
+                future.set_result(outputs[i])
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": self.queue_depth,
+            "batches_in_flight": sum(not task.done() for task in self._in_flight),
+            "rows": self.rows.value,
+            "rejected": self.rejected.value,
+            "expired": self.expired.value,
+            "batch_size": self.batch_sizes.snapshot(),
+        }
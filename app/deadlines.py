@@ -0,0 +1,31 @@
+import time
+from typing import Optional
+
+# Checkpoints where a request whose deadline has passed is dropped, in pipeline order
+DEADLINE_STAGES = ("parse", "admission", "preprocess", "batch_queue", "executor_queue", "inference")
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting a stage once the request's deadline has passed
+
+    ``stage`` is the checkpoint (one of DEADLINE_STAGES) where the request
+    was dropped. Deadlines are absolute ``time.perf_counter()`` values.
+    """
+
+    def __init__(self, stage: str):
+        super().__init__(f"deadline exceeded before {stage}")
+        self.stage = stage
+
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until ``deadline`` (may be negative), or None without one"""
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+def check_deadline(deadline: Optional[float], stage: str) -> None:
+    if expired(deadline):
+        raise DeadlineExceeded(stage)
@@ -0,0 +1,63 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.deadlines import check_deadline
+
+
+def xgboost_threads(pool_size: int, cpu_count: Optional[int] = None) -> int:
+    """Per-call XGBoost threads so pool_size concurrent calls fit the cores
+
+    Each pool thread may run a prediction at the same time, so giving every
+    call all cores would oversubscribe the CPU pool_size times over.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // max(1, pool_size))
+
+
+class InferenceExecutor(Executor):
+    """Dedicated thread pool for blocking inference and model I/O
+
+    Keeps XGBoost calls and downloads off the event loop, and separate from
+    the default executor used elsewhere, so cheap endpoints like /health
+    never queue behind predictions. The pool is created on first use,
+    which also keeps it out of any parent process that forks workers.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="inference")
+        return self._pool
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        return self.pool.submit(fn, *args, **kwargs)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self, functools.partial(fn, *args, **kwargs))
+
+    async def run_before(self, deadline: Optional[float], fn: Callable, *args, **kwargs):
+        """Like ``run``, but skipped if ``deadline`` passes while the call waits for a thread"""
+        def call():
+            check_deadline(deadline, "executor_queue")
+            return fn(*args, **kwargs)
+
+        return await self.run(call)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+                self._pool = None
@@ -0,0 +1,77 @@
+import json
+from typing import Type, TypeVar
+
+import numpy as np
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def _to_builtin(value):
+    # Fallback encoder for what orjson serializes natively
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """Compact JSON bytes via orjson (NumPy arrays included), else the standard library"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":"), default=_to_builtin).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, with NumPy arrays written directly
+
+    Handlers return it with plain dicts, lists and arrays, skipping
+    FastAPI's jsonable_encoder pass. Without orjson installed the standard
+    library encoder is used, converting arrays with ``tolist()``.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def parse_body(model_cls: Type[Model], body: bytes) -> Model:
+    """Validate raw request bytes straight into ``model_cls``
+
+    Parsing and validation happen in one pass in pydantic-core, without
+    building an intermediate dict. Errors are raised as
+    RequestValidationError with ``body``-prefixed locations, so the 422
+    response looks exactly like FastAPI's own.
+    """
+    try:
+        return model_cls.model_validate_json(body)
+    except ValidationError as e:
+        errors = []
+        for error in e.errors(include_url=False):
+            error["loc"] = ("body", *error["loc"])
+            errors.append(error)
+        raise RequestValidationError(errors, body=body)
+
+
+def openapi_request_body(model_cls: Type[BaseModel]) -> dict:
+    """``openapi_extra`` documenting a JSON body that the handler reads itself"""
+    schema = model_cls.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node):
+        # Nested models and enums are inlined: the schema isn't registered as a component
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": inline(schema)}}}}
@@ -0,0 +1,128 @@
+import logging
+from enum import Enum
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+
+class FeatureEncoder:
+    """Encodes validated inputs straight into the model's feature layout
+
+    Built once from the training-time column list (``columns.json``): numeric
+    inputs get a fixed column index and each Enum input gets a lookup table
+    from member to its one-hot column. Encoding a row is then a handful of
+    NumPy item assignments into a preallocated buffer, with no pandas.
+    """
+
+    def __init__(self, columns: Sequence[str], numeric: List[Tuple[str, int]],
+                 categorical: List[Tuple[str, Dict[str, int]]]):
+        self.columns = list(columns)
+        self.numeric = numeric
+        self.categorical = categorical
+
+    @classmethod
+    def compile(cls, model_cls: Type[BaseModel], columns: Sequence[str]) -> "FeatureEncoder":
+        """Build the index maps for ``model_cls`` and check them against ``columns``
+
+        Numeric fields missing from ``columns`` are inputs the model was not
+        trained on and are skipped. Every Enum member must map to a one-hot
+        column named ``<field>_<value>``; training data and the API may
+        disagree on case (``sex_Male`` vs ``male``), so an exact match is
+        preferred and a case-insensitive one accepted. Anything else raises
+        ValueError instead of silently encoding as all zeros.
+        """
+        column_index = {name: i for i, name in enumerate(columns)}
+        folded_index = {name.lower(): i for i, name in enumerate(columns)}
+
+        numeric, categorical, unused, missing = [], [], [], []
+        for name, field in model_cls.model_fields.items():
+            annotation = field.annotation
+            if isinstance(annotation, type) and issubclass(annotation, Enum):
+                lookup = {}
+                for member in annotation:
+                    column = f"{name}_{member.value}"
+                    index = column_index.get(column, folded_index.get(column.lower()))
+                    if index is None:
+                        missing.append(column)
+                    else:
+                        lookup[member.value] = index
+                categorical.append((name, lookup))
+            elif name in column_index:
+                numeric.append((name, column_index[name]))
+            else:
+                unused.append(name)
+
+        if missing:
+            raise ValueError(f"One-hot columns not found in expected columns: {missing}")
+        if unused:
+            logging.info(f"Inputs not used by the model: {unused}")
+
+        return cls(columns, numeric, categorical)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.columns)
+
+    def encode_into(self, features, out: np.ndarray) -> np.ndarray:
+        """Write one row into ``out`` (a 1-D view of length n_features)"""
+        out[:] = 0.0
+        for name, index in self.numeric:
+            out[index] = getattr(features, name)
+        for name, lookup in self.categorical:
+            out[lookup[getattr(features, name)]] = 1.0
+        return out
+
+    def encode(self, features) -> np.ndarray:
+        """Encode one row as a (1, n_features) float32 matrix"""
+        X = np.empty((1, self.n_features), dtype=np.float32)
+        self.encode_into(features, X[0])
+        return X
+
+    def encode_batch(self, instances: Iterable) -> np.ndarray:
+        """Encode many rows into a single (n_rows, n_features) float32 matrix"""
+        instances = list(instances)
+        X = np.zeros((len(instances), self.n_features), dtype=np.float32)
+        numeric, categorical = self.numeric, self.categorical
+        for row, features in enumerate(instances):
+            out = X[row]
+            for name, index in numeric:
+                out[index] = getattr(features, name)
+            for name, lookup in categorical:
+                out[lookup[getattr(features, name)]] = 1.0
+        return X
+
+    @property
+    def input_names(self) -> List[str]:
+        """Input fields the model actually uses"""
+        return [name for name, _ in self.numeric] + [name for name, _ in self.categorical]
+
+    def encode_columns(self, columns: Mapping[str, object]) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode a column-oriented batch (a DataFrame chunk, an Arrow table) without a model per row
+
+        Numeric columns are arrays, with NaN for missing values. Each
+        categorical column is a ``(codes, categories)`` pair, as produced
+        by ``pd.factorize`` or Arrow dictionary encoding: ``codes`` index
+        into ``categories`` and -1 marks a missing value. One-hot columns
+        are then set with a single fancy-indexed assignment per field.
+        Returns the (n_rows, n_features) matrix and a boolean mask of the
+        valid rows: those with every numeric value present and every
+        categorical value known. Invalid rows are left partly encoded and
+        must be skipped.
+        """
+        first = columns[self.input_names[0]]
+        n_rows = len(first[0] if isinstance(first, tuple) else first)
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        valid = np.ones(n_rows, dtype=bool)
+        for name, index in self.numeric:
+            X[:, index] = columns[name]
+            valid &= ~np.isnan(X[:, index])
+        for name, lookup in self.categorical:
+            codes, categories = columns[name]
+            # Feature column of each category, -1 for unknown ones; code -1 lands on the trailing -1
+            targets = np.array([lookup.get(category, -1) for category in categories] + [-1], dtype=np.intp)
+            target = targets[np.asarray(codes, dtype=np.intp)]
+            known = target >= 0
+            X[np.flatnonzero(known), target[known]] = 1.0
+            valid &= known
+        return X, valid
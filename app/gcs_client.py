@@ -0,0 +1,203 @@
+import importlib
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Optional
+
+from app.metrics import Counter
+
+if TYPE_CHECKING:
+    from google.cloud import storage
+
+
+def __getattr__(name):
+    # google.cloud.storage is imported on first use rather than at startup;
+    # this keeps ``app.gcs_client.storage`` resolvable (e.g. for mock.patch)
+    if name == "storage":
+        return importlib.import_module("google.cloud.storage")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling GCS while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately with CircuitOpenError. Once ``reset_timeout``
+    seconds have passed a single trial call is let through (half-open):
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial_in_progress):
+                raise CircuitOpenError(f"GCS circuit open after {self.failures} consecutive failures")
+            if state == "half-open":
+                self._trial_in_progress = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_progress = False
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.state == "half-open":
+                    logging.warning(f"⚠️ GCS circuit opened after {self.failures} consecutive failures")
+                self.opened_at = self.clock()
+
+    def call(self, fn: Callable, *args, **kwargs):
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class SharedStorageClient:
+    """One lazily created, thread-safe storage.Client for the process
+
+    Creating a client means credential discovery and a fresh HTTP session
+    (new TLS handshakes), so it is done once and reused. The session gets a
+    connection pool sized for concurrent downloads and keep-alive. Calls go
+    through ``call()``, which applies a bounded retry with exponential
+    backoff and a circuit breaker.
+
+    Credentials come from Application Default Credentials, which read
+    ``GOOGLE_APPLICATION_CREDENTIALS`` when it is set. The process
+    environment is left untouched. ``STORAGE_EMULATOR_HOST`` is honoured by
+    the client library, which is how tests point it at a local fake server.
+    The Google client libraries are only imported once GCS is first used.
+
+    A forked child (a gunicorn worker forked from a master that already
+    downloaded the model) drops the inherited client, so it never shares
+    the parent's pooled connections, and lazily creates its own.
+    """
+
+    def __init__(self, pool_size: int = 10,
+                 retry_initial: float = 0.2, retry_maximum: float = 2.0, retry_budget: float = 10.0,
+                 request_timeout: float = 10.0, breaker: Optional[CircuitBreaker] = None):
+        self.pool_size = pool_size
+        self.request_timeout = request_timeout
+        self.retry_initial = retry_initial
+        self.retry_maximum = retry_maximum
+        self.retry_budget = retry_budget
+        self.breaker = breaker or CircuitBreaker()
+        self._retry = None
+        # Calls that raised, including those refused by an open circuit
+        self.failures = Counter()
+        self._client: Optional["storage.Client"] = None
+        self._lock = threading.Lock()
+        _instances.add(self)
+
+    @property
+    def retry(self):
+        if self._retry is None:
+            from google.api_core.retry import Retry, if_transient_error
+            self._retry = Retry(predicate=if_transient_error, initial=self.retry_initial,
+                                maximum=self.retry_maximum, multiplier=2.0, timeout=self.retry_budget)
+        return self._retry
+
+    @property
+    def client(self) -> "storage.Client":
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> "storage.Client":
+        import requests
+        from google.cloud import storage
+
+        client = storage.Client()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session = getattr(client, "_http", None)
+        if isinstance(session, requests.Session):
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        return client
+
+    def reset_after_fork(self) -> None:
+        """Forget the parent's client and lock; the next call creates a new client"""
+        self._client = None
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[["storage.Client"], object]):
+        """Run ``fn(client)`` behind the circuit breaker"""
+        try:
+            return self.breaker.call(fn, self.client)
+        except Exception:
+            self.failures.inc()
+            raise
+
+    def blob_generation(self, bucket_name: str, blob_name: str) -> Optional[str]:
+        """Metadata-only lookup of a blob's generation (falls back to etag)"""
+        def fetch(client):
+            blob = client.bucket(bucket_name).get_blob(blob_name, retry=self.retry, timeout=self.request_timeout)
+            if blob is None:
+                raise FileNotFoundError(f"gs://{bucket_name}/{blob_name} does not exist")
+            return blob.generation or blob.etag
+
+        return self.call(fetch)
+
+    def download(self, bucket_name: str, blob_name: str):
+        """Download a blob's bytes; returns (content, generation)"""
+        def fetch(client):
+            blob = client.bucket(bucket_name).blob(blob_name)
+            content = blob.download_as_bytes(retry=self.retry, timeout=self.request_timeout)
+            return content, getattr(blob, "generation", None)
+
+        return self.call(fetch)
+
+    def stats(self) -> dict:
+        return {
+            "client_created": self._client is not None,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "failures": self.failures.value,
+        }
+
+
+# Every SharedStorageClient in the process, reset in each forked child
+_instances = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for client in list(_instances):
+        client.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,14 +1,51 @@
-import xgboost as xgb
-import pandas as pd
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from enum import Enum
-import json
+import numpy as np
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Dict, List, Optional
+import csv
 import logging
 import os
-from google.cloud import storage
+import asyncio
+import hmac
+import importlib
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
+from app.admission import AdmissionController, AdmissionRejected
+from app.arrow_io import ARROW_STREAM, arrow_columns, arrow_predictions, read_arrow_stream
+from app.batching import MicroBatcher, QueueFullError
+from app.deadlines import DEADLINE_STAGES, DeadlineExceeded, check_deadline
+from app.executor import InferenceExecutor, xgboost_threads
+from app.fast_json import FastJSONResponse, openapi_request_body, parse_body
+from app.feature_encoder import FeatureEncoder
+from app.metrics import LATENCY_BUCKETS, Counter, Histogram, MetricsRegistry
+from app.prediction_cache import PredictionCache
+from app.profiling import RequestProfiler
+from app.streaming import (
+    CSV, STREAM_FORMATS, WRITERS, CSVReader, DuplexStreamingResponse, NDJSONReader, StreamFormatError,
+    iter_lines, read_chunks
+)
+from app.model_registry import ModelRegistry, load_from_sources, poll_for_updates
+# Island, Sex and load_columns_and_labels are re-exported for existing importers
+from app.penguin_model import (
+    Island, PenguinFeatures, Sex, create_artifact_cache, create_gcs_client, expected_columns, feature_encoder,
+    label_classes, load_columns_and_labels, model_path, model_sources
+)
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# xgboost, pandas and google.cloud.storage are imported on first use, not at
+# startup; see `python benchmarks/bench_startup.py --imports`
+def __getattr__(name):
+    # Keeps ``app.main.storage`` resolvable (e.g. for mock.patch) without importing it eagerly
+    if name == "storage":
+        return importlib.import_module("google.cloud.storage")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -16,105 +53,241 @@ logging.basicConfig(level=logging.INFO)
 # Load .env for GCS config
 load_dotenv()
 
-# Paths
-BASE_PATH = os.path.dirname(__file__)
-MODEL_PATH = os.path.join(BASE_PATH, "data", "model.json")
-COLUMNS_PATH = os.path.join(BASE_PATH, "data", "columns.json")
-LABELS_PATH = os.path.join(BASE_PATH, "data", "label_classes.json")
+# Local fallback model (app/penguin_model.py holds the paths of the bundled files)
+MODEL_PATH = model_path()
+
+# Upper bound on rows accepted by /predict/batch in one request
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "10000"))
+
+# Streaming bulk scoring (/predict/stream): rows per model call, and the longest accepted line
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "1000"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
+
+# Micro-batching of single-row /predict calls
+PREDICT_BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "32"))
+PREDICT_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "2"))
+PREDICT_BATCH_MAX_QUEUE = int(os.getenv("PREDICT_BATCH_MAX_QUEUE", "1000"))
+
+# Admission control in front of inference: requests scoring at once, how many may queue
+# for a slot and for how long, and the Retry-After sent when one is shed (0 disables)
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+ADMISSION_MAX_WAIT_MS = float(os.getenv("ADMISSION_MAX_WAIT_MS", "1000"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# /health/ready reports the instance saturated (503) while this many requests wait for an
+# admission slot (0 disables), and for this many seconds after admission control last shed one
+READINESS_MAX_QUEUE_DEPTH = int(os.getenv("READINESS_MAX_QUEUE_DEPTH", str(ADMISSION_MAX_QUEUE)))
+READINESS_SHED_WINDOW_SECONDS = float(os.getenv("READINESS_SHED_WINDOW_SECONDS", "5"))
+
+# Per-request deadline for /predict and /predict/batch: the server default, or the client's
+# X-Request-Timeout-Ms header when that is sooner (0 means no server default)
+REQUEST_TIMEOUT_MS = float(os.getenv("REQUEST_TIMEOUT_MS", "30000"))
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+# Thread pool for blocking inference, and XGBoost threads per call within it
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", str(min(4, os.cpu_count() or 1))))
+XGBOOST_NTHREAD = int(os.getenv("XGBOOST_NTHREAD", "0")) or xgboost_threads(INFERENCE_THREADS)
+
+# Optional cache of /predict results (0 entries disables it)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "0"))
+PREDICTION_CACHE_DECIMALS = int(os.getenv("PREDICTION_CACHE_DECIMALS", "2"))
+
+# "xgboost" (native library), "compiled" (NumPy tree evaluator, app/tree_engine.py)
+# or "auto" (compiled for small micro-batches, native for large batches)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "xgboost")
+
+# Run throwaway predictions during startup so the first request is not slow
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") != "0"
+
+# On-demand profiling of /predict: disabled unless a token is set
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "")
+
+# How often to check the model source for a new upload (0 disables hot reload)
+MODEL_POLL_INTERVAL_SECONDS = float(os.getenv("MODEL_POLL_INTERVAL_SECONDS", "60"))
+
+# GCS access (one pooled client, bounded retries, and a circuit breaker), and
+# downloaded models kept on disk by content hash; see app/penguin_model.py
+gcs_client = create_gcs_client()
+artifact_cache = create_artifact_cache()
 
 def load_model_from_gcs():
-    """Load model directly from Google Cloud Storage during inference using SDK"""
-    bucket_name = os.getenv("GCS_BUCKET_NAME")
-    blob_name = os.getenv("GCS_BLOB_NAME")
-    credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    
-    # Try to load from GCS first
-    if all([bucket_name, blob_name]):
+    """Load model from Google Cloud Storage, falling back to the local model file"""
+    return load_from_sources(model_sources(gcs_client, artifact_cache)).model
+
+# Process-wide model registry, loaded once and shared by every request
+model_registry = ModelRegistry(model_sources(gcs_client, artifact_cache), nthread=XGBOOST_NTHREAD,
+                               backend=INFERENCE_BACKEND)
+
+# Inference and model I/O run here, never on the event loop
+inference_executor = InferenceExecutor(INFERENCE_THREADS)
+
+# Per-stage latency of prediction requests, exposed on /metrics
+STAGES = ("parse", "preprocess", "model_fetch", "inference", "serialization")
+stage_seconds = {stage: Histogram(LATENCY_BUCKETS) for stage in STAGES}
+
+def predict_proba(X: np.ndarray) -> np.ndarray:
+    """Class probabilities from the active model, one row per input row"""
+    with stage_seconds["model_fetch"].time():
+        model = model_registry.get_model()
+    with stage_seconds["inference"].time():
+        return model.predict_proba(X)
+
+# Collects concurrent /predict rows into one model call
+batcher = MicroBatcher(
+    predict_proba,
+    max_batch_size=PREDICT_BATCH_MAX_SIZE,
+    max_wait_ms=PREDICT_BATCH_MAX_WAIT_MS,
+    max_queue_depth=PREDICT_BATCH_MAX_QUEUE,
+    executor=inference_executor,
+    max_concurrent_batches=INFERENCE_THREADS,
+)
+
+def preload_model():
+    """Load the model in this process so forked workers inherit it (see gunicorn.conf.py)
+
+    Only the model is loaded: no threads are started here, since threads
+    do not survive a fork.
+    """
+    return model_registry.get()
+
+prediction_cache = PredictionCache(
+    PREDICTION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL_SECONDS,
+    float_decimals=PREDICTION_CACHE_DECIMALS,
+)
+
+# Sheds load before it queues without bound: 429 when the queue is full, 503 after waiting too long
+admission = AdmissionController(
+    ADMISSION_MAX_CONCURRENCY,
+    max_queue=ADMISSION_MAX_QUEUE,
+    max_wait_ms=ADMISSION_MAX_WAIT_MS,
+    retry_after_seconds=ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+def overloaded(e: AdmissionRejected) -> HTTPException:
+    logging.warning(f"Request shed: {e.reason}")
+    return HTTPException(status_code=e.status_code, detail="Server is overloaded, try again later.",
+                         headers={"Retry-After": str(e.retry_after)})
+
+# Requests dropped because their deadline passed, by the checkpoint that caught it
+deadline_dropped = {stage: Counter() for stage in DEADLINE_STAGES}
+
+def deadline_exceeded(e: DeadlineExceeded) -> HTTPException:
+    deadline_dropped[e.stage].inc()
+    logging.warning(f"Request dropped: {e}")
+    return HTTPException(status_code=504, detail="Request deadline exceeded.")
+
+# Rows scored and rows rejected (invalid, unparseable) by /predict/stream
+stream_rows = Counter()
+stream_row_errors = Counter()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Workers forked from a preloaded master already hold the model
+    if not model_registry.is_loaded:
+        started = time.perf_counter()
+        await inference_executor.run(model_registry.load)
+        logging.info(f"Model loaded during startup in {time.perf_counter() - started:.3f}s")
+    # Warmed per process: native thread pools don't survive the fork from the master
+    if MODEL_WARMUP:
+        seconds = await inference_executor.run(model_registry.warm_up)
+        logging.info(f"✅ Model warmed up in {seconds:.3f}s")
+    poller = None
+    if MODEL_POLL_INTERVAL_SECONDS > 0:
+        poller = asyncio.create_task(poll_for_updates(model_registry, MODEL_POLL_INTERVAL_SECONDS))
+    yield
+    if poller is not None:
+        poller.cancel()
+    inference_executor.shutdown(wait=False)
+
+# When FastAPI started handling the current request (set by TimedRoute)
+request_started: ContextVar[float] = ContextVar("request_started", default=0.0)
+
+class TimedRoute(APIRoute):
+    """Records when a request reaches its route, before the body is read and validated"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            request_started.set(time.perf_counter())
+            return await handler(request)
+
+        return timed_handler
+
+def request_deadline(request: Request) -> Optional[float]:
+    """Absolute deadline (perf_counter) for this request, counted from when it reached its route"""
+    timeouts = [REQUEST_TIMEOUT_MS] if REQUEST_TIMEOUT_MS > 0 else []
+    header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+    if header is not None:
         try:
-            logging.info(f"Loading model from GCS during inference: {bucket_name}/{blob_name}")
-            
-            # Set credentials if provided
-            if credentials_path:
-                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
-            
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
-            
-            # Download model content to memory (not to file)
-            model_content = blob.download_as_bytes()
-            
-            # Save temporarily to load into XGBoost
-            temp_model_path = os.path.join(BASE_PATH, "data", "temp_model.json")
-            with open(temp_model_path, "wb") as f:
-                f.write(model_content)
-            
-            # Load model
-            model = xgb.XGBClassifier()
-            model.load_model(temp_model_path)
-            
-            # Clean up temp file
-            os.remove(temp_model_path)
-            
-            logging.info("✅ Model loaded from GCS during inference")
-            return model
-            
-        except Exception as e:
-            logging.warning(f"⚠️ Failed to load model from GCS during inference: {e}")
-            logging.info("Falling back to local model file")
-    
-    # Fallback to local model
-    logging.info("Loading model from local file")
-    model = xgb.XGBClassifier()
-    model.load_model(MODEL_PATH)
-    return model
-
-# Load model and metadata (load metadata once, model during inference)
-def load_columns_and_labels():
-    """Load column names and label classes (metadata only)"""
-    logging.info("Loading metadata...")
-    
-    with open(COLUMNS_PATH, "r") as f:
-        columns = json.load(f)
-
-    with open(LABELS_PATH, "r") as f:
-        label_classes = json.load(f)
-
-    return columns, label_classes
-
-# Load metadata once at startup
-expected_columns, label_classes = load_columns_and_labels()
-
-app = FastAPI()
-
-# Enums for Input Validation
-class Island(str, Enum):
-    Torgersen = "Torgersen"
-    Biscoe = "Biscoe"
-    Dream = "Dream"
-
-class Sex(str, Enum):
-    Male = "male"
-    Female = "female"
-
-# Pydantic Input Schema
-class PenguinFeatures(BaseModel):
-    bill_length_mm: float
-    bill_depth_mm: float
-    flipper_length_mm: float
-    body_mass_g: float
-    year: int
-    sex: Sex
-    island: Island
-
-# Helper function to preprocess input
-def preprocess_features(features: PenguinFeatures, expected_columns: list) -> pd.DataFrame:
-    input_dict = features.model_dump()
-    df = pd.DataFrame([input_dict])
-    df = pd.get_dummies(df, columns=["sex", "island"])
-    df = df.reindex(columns=expected_columns, fill_value=0)
-    df = df.astype(float)
-    return df
+            timeout_ms = float(header)
+        except ValueError:
+            timeout_ms = float("nan")
+        if not timeout_ms > 0:
+            raise HTTPException(status_code=400, detail=f"{REQUEST_TIMEOUT_HEADER} must be a positive number")
+        timeouts.append(timeout_ms)
+    if not timeouts:
+        return None
+    return (request_started.get() or time.perf_counter()) + min(timeouts) / 1000
+
+def observe_parse_time() -> None:
+    """Called once the body is validated: time spent reading and validating it"""
+    started = request_started.get()
+    if started:
+        stage_seconds["parse"].observe(time.perf_counter() - started)
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.router.route_class = TimedRoute
+
+class BatchPredictionRequest(BaseModel):
+    instances: List[PenguinFeatures] = Field(..., min_length=1, max_length=MAX_BATCH_ROWS)
+    return_probabilities: bool = False
+    top_k: Optional[int] = Field(None, ge=1)
+
+# Response Schemas
+class ClassProbability(BaseModel):
+    label: str
+    probability: float
+
+class PredictionResponse(BaseModel):
+    prediction: str
+    probabilities: Optional[Dict[str, float]] = None
+    top_k: Optional[List[ClassProbability]] = None
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[str]
+    probabilities: Optional[List[List[float]]] = None
+    top_k: Optional[List[List[ClassProbability]]] = None
+
+def top_k_classes(probabilities: np.ndarray, k: int) -> list:
+    """The k most likely classes of each row, from probabilities already computed"""
+    k = min(k, probabilities.shape[1])
+    order = np.argsort(-probabilities, axis=1, kind="stable")[:, :k]
+    top = np.take_along_axis(probabilities, order, axis=1)
+    return [
+        [{"label": label_classes[i], "probability": p} for i, p in zip(row_order, row_top)]
+        for row_order, row_top in zip(order.tolist(), top.tolist())
+    ]
+
+def get_feature_encoder(columns: list) -> FeatureEncoder:
+    if columns == feature_encoder.columns:
+        return feature_encoder
+    return FeatureEncoder.compile(PenguinFeatures, columns)
+
+# Helper function to preprocess input (DataFrame view of the encoded row)
+def preprocess_features(features: PenguinFeatures, expected_columns: list) -> "pd.DataFrame":
+    import pandas as pd
+
+    X = get_feature_encoder(expected_columns).encode(features)
+    return pd.DataFrame(X.astype(float), columns=expected_columns)
+
+# Helper function to preprocess many inputs into one float32 matrix
+def preprocess_batch(instances: List[PenguinFeatures], expected_columns: list) -> np.ndarray:
+    return get_feature_encoder(expected_columns).encode_batch(instances)
 
 # Initialize FastAPI App
 @app.get("/")
@@ -125,20 +298,323 @@ async def root():
 async def health():
     return {"status": "ok"}
 
-@app.post("/predict")
-async def predict(features: PenguinFeatures):
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and serving HTTP"""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 503 until the model is loaded and warm, or while admission control is saturated"""
+    queue_depth = admission.queue_depth
+    shedding = admission.shed_within(READINESS_SHED_WINDOW_SECONDS)
+    body = {
+        "model_loaded": model_registry.is_loaded,
+        "model_version": model_registry.version,
+        "warmed_up": model_registry.warmed_up,
+        "queue_depth": queue_depth,
+        "max_queue_depth": READINESS_MAX_QUEUE_DEPTH,
+        "shedding": shedding,
+    }
+    if not model_registry.is_loaded or (MODEL_WARMUP and not model_registry.warmed_up):
+        status = "loading"
+    elif shedding or (admission.enabled and 0 < READINESS_MAX_QUEUE_DEPTH <= queue_depth):
+        status = "saturated"
+    else:
+        status = "ready"
+    return FastJSONResponse({"status": status, **body}, status_code=200 if status == "ready" else 503)
+
+@app.get("/model")
+async def model_info():
+    return model_registry.info()
+
+@app.get("/stats")
+async def stats():
+    return {
+        "admission": admission.stats(),
+        "batching": batcher.stats(),
+        "deadline_dropped": {stage: counter.value for stage, counter in deadline_dropped.items()},
+        "prediction_cache": prediction_cache.stats(),
+        "gcs": gcs_client.stats(),
+        "artifact_cache": artifact_cache.stats() if artifact_cache is not None else {"enabled": False},
+    }
+
+metrics = MetricsRegistry()
+for stage, histogram in stage_seconds.items():
+    metrics.histogram("penguin_stage_seconds", "Time spent in each stage of a prediction request",
+                      histogram, {"stage": stage})
+metrics.counter("penguin_model_loads_total", "Models loaded and made active", model_registry.loads)
+metrics.counter("penguin_model_fallbacks_total",
+                "Models loaded from a fallback source (the local MODEL_PATH) after a preferred source failed",
+                model_registry.fallbacks)
+metrics.counter("penguin_gcs_failures_total", "GCS calls that failed or were refused by the circuit breaker",
+                gcs_client.failures)
+metrics.counter("penguin_predict_rows_total", "Rows scored by the /predict micro-batcher", batcher.rows)
+metrics.counter("penguin_predict_rejected_total", "Rows rejected because the batching queue was full",
+                batcher.rejected)
+metrics.histogram("penguin_batch_size", "Rows per micro-batch model call", batcher.batch_sizes)
+metrics.gauge("penguin_queue_depth", "Rows waiting in the micro-batching queue", lambda: batcher.queue_depth)
+metrics.counter("penguin_prediction_cache_hits_total", "Prediction cache hits", prediction_cache.hits)
+metrics.counter("penguin_prediction_cache_misses_total", "Prediction cache misses", prediction_cache.misses)
+metrics.histogram("penguin_admission_queue_wait_seconds",
+                  "Time requests waited for an inference slot (0 when admitted at once)", admission.queue_wait)
+metrics.counter("penguin_admission_rejected_total", "Requests shed by admission control",
+                admission.rejected_queue_full, {"reason": "queue_full"})
+metrics.counter("penguin_admission_rejected_total", "Requests shed by admission control",
+                admission.rejected_timeout, {"reason": "timeout"})
+metrics.gauge("penguin_admission_in_flight", "Requests holding an inference slot", lambda: admission.in_flight)
+metrics.gauge("penguin_admission_queue_depth", "Requests waiting for an inference slot",
+              lambda: admission.queue_depth)
+for stage, counter in deadline_dropped.items():
+    metrics.counter("penguin_deadline_dropped_total",
+                    "Requests dropped because their deadline passed, by the checkpoint that caught it",
+                    counter, {"stage": stage})
+metrics.counter("penguin_stream_rows_total", "Rows scored by /predict/stream", stream_rows)
+metrics.counter("penguin_stream_row_errors_total", "Rows /predict/stream rejected as invalid", stream_row_errors)
+
+profiler = RequestProfiler(PROFILE_OUTPUT_DIR or None)
+
+def check_profile_token(token: str) -> None:
+    if not PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid profile token.")
+
+@app.post("/admin/profile")
+async def start_profile(requests: int = Query(10, ge=1, le=1000), x_profile_token: str = Header("")):
+    """Profile the next `requests` /predict calls (needs PROFILE_TOKEN)"""
+    check_profile_token(x_profile_token)
+    profiler.arm(requests)
+    return {"profiling": requests}
+
+@app.get("/admin/profile")
+async def profile_report(limit: int = Query(30, ge=1, le=500),
+                         sort: str = Query("cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+                         x_profile_token: str = Header("")):
+    """Aggregated cProfile stats of the profiled requests so far"""
+    check_profile_token(x_profile_token)
+    return profiler.report(limit=limit, sort=sort)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def encode_one(features: PenguinFeatures) -> np.ndarray:
+    with stage_seconds["preprocess"].time():
+        return feature_encoder.encode(features)[0]
+
+def score_profiled(features: PenguinFeatures) -> np.ndarray:
+    """The whole scoring path in one synchronous call, so cProfile sees all of it"""
+    with stage_seconds["preprocess"].time():
+        X = feature_encoder.encode(features)
+    return predict_proba(X)[0]
+
+async def submit_one(features: PenguinFeatures, deadline: Optional[float] = None) -> np.ndarray:
+    """Score one input through the micro-batcher, once admitted"""
+    async with admission.slot(deadline):
+        check_deadline(deadline, "preprocess")
+        return await batcher.submit(encode_one(features), deadline)
+
+async def score_one(features: PenguinFeatures, deadline: Optional[float] = None) -> np.ndarray:
+    """Class probabilities for one input, from the cache or the micro-batcher"""
+    version = model_registry.version
+    if not prediction_cache.enabled or version is None:
+        return await submit_one(features, deadline)
+
+    # Cache hits need no inference, so they skip admission control
+    key = prediction_cache.key(features)
+    probabilities = prediction_cache.get(key, version)
+    if probabilities is None:
+        probabilities = await submit_one(features, deadline)
+        prediction_cache.put(key, version, probabilities)
+    return probabilities
+
+# The prediction endpoints validate the raw body themselves (parse_body) and
+# return FastJSONResponse directly; the response models document the output
+@app.post("/predict", response_model=PredictionResponse, openapi_extra=openapi_request_body(PenguinFeatures))
+async def predict(request: Request, return_probabilities: bool = False, top_k: Optional[int] = Query(None, ge=1)):
+    """Predict the species; optionally with all class probabilities and/or the top-k classes"""
+    deadline = request_deadline(request)
+    features = parse_body(PenguinFeatures, await request.body())
+    observe_parse_time()
     logging.info("Received prediction request")
 
     try:
-        # Load model from GCS during inference using SDK
-        model = load_model_from_gcs()
-        
-        X_input = preprocess_features(features, expected_columns)
-        pred = model.predict(X_input.values)[0]
-        predicted_label = label_classes[int(pred)]
+        check_deadline(deadline, "parse")
+        if profiler.remaining:
+            async with admission.slot(deadline):
+                probabilities = await inference_executor.run_before(deadline, profiler.run_if_claimed,
+                                                                    score_profiled, features)
+        else:
+            probabilities = await score_one(features, deadline)
+        predicted_label = label_classes[int(probabilities.argmax())]
         logging.info(f"Predicted: {predicted_label}")
-        return {"prediction": predicted_label}
+        with stage_seconds["serialization"].time():
+            # Extra outputs come from the same probabilities, not another model call
+            response = {"prediction": predicted_label}
+            if return_probabilities:
+                response["probabilities"] = dict(zip(label_classes, probabilities.tolist()))
+            if top_k:
+                response["top_k"] = top_k_classes(probabilities[None, :], top_k)[0]
+            return FastJSONResponse(response)
 
+    except DeadlineExceeded as e:
+        raise deadline_exceeded(e)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except QueueFullError as e:
+        logging.warning(f"Prediction rejected: {e}")
+        raise HTTPException(status_code=503, detail="Server is overloaded, try again later.",
+                            headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)})
     except Exception as e:
         logging.error(f"Prediction failed: {e}")
-        raise HTTPException(status_code=500, detail="Prediction failed due to internal error.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Prediction failed due to internal error.")
+
+def score_batch(instances: List[PenguinFeatures], deadline: Optional[float] = None) -> np.ndarray:
+    """Encode and score a whole batch (blocking; runs on the inference executor)"""
+    with stage_seconds["preprocess"].time():
+        X = feature_encoder.encode_batch(instances)
+    check_deadline(deadline, "inference")
+    return predict_proba(X)
+
+async def predict_batch_arrow(http_request: Request, return_probabilities: bool, top_k: Optional[int]):
+    """/predict/batch for an Arrow IPC stream: columns go straight into the feature matrix"""
+    deadline = request_deadline(http_request)
+    try:
+        table = read_arrow_stream(await http_request.body())
+        columns = arrow_columns(table, feature_encoder)
+    except ImportError:
+        raise HTTPException(status_code=415, detail="Arrow input needs pyarrow installed on the server")
+    # ArrowInvalid, ArrowTypeError, or ArrowNotImplementedError for a column type with no conversion
+    except (ValueError, TypeError, NotImplementedError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid Arrow input: {e}")
+    if not 1 <= table.num_rows <= MAX_BATCH_ROWS:
+        raise HTTPException(status_code=422, detail=f"Arrow input must have 1 to {MAX_BATCH_ROWS} rows")
+    observe_parse_time()
+    logging.info(f"Received Arrow batch prediction request with {table.num_rows} rows")
+
+    try:
+        check_deadline(deadline, "parse")
+    except DeadlineExceeded as e:
+        raise deadline_exceeded(e)
+    with stage_seconds["preprocess"].time():
+        X, valid = feature_encoder.encode_columns(columns)
+    if not valid.all():
+        invalid_rows = np.flatnonzero(~valid)
+        raise HTTPException(status_code=422, detail={
+            "message": "Rows with a missing or unknown feature value",
+            "invalid_rows": invalid_rows[:100].tolist(),
+            "invalid_count": len(invalid_rows),
+        })
+
+    try:
+        async with admission.slot(deadline):
+            probabilities = await inference_executor.run_before(deadline, predict_proba, X)
+        with stage_seconds["serialization"].time():
+            top = top_k_classes(probabilities, top_k) if top_k else None
+            content = arrow_predictions(label_classes, probabilities, return_probabilities, top)
+        return Response(content, media_type=ARROW_STREAM)
+
+    except DeadlineExceeded as e:
+        raise deadline_exceeded(e)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except Exception as e:
+        logging.error(f"Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed due to internal error.")
+
+def batch_openapi_extra() -> dict:
+    """The JSON body, plus the Arrow IPC stream alternative"""
+    extra = openapi_request_body(BatchPredictionRequest)
+    extra["requestBody"]["content"][ARROW_STREAM] = {"schema": {"type": "string", "format": "binary"}}
+    return extra
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse, openapi_extra=batch_openapi_extra())
+async def predict_batch(http_request: Request, return_probabilities: bool = False,
+                        top_k: Optional[int] = Query(None, ge=1)):
+    """Score many rows; JSON in and out, or an Arrow IPC stream in and out
+
+    Options are body fields in JSON or query parameters (the only way for Arrow input).
+    """
+    if http_request.headers.get("content-type", "").split(";")[0].strip().lower() == ARROW_STREAM:
+        return await predict_batch_arrow(http_request, return_probabilities, top_k)
+
+    deadline = request_deadline(http_request)
+    request = parse_body(BatchPredictionRequest, await http_request.body())
+    observe_parse_time()
+    logging.info(f"Received batch prediction request with {len(request.instances)} rows")
+
+    try:
+        check_deadline(deadline, "parse")
+        # One booster call gives both the class probabilities and the labels
+        async with admission.slot(deadline):
+            probabilities = await inference_executor.run_before(deadline, score_batch, request.instances, deadline)
+        predictions = [label_classes[i] for i in probabilities.argmax(axis=1)]
+
+        with stage_seconds["serialization"].time():
+            response = {"predictions": predictions}
+            if request.return_probabilities or return_probabilities:
+                response["probabilities"] = probabilities
+            if request.top_k or top_k:
+                response["top_k"] = top_k_classes(probabilities, request.top_k or top_k)
+            return FastJSONResponse(response)
+
+    except DeadlineExceeded as e:
+        raise deadline_exceeded(e)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except Exception as e:
+        logging.error(f"Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed due to internal error.")
+
+async def score_admitted(rows: List[PenguinFeatures]) -> np.ndarray:
+    """Score a stream chunk once admitted; a shed chunk backs off and retries, slowing the stream"""
+    while True:
+        try:
+            async with admission.slot():
+                return await inference_executor.run(score_batch, rows)
+        except AdmissionRejected as e:
+            await asyncio.sleep(e.retry_after)
+
+async def stream_predictions(chunks, writer):
+    """Score each chunk as it is read and yield its output, one chunk in memory at a time"""
+    yield writer.header()
+    async for chunk in chunks:
+        rows = [row for _, row in chunk if not isinstance(row, str)]
+        if rows:
+            probabilities = await score_admitted(rows)
+        else:
+            probabilities = np.empty((0, len(label_classes)), dtype=np.float32)
+        stream_rows.inc(len(rows))
+        stream_row_errors.inc(len(chunk) - len(rows))
+        with stage_seconds["serialization"].time():
+            output = writer.rows(chunk, probabilities)
+        yield output
+
+@app.post("/predict/stream", response_class=DuplexStreamingResponse, openapi_extra={
+    "requestBody": {"required": True, "content": {media_type: {"schema": {"type": "string"}}
+                                                  for media_type in STREAM_FORMATS}}})
+async def predict_stream(request: Request, return_probabilities: bool = False):
+    """Score an NDJSON or CSV body of any size, streaming results back in the same format"""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    stream_format = STREAM_FORMATS.get(media_type)
+    if stream_format is None:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be one of {sorted(STREAM_FORMATS)}")
+
+    lines = iter_lines(request.stream(), STREAM_MAX_LINE_BYTES)
+    if stream_format == CSV:
+        try:
+            _, header = await anext(lines)
+        except StopAsyncIteration:
+            header = None
+        try:
+            reader = CSVReader(PenguinFeatures, header)
+        except (StreamFormatError, UnicodeDecodeError, csv.Error) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        reader = NDJSONReader(PenguinFeatures)
+    logging.info(f"Streaming {stream_format} prediction request")
+
+    writer = WRITERS[stream_format](label_classes, return_probabilities)
+    chunks = read_chunks(lines, reader, STREAM_CHUNK_ROWS, STREAM_MAX_LINE_BYTES)
+    return DuplexStreamingResponse(stream_predictions(chunks, writer), media_type=writer.media_type)
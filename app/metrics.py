@@ -0,0 +1,178 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond stages up to slow model loads
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _Shards:
+    """One cell per thread, so updates on the hot path never take a lock
+
+    Each thread only ever writes its own cell; readers sum across cells.
+    The lock is taken once per thread (to register its cell) and on reads.
+    """
+
+    def __init__(self, factory: Callable):
+        self._factory = factory
+        self._local = threading.local()
+        self._cells = []
+        self._lock = threading.Lock()
+
+    def cell(self):
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._factory()
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def cells(self) -> list:
+        with self._lock:
+            return list(self._cells)
+
+
+class Counter:
+    """Monotonic counter"""
+
+    def __init__(self):
+        self._shards = _Shards(lambda: [0])
+
+    def inc(self, amount: int = 1) -> None:
+        self._shards.cell()[0] += amount
+
+    @property
+    def value(self) -> int:
+        return sum(cell[0] for cell in self._shards.cells())
+
+
+class _HistogramCell:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style
+
+    ``buckets`` are upper bounds; observations above the last one land in
+    the implicit +Inf bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self._shards = _Shards(lambda: _HistogramCell(len(self.buckets) + 1))
+
+    def observe(self, value: float) -> None:
+        cell = self._shards.cell()
+        cell.counts[bisect.bisect_left(self.buckets, value)] += 1
+        cell.sum += value
+
+    def time(self) -> "_Timer":
+        """Observe the duration of a ``with`` block in seconds"""
+        return _Timer(self)
+
+    def _totals(self) -> Tuple[List[int], float]:
+        counts, total = [0] * (len(self.buckets) + 1), 0.0
+        for cell in self._shards.cells():
+            for i, count in enumerate(cell.counts):
+                counts[i] += count
+            total += cell.sum
+        return counts, total
+
+    @property
+    def count(self) -> int:
+        return sum(self._totals()[0])
+
+    @property
+    def sum(self) -> float:
+        return self._totals()[1]
+
+    def snapshot(self) -> dict:
+        counts, total = self._totals()
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = sum(counts)
+        return {"buckets": cumulative, "sum": total, "count": sum(counts)}
+
+
+class _Timer:
+    # A plain class rather than @contextmanager: it is used on every request
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class MetricsRegistry:
+    """Renders registered metrics in the Prometheus text exposition format
+
+    Metrics stay owned by the objects that update them (the batcher's
+    counters, the cache's hit counts, ...); the registry only knows how to
+    name and read them at scrape time. Registering the same name again
+    with different labels adds a series to that metric family.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, dict] = {}
+
+    def _add(self, name: str, kind: str, help_text: str, labels: Optional[dict], metric) -> None:
+        family = self._families.setdefault(name, {"type": kind, "help": help_text, "series": []})
+        if family["type"] != kind:
+            raise ValueError(f"Metric {name} already registered as a {family['type']}")
+        family["series"].append((labels or {}, metric))
+
+    def counter(self, name: str, help_text: str, counter: Counter, labels: Optional[dict] = None) -> Counter:
+        self._add(name, "counter", help_text, labels, counter)
+        return counter
+
+    def histogram(self, name: str, help_text: str, histogram: Histogram,
+                  labels: Optional[dict] = None) -> Histogram:
+        self._add(name, "histogram", help_text, labels, histogram)
+        return histogram
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float], labels: Optional[dict] = None) -> None:
+        self._add(name, "gauge", help_text, labels, read)
+
+    def render(self) -> str:
+        lines = []
+        for name, family in self._families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for labels, metric in family["series"]:
+                if family["type"] == "counter":
+                    lines.append(f"{name}{_labels(labels)} {metric.value}")
+                elif family["type"] == "gauge":
+                    lines.append(f"{name}{_labels(labels)} {_number(metric())}")
+                else:
+                    snapshot = metric.snapshot()
+                    for bound, count in snapshot["buckets"].items():
+                        lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(snapshot['sum'])}")
+                    lines.append(f"{name}_count{_labels(labels)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
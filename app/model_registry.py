@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+import numpy as np
+from app.artifact_cache import ArtifactCache
+from app.gcs_client import SharedStorageClient
+from app.metrics import Counter
+from app.tree_engine import CompiledTreeModel, HybridTreeModel
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+# Inference backends the registry can serve a loaded model with
+BACKENDS = ("xgboost", "compiled", "auto")
+
+
+@dataclass
+class LoadedModel:
+    """A ready-to-serve model together with where it came from"""
+    model: Any
+    version: str
+    source: str
+    load_time_seconds: float = 0.0
+    loaded_at: float = 0.0
+    # Position of the source in the registry's priority list (0 = preferred)
+    priority: int = 0
+
+
+class ModelSource:
+    """A place a trained XGBoost model can be loaded from"""
+    name = "base"
+
+    def load(self, parse: Optional[Callable] = None) -> LoadedModel:
+        """Fetch the artifact and parse it (``load_model_from_bytes`` by default)"""
+        raise NotImplementedError
+
+    def current_version(self) -> str:
+        """Cheaply report the version load() would return, without downloading"""
+        raise NotImplementedError
+
+
+class GCSModelSource(ModelSource):
+    """Load the model from a Google Cloud Storage blob
+
+    With an ``artifact_cache`` the blob's generation is looked up first
+    (a metadata-only request) and a verified local copy of that generation
+    is used when present, so restarts only download a model that changed.
+    """
+    name = "gcs"
+
+    def __init__(self, bucket_name: str, blob_name: str, client: Optional[SharedStorageClient] = None,
+                 artifact_cache: Optional[ArtifactCache] = None):
+        self.bucket_name = bucket_name
+        self.blob_name = blob_name
+        self.client = client or SharedStorageClient()
+        self.artifact_cache = artifact_cache
+
+    def _cache_key(self, generation) -> str:
+        return f"{self.bucket_name}/{self.blob_name}@{generation}"
+
+    def _fetch(self):
+        if self.artifact_cache is not None:
+            generation = self.client.blob_generation(self.bucket_name, self.blob_name)
+            cached = self.artifact_cache.get(self._cache_key(generation))
+            if cached is not None:
+                logging.info(f"Using cached model artifact for generation {generation}")
+                return cached, generation
+
+        # Download model content to memory and parse it from there
+        model_content, generation = self.client.download(self.bucket_name, self.blob_name)
+        if self.artifact_cache is not None and generation:
+            try:
+                self.artifact_cache.put(self._cache_key(generation), model_content)
+            except OSError as e:
+                logging.warning(f"⚠️ Could not write model artifact cache: {e}")
+        return model_content, generation
+
+    def load(self, parse: Optional[Callable] = None) -> LoadedModel:
+        logging.info(f"Loading model from GCS: {self.bucket_name}/{self.blob_name}")
+
+        model_content, generation = self._fetch()
+        model = (parse or load_model_from_bytes)(model_content)
+
+        version = f"{self.blob_name}@{generation}" if generation else f"{self.blob_name}@{_content_digest(model_content)}"
+        return LoadedModel(model=model, version=version, source=f"gs://{self.bucket_name}/{self.blob_name}")
+
+    def current_version(self) -> str:
+        # Metadata-only request: returns generation/etag, not the object body
+        return f"{self.blob_name}@{self.client.blob_generation(self.bucket_name, self.blob_name)}"
+
+
+class LocalFileModelSource(ModelSource):
+    """Load the model bundled with the container"""
+    name = "local"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, parse: Optional[Callable] = None) -> LoadedModel:
+        logging.info(f"Loading model from local file: {self.path}")
+        with open(self.path, "rb") as f:
+            model_content = f.read()
+
+        model = (parse or load_model_from_bytes)(model_content)
+
+        version = f"{os.path.basename(self.path)}@{_content_digest(model_content)}"
+        return LoadedModel(model=model, version=version, source=self.path)
+
+    def current_version(self) -> str:
+        with open(self.path, "rb") as f:
+            return f"{os.path.basename(self.path)}@{_content_digest(f.read())}"
+
+
+def detect_model_format(content) -> str:
+    """Tell XGBoost's JSON and UBJSON (binary JSON) model formats apart"""
+    head = bytes(content[:2])
+    if head[:1] != b"{":
+        raise ValueError("Unrecognised model format")
+    # JSON objects open with a quoted key; UBJSON follows "{" with a type marker
+    return "json" if head[1:2] in (b'"', b"}", b" ", b"\n", b"\r", b"\t") else "ubj"
+
+
+def load_model_from_bytes(content) -> "xgb.XGBClassifier":
+    """Parse a JSON or UBJSON model straight from memory (no temp files)
+
+    Accepts bytes, bytearray or memoryview. XGBoost only takes a bytearray,
+    so other buffer types are copied once; a bytearray is used as-is.
+    """
+    # Imported here: xgboost pulls in scipy and scikit-learn, most of the startup time
+    import xgboost as xgb
+
+    detect_model_format(content)
+    buffer = content if isinstance(content, bytearray) else bytearray(content)
+    model = xgb.XGBClassifier()
+    model.load_model(buffer)
+    return model
+
+
+def load_compiled_from_bytes(content) -> CompiledTreeModel:
+    """Parse straight into the compiled evaluator
+
+    JSON models are read without importing xgboost at all, which is what
+    makes the compiled backend quick to cold-start. UBJSON still goes
+    through XGBoost to be decoded.
+    """
+    if detect_model_format(content) == "json":
+        return CompiledTreeModel.from_json(bytes(content))
+    return CompiledTreeModel.from_booster(load_model_from_bytes(content))
+
+
+def _content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:12]
+
+
+def load_from_source(source: ModelSource, parse: Optional[Callable] = None) -> LoadedModel:
+    """Load from a single source, recording how long it took"""
+    started = time.perf_counter()
+    loaded = source.load(parse)
+    loaded.load_time_seconds = time.perf_counter() - started
+    loaded.loaded_at = time.time()
+    logging.info(f"✅ Model {loaded.version} loaded from {loaded.source} "
+                 f"in {loaded.load_time_seconds:.3f}s")
+    return loaded
+
+
+def load_from_sources(sources: List[ModelSource], parse: Optional[Callable] = None) -> LoadedModel:
+    """Load from the first source that succeeds, in priority order"""
+    last_error = None
+    for priority, source in enumerate(sources):
+        try:
+            loaded = load_from_source(source, parse)
+            loaded.priority = priority
+            return loaded
+        except Exception as e:
+            last_error = e
+            logging.warning(f"⚠️ Failed to load model from {source.name}: {e}")
+
+    raise RuntimeError(f"No model source could be loaded: {last_error}")
+
+
+def warm_up(loaded: LoadedModel, batch_sizes=(1, 64)) -> None:
+    """Run throwaway predictions so the first real request doesn't pay for them
+
+    One row exercises the single-request path, a larger batch the batch
+    path (which the ``auto`` backend serves natively).
+    """
+    n_features = loaded.model.n_features_in_
+    for rows in batch_sizes:
+        loaded.model.predict_proba(np.zeros((rows, n_features), dtype=np.float32))
+
+
+class ModelRegistry:
+    """Holds the active model for the whole process
+
+    The model is loaded once (normally from the FastAPI lifespan) and handed
+    to request handlers without any I/O. If a handler asks before startup
+    loading has happened, the first caller loads it and everyone else waits.
+    """
+
+    def __init__(self, sources: List[ModelSource], nthread: Optional[int] = None, backend: str = "xgboost"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}, expected one of {BACKENDS}")
+        self.sources = sources
+        self.nthread = nthread
+        self.backend = backend
+        self._active: Optional[LoadedModel] = None
+        self.warmed_up = False
+        # Models made active, and how many of those came from a fallback source
+        self.loads = Counter()
+        self.fallbacks = Counter()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._active is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        active = self._active
+        return active.version if active is not None else None
+
+    def load(self) -> LoadedModel:
+        """(Re)load the model from the configured sources and make it active"""
+        with self._lock:
+            self._active = self._configure(load_from_sources(self.sources, self._parser()))
+            return self._active
+
+    def get(self) -> LoadedModel:
+        active = self._active
+        if active is None:
+            with self._lock:
+                if self._active is None:
+                    self._active = self._configure(load_from_sources(self.sources, self._parser()))
+                active = self._active
+        return active
+
+    def warm_up(self) -> float:
+        """Warm up the active model (loading it if needed); returns seconds taken"""
+        started = time.perf_counter()
+        warm_up(self.get())
+        self.warmed_up = True
+        return time.perf_counter() - started
+
+    def _parser(self) -> Callable:
+        return load_compiled_from_bytes if self.backend == "compiled" else load_model_from_bytes
+
+    def _configure(self, loaded: LoadedModel) -> LoadedModel:
+        self.loads.inc()
+        if loaded.priority > 0:
+            self.fallbacks.inc()
+        if self.nthread is not None:
+            loaded.model.set_params(n_jobs=self.nthread)
+        if self.backend == "compiled":
+            if not isinstance(loaded.model, CompiledTreeModel):
+                loaded.model = CompiledTreeModel.from_booster(loaded.model)
+        elif self.backend == "auto":
+            try:
+                loaded.model = HybridTreeModel(loaded.model)
+            except ValueError as e:
+                # auto is an optimisation: a model the compiled evaluator can't handle is still served
+                logging.warning(f"⚠️ Serving {loaded.version} with native XGBoost only: {e}")
+        return loaded
+
+    def get_model(self):
+        return self.get().model
+
+    def refresh(self) -> bool:
+        """Swap in a new model if the preferred source has changed
+
+        Sources are asked for their current version in priority order; the
+        first one that answers decides. An unreachable source is skipped,
+        but the active model is never replaced by one from a lower-priority
+        source: while GCS is down the last good GCS model keeps serving
+        rather than the bundled fallback. The new model is downloaded and
+        warmed up before a single reference assignment makes it live, so
+        in-flight requests keep using the model they already picked up.
+        Returns True when a new model was swapped in.
+        """
+        with self._refresh_lock:
+            for priority, source in enumerate(self.sources):
+                active = self._active
+                if active is not None and priority > active.priority:
+                    return False
+
+                try:
+                    version = source.current_version()
+                except Exception as e:
+                    logging.warning(f"⚠️ Could not check model version on {source.name}: {e}")
+                    continue
+
+                if active is not None and active.version == version:
+                    return False
+
+                try:
+                    loaded = load_from_source(source, self._parser())
+                    loaded.priority = priority
+                    loaded = self._configure(loaded)
+                    warm_up(loaded)
+                except Exception as e:
+                    logging.warning(f"⚠️ Failed to reload model from {source.name}: {e}")
+                    return False
+
+                self._active = loaded
+                logging.info(f"🔄 Swapped in model {loaded.version}")
+                return True
+
+            return False
+
+    def info(self) -> dict:
+        active = self._active
+        if active is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": active.version,
+            "source": active.source,
+            "backend": self.backend,
+            "load_time_seconds": round(active.load_time_seconds, 6),
+            "loaded_at": active.loaded_at,
+        }
+
+
+async def poll_for_updates(registry: ModelRegistry, interval_seconds: float) -> None:
+    """Periodically refresh the registry off the event loop until cancelled"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(registry.refresh)
+        except Exception as e:
+            logging.warning(f"⚠️ Model refresh failed: {e}")
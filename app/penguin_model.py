@@ -0,0 +1,119 @@
+"""What the API and offline batch scoring share about the penguin model
+
+The input schema, the column and label metadata saved at training time,
+the feature encoder compiled from them, and the sources the model is
+loaded from. Importing this module only reads the two small metadata
+files. Settings such as MODEL_PATH and GCS_* are read from the
+environment when the sources are built, not at import, so a caller can
+load a ``.env`` file first.
+"""
+import json
+import logging
+import os
+import tempfile
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.artifact_cache import ArtifactCache
+from app.feature_encoder import FeatureEncoder
+from app.gcs_client import CircuitBreaker, SharedStorageClient
+from app.model_registry import GCSModelSource, LocalFileModelSource
+
+# Paths
+BASE_PATH = os.path.dirname(__file__)
+DEFAULT_MODEL_PATH = os.path.join(BASE_PATH, "data", "model.json")
+COLUMNS_PATH = os.path.join(BASE_PATH, "data", "columns.json")
+LABELS_PATH = os.path.join(BASE_PATH, "data", "label_classes.json")
+
+
+# Enums for Input Validation
+class Island(str, Enum):
+    Torgersen = "Torgersen"
+    Biscoe = "Biscoe"
+    Dream = "Dream"
+
+
+class Sex(str, Enum):
+    Male = "male"
+    Female = "female"
+
+
+# Pydantic Input Schema
+class PenguinFeatures(BaseModel):
+    bill_length_mm: float
+    bill_depth_mm: float
+    flipper_length_mm: float
+    body_mass_g: float
+    year: int
+    sex: Sex
+    island: Island
+
+
+# Load model metadata (the model itself lives in the model registry)
+def load_columns_and_labels():
+    """Load column names and label classes (metadata only)"""
+    logging.info("Loading metadata...")
+
+    with open(COLUMNS_PATH, "r") as f:
+        columns = json.load(f)
+
+    with open(LABELS_PATH, "r") as f:
+        label_classes = json.load(f)
+
+    return columns, label_classes
+
+
+expected_columns, label_classes = load_columns_and_labels()
+
+# Compiled once: maps each input field straight to its column in expected_columns
+feature_encoder = FeatureEncoder.compile(PenguinFeatures, expected_columns)
+
+
+def model_path() -> str:
+    """The bundled model file, or MODEL_PATH when set"""
+    return os.getenv("MODEL_PATH", DEFAULT_MODEL_PATH)
+
+
+def create_gcs_client() -> SharedStorageClient:
+    """A pooled GCS client with the retry budget and circuit breaker from the GCS_* settings"""
+    return SharedStorageClient(
+        pool_size=int(os.getenv("GCS_POOL_SIZE", "10")),
+        retry_budget=float(os.getenv("GCS_RETRY_BUDGET_SECONDS", "10")),
+        breaker=CircuitBreaker(int(os.getenv("GCS_CIRCUIT_FAILURES", "3")),
+                               float(os.getenv("GCS_CIRCUIT_RESET_SECONDS", "60"))),
+    )
+
+
+def create_artifact_cache() -> Optional[ArtifactCache]:
+    """The on-disk cache of downloaded models, or None when MODEL_CACHE_DIR is empty"""
+    directory = os.getenv("MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "penguin-model-cache"))
+    if not directory:
+        return None
+    try:
+        return ArtifactCache(directory, int(float(os.getenv("MODEL_CACHE_MAX_MB", "200")) * 1024 * 1024))
+    except OSError as e:
+        logging.warning(f"⚠️ Model artifact cache disabled: {e}")
+        return None
+
+
+def model_sources(gcs_client: Optional[SharedStorageClient] = None,
+                  artifact_cache: Optional[ArtifactCache] = None) -> list:
+    """Model sources in priority order: GCS when configured, then the bundled file
+
+    GCS is read through ``gcs_client`` and ``artifact_cache``; without a
+    client, both are created from the settings, and only when GCS is
+    configured.
+    """
+    bucket_name = os.getenv("GCS_BUCKET_NAME")
+    blob_name = os.getenv("GCS_BLOB_NAME")
+
+    sources = []
+    if all([bucket_name, blob_name]):
+        if gcs_client is None:
+            gcs_client, artifact_cache = create_gcs_client(), create_artifact_cache()
+        sources.append(GCSModelSource(bucket_name, blob_name, client=gcs_client,
+                                      artifact_cache=artifact_cache))
+    sources.append(LocalFileModelSource(model_path()))
+    return sources
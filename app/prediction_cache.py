@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Hashable, Optional, Tuple
+
+from app.metrics import Counter
+
+
+class PredictionCache:
+    """Bounded LRU cache of model outputs with optional TTL
+
+    Keys are canonical tuples of the input fields, with floats rounded to
+    ``float_decimals`` so that measurements differing only below that
+    precision share an entry (``None`` keeps floats exact). Entries belong
+    to one model version: the first lookup under a different version empties
+    the cache, so a hot-reloaded model never serves its predecessor's answers.
+
+    Used from the event loop only, so it needs no locking.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0, float_decimals: Optional[int] = 2):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.float_decimals = float_decimals
+
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._version: Optional[str] = None
+
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = Counter()
+        self.expirations = Counter()
+        self.invalidations = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, features) -> tuple:
+        """Canonical, hashable form of a pydantic input model"""
+        parts = []
+        for name in type(features).model_fields:
+            value = getattr(features, name)
+            if isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, float) and self.float_decimals is not None:
+                # + 0.0 folds -0.0 into 0.0
+                value = round(value, self.float_decimals) + 0.0
+            parts.append(value)
+        return tuple(parts)
+
+    def get(self, key: Hashable, version: str):
+        if version != self._version:
+            if self._entries:
+                self.invalidations.inc()
+            self._entries.clear()
+            self._version = version
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses.inc()
+            return None
+
+        value, expires_at = entry
+        if expires_at and time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations.inc()
+            self.misses.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits.inc()
+        return value
+
+    def put(self, key: Hashable, version: str, value) -> None:
+        # A result computed under another model version is not ours to keep
+        if version != self._version:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions.inc()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "float_decimals": self.float_decimals,
+            "entries": len(self._entries),
+            "model_version": self._version,
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+            "evictions": self.evictions.value,
+            "expirations": self.expirations.value,
+            "invalidations": self.invalidations.value,
+        }
@@ -0,0 +1,106 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RequestProfiler:
+    """Captures cProfile stats for the next N requests, on demand
+
+    Nothing is profiled until ``arm(n)`` is called; until then the request
+    path only reads ``remaining``. Each claimed request runs its work under
+    its own cProfile.Profile (cProfile only sees the thread it runs on, so
+    the whole request is run synchronously in one call), and the results
+    are merged into one pstats.Stats. When ``output_dir`` is set the
+    merged stats are also written there as a ``.prof`` file once all N
+    requests have been captured, for snakeviz or ``python -m pstats``.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None):
+        self.output_dir = output_dir
+        self.remaining = 0
+        self.requested = 0
+        self.captured = 0
+        self.armed_at: Optional[float] = None
+        self.saved_to: Optional[str] = None
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def arm(self, requests: int) -> None:
+        """Profile the next ``requests`` requests, discarding earlier results"""
+        with self._lock:
+            self.requested = requests
+            self.captured = 0
+            self.armed_at = time.time()
+            self.saved_to = None
+            self._stats = None
+            self.remaining = requests
+        logging.info(f"Profiling the next {requests} prediction requests")
+
+    def claim(self) -> bool:
+        """Take one of the remaining slots; False when profiling is off"""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def run_if_claimed(self, fn: Callable, *args):
+        """``run`` if a slot can be claimed, otherwise just ``fn(*args)``
+
+        Called once the work is certain to run, so a request that is shed
+        or expires on the way never uses up a slot without being captured.
+        """
+        if self.claim():
+            return self.run(fn, *args)
+        return fn(*args)
+
+    def run(self, fn: Callable, *args):
+        """Call ``fn(*args)`` under the profiler and merge its stats"""
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(fn, *args)
+        finally:
+            self._add(profile)
+
+    def _add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self.captured += 1
+            if self.captured == self.requested and self.output_dir:
+                self.saved_to = self._save()
+
+    def _save(self) -> Optional[str]:
+        path = os.path.join(self.output_dir, f"predict-{int(self.armed_at)}.prof")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._stats.dump_stats(path)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save profile: {e}")
+            return None
+        logging.info(f"✅ Profile of {self.captured} requests saved to {path}")
+        return path
+
+    def report(self, limit: int = 30, sort: str = "cumulative") -> dict:
+        with self._lock:
+            text = ""
+            if self._stats is not None:
+                stream = io.StringIO()
+                self._stats.stream = stream
+                self._stats.sort_stats(sort).print_stats(limit)
+                text = stream.getvalue()
+            return {
+                "requested": self.requested,
+                "captured": self.captured,
+                "remaining": self.remaining,
+                "complete": self.requested > 0 and self.captured == self.requested,
+                "saved_to": self.saved_to,
+                "stats": text,
+            }
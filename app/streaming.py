@@ -0,0 +1,221 @@
+import csv
+import io
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+from pydantic import BaseModel, ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+from app.fast_json import dumps
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+# Request Content-Types accepted by the streaming endpoint
+STREAM_FORMATS = {
+    "application/x-ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/json-lines": NDJSON,
+    "text/csv": CSV,
+}
+
+# One parsed line: the validated row, or why it was rejected
+Row = Union[BaseModel, str]
+Chunk = List[Tuple[int, Row]]
+
+
+class StreamFormatError(ValueError):
+    """Raised when a stream can't be read at all (e.g. a CSV header missing columns)"""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split a byte stream into ``(line number, line)``, holding at most one line
+
+    Lines may span any number of chunks. A line longer than
+    ``max_line_bytes`` is discarded as it arrives and yielded as None, so
+    a record without a newline can't grow the buffer without bound.
+    """
+    buffer = bytearray()
+    overlong = False
+    number = 0
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            number += 1
+            if overlong or len(buffer) + end - start > max_line_bytes:
+                yield number, None
+            else:
+                buffer += chunk[start:end]
+                yield number, bytes(buffer.rstrip(b"\r"))
+            buffer.clear()
+            overlong = False
+            start = end + 1
+        if not overlong:
+            if len(buffer) + len(chunk) - start > max_line_bytes:
+                overlong = True
+                buffer.clear()
+            else:
+                buffer += chunk[start:]
+    if overlong or buffer.strip():
+        yield number + 1, None if overlong else bytes(buffer.rstrip(b"\r"))
+
+
+def describe_error(error: Exception) -> str:
+    """One-line reason a row was rejected, for the inline error record"""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+            for e in error.errors(include_url=False)
+        )
+    return str(error)
+
+
+class NDJSONReader:
+    """Validates each line as one JSON object"""
+
+    def __init__(self, model_cls: Type[BaseModel]):
+        self.model_cls = model_cls
+
+    def parse(self, line: bytes) -> BaseModel:
+        return self.model_cls.model_validate_json(line)
+
+
+class CSVReader:
+    """Validates each line as a CSV record, with field names from the header row
+
+    Records are read one line at a time, so quoted fields can't contain
+    newlines. Extra columns are ignored.
+    """
+
+    def __init__(self, model_cls: Type[BaseModel], header: Optional[bytes]):
+        if not header:
+            raise StreamFormatError("CSV body has no header row")
+        self.model_cls = model_cls
+        self.columns = next(csv.reader([header.decode("utf-8-sig")]))
+        missing = [name for name in model_cls.model_fields if name not in self.columns]
+        if missing:
+            raise StreamFormatError(f"CSV header is missing columns: {missing}")
+
+    def parse(self, line: bytes) -> BaseModel:
+        try:
+            values = next(csv.reader([line.decode("utf-8")]))
+        except csv.Error as e:  # e.g. a bare \r inside an unquoted field
+            raise ValueError(f"malformed CSV record: {e}") from e
+        if len(values) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} fields, got {len(values)}")
+        return self.model_cls.model_validate(dict(zip(self.columns, values)))
+
+
+async def read_chunks(lines: AsyncIterator[Tuple[int, Optional[bytes]]], reader,
+                      chunk_rows: int, max_line_bytes: int) -> AsyncIterator[Chunk]:
+    """Group parsed lines into chunks of up to ``chunk_rows`` rows, in input order
+
+    Blank lines are skipped; a line that fails to parse or validate stays
+    in the chunk as its error message instead of ending the stream.
+    """
+    chunk: Chunk = []
+    async for number, line in lines:
+        if line is None:
+            chunk.append((number, f"line longer than {max_line_bytes} bytes"))
+        elif not line.strip():
+            continue
+        else:
+            try:
+                chunk.append((number, reader.parse(line)))
+            except ValueError as e:  # ValidationError and UnicodeDecodeError included
+                chunk.append((number, describe_error(e)))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class NDJSONWriter:
+    """One JSON object per input row: its line number and prediction, or its error"""
+
+    media_type = NDJSON
+
+    def __init__(self, labels: Sequence[str], return_probabilities: bool = False):
+        self.labels = list(labels)
+        self.return_probabilities = return_probabilities
+
+    def header(self) -> bytes:
+        return b""
+
+    def rows(self, chunk: Chunk, probabilities: np.ndarray) -> bytes:
+        predicted = probabilities.argmax(axis=1).tolist() if len(probabilities) else []
+        values = probabilities.tolist() if self.return_probabilities else None
+        out, i = [], 0
+        for number, row in chunk:
+            if isinstance(row, str):
+                record = {"line": number, "error": row}
+            else:
+                record = {"line": number, "prediction": self.labels[predicted[i]]}
+                if values is not None:
+                    record["probabilities"] = dict(zip(self.labels, values[i]))
+                i += 1
+            out.append(dumps(record))
+        out.append(b"")
+        return b"\n".join(out)
+
+
+class CSVWriter:
+    """CSV with a ``line,prediction[,probability_<label>...],error`` header"""
+
+    media_type = CSV
+
+    def __init__(self, labels: Sequence[str], return_probabilities: bool = False):
+        self.labels = list(labels)
+        self.return_probabilities = return_probabilities
+
+    def header(self) -> bytes:
+        columns = ["line", "prediction"]
+        if self.return_probabilities:
+            columns += [f"probability_{label}" for label in self.labels]
+        return self._encode([columns + ["error"]])
+
+    def rows(self, chunk: Chunk, probabilities: np.ndarray) -> bytes:
+        predicted = probabilities.argmax(axis=1).tolist() if len(probabilities) else []
+        values = probabilities.tolist() if self.return_probabilities else None
+        blanks = [""] * len(self.labels) if self.return_probabilities else []
+        records, i = [], 0
+        for number, row in chunk:
+            if isinstance(row, str):
+                records.append([number, ""] + blanks + [row])
+            else:
+                records.append([number, self.labels[predicted[i]]] + (values[i] if values else []) + [""])
+                i += 1
+        return self._encode(records)
+
+    @staticmethod
+    def _encode(records: list) -> bytes:
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerows(records)
+        return out.getvalue().encode("utf-8")
+
+
+WRITERS = {NDJSON: NDJSONWriter, CSV: CSVWriter}
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body is produced while the request body is still being read
+
+    Starlette's StreamingResponse normally reads ``receive`` in a parallel
+    task to notice disconnects, which would swallow request body chunks.
+    Here the body iterator is the only reader: ``request.stream()`` raises
+    ClientDisconnect itself. Each output chunk is sent before the next
+    input chunk is read, so a slow reader slows the upload (backpressure).
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
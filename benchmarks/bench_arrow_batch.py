@@ -0,0 +1,63 @@
+"""Benchmark /predict/batch with a JSON body vs an Arrow IPC stream (needs pyarrow)
+
+Times the whole request (body parsing, encoding, inference, response)
+through the ASGI app, with the client-side encoding of each body done
+up front. Run from the project root:
+
+    python benchmarks/bench_arrow_batch.py --rows 100 1000 10000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pyarrow as pa  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.arrow_io import ARROW_STREAM  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.payloads import species_payload  # noqa: E402
+
+
+def arrow_body(rows: list) -> bytes:
+    table = pa.Table.from_pylist(rows)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(0)
+    print(f"{'rows':>6}{'json ms':>10}{'arrow ms':>10}{'speedup':>9}")
+    with TestClient(app) as client:
+        for n in args.rows:
+            rows = [species_payload(rng) for _ in range(n)]
+            json_body = json.dumps({"instances": rows, "return_probabilities": True}).encode()
+            arrow = arrow_body(rows)
+
+            def post_json():
+                client.post("/predict/batch", content=json_body, headers={"content-type": "application/json"})
+
+            def post_arrow():
+                client.post("/predict/batch?return_probabilities=true", content=arrow,
+                            headers={"content-type": ARROW_STREAM})
+
+            json_ms = min(timeit.repeat(post_json, number=1, repeat=args.repeat)) * 1000
+            arrow_ms = min(timeit.repeat(post_arrow, number=1, repeat=args.repeat)) * 1000
+            print(f"{n:>6}{json_ms:>10.2f}{arrow_ms:>10.2f}{json_ms / arrow_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark inference backends: native XGBoost vs the compiled NumPy evaluator
+
+Run from the project root:
+
+    python benchmarks/bench_backends.py --batch-sizes 1 32 1000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.tree_engine import CompiledTreeModel  # noqa: E402
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "app", "data", "model.json")
+
+
+def random_rows(n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    numeric = np.column_stack([rng.uniform(32, 60, n), rng.uniform(13, 22, n),
+                               rng.uniform(172, 231, n), rng.uniform(2700, 6300, n)])
+    one_hot = np.zeros((n, 5))
+    one_hot[np.arange(n), rng.integers(0, 2, n)] = 1
+    one_hot[np.arange(n), 2 + rng.integers(0, 3, n)] = 1
+    return np.hstack([numeric, one_hot]).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 1000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    native = xgb.XGBClassifier(n_jobs=1)
+    native.load_model(MODEL_PATH)
+    compiled = CompiledTreeModel.from_booster(native)
+
+    print(f"{'rows':>6}{'xgboost us':>14}{'compiled us':>14}{'speed-up':>10}")
+    for n in args.batch_sizes:
+        X = random_rows(n)
+        number = max(1, args.repeat // n)
+        timings = [min(timeit.repeat(lambda: model.predict_proba(X), number=number, repeat=3)) / number * 1e6
+                   for model in (native, compiled)]
+        print(f"{n:>6}{timings[0]:>14.1f}{timings[1]:>14.1f}{timings[0] / timings[1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark /predict/batch against looping the single-row /predict endpoint
+
+Run from the project root:
+
+    python benchmarks/bench_batch_predict.py --rows 1000
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def random_payload() -> dict:
+    return {
+        "bill_length_mm": random.uniform(32.1, 59.6),
+        "bill_depth_mm": random.uniform(13.1, 21.5),
+        "flipper_length_mm": random.uniform(172, 231),
+        "body_mass_g": random.uniform(2700, 6300),
+        "year": random.choice([2007, 2008, 2009]),
+        "sex": random.choice(["male", "female"]),
+        "island": random.choice(["Torgersen", "Biscoe", "Dream"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rows = [random_payload() for _ in range(args.rows)]
+
+    with TestClient(app) as client:
+        client.post("/predict", json=rows[0])
+
+        started = time.perf_counter()
+        for row in rows:
+            client.post("/predict", json=row)
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        client.post("/predict/batch", json={"instances": rows})
+        batch = time.perf_counter() - started
+
+    print(f"rows: {args.rows}")
+    print(f"single endpoint loop: {single:.3f}s ({single / args.rows * 1e6:.1f} us/row)")
+    print(f"batch endpoint:       {batch:.3f}s ({batch / args.rows * 1e6:.1f} us/row)")
+    print(f"speed-up:             {single / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark offline batch scoring (app/batch_score.py) by worker count
+
+Generates a survey file of species-mix rows, scores it with each worker
+count and reports rows/second and the speedup over one worker. Parquet is
+used when pyarrow is installed (CSV output formatting runs in the parent
+and limits scaling), CSV otherwise. Needs a multi-core Linux box to show
+scaling. Run from the project root:
+
+    python benchmarks/bench_batch_score.py --rows 1000000 --workers 1 2 4 8
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pandas as pd  # noqa: E402
+from app.batch_score import score_file  # noqa: E402
+from benchmarks.payloads import species_payload  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-rows", type=int, default=50000)
+    parser.add_argument("--format", choices=["parquet", "csv"])
+    args = parser.parse_args()
+
+    if args.format is None:
+        args.format = "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+
+    logging.disable(logging.INFO)
+    rng = random.Random(0)
+    frame = pd.DataFrame([species_payload(rng) for _ in range(args.rows)])
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, f"survey.{args.format}")
+        if args.format == "parquet":
+            frame.to_parquet(source, index=False)
+        else:
+            frame.to_csv(source, index=False)
+        del frame
+
+        print(f"{args.rows} rows, {args.format}, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>9}")
+        single = None
+        for workers in args.workers:
+            result = score_file(source, os.path.join(tmp, f"scored.{args.format}"), workers=workers,
+                                chunk_rows=args.chunk_rows)
+            single = single or result["rows_per_second"]
+            print(f"{workers:>8}{result['seconds']:>10.2f}{result['rows_per_second']:>12.0f}"
+                  f"{result['rows_per_second'] / single:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
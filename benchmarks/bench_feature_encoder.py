@@ -0,0 +1,55 @@
+"""Micro-benchmark: compiled FeatureEncoder vs the old pandas preprocess_features
+
+Run from the project root:
+
+    python benchmarks/bench_feature_encoder.py --repeat 2000
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.main import PenguinFeatures, expected_columns, feature_encoder  # noqa: E402
+
+
+def pandas_preprocess(features: PenguinFeatures, expected_columns: list) -> pd.DataFrame:
+    """The pandas pipeline preprocess_features used before the encoder"""
+    df = pd.DataFrame([features.model_dump(mode="json")])
+    df = pd.get_dummies(df, columns=["sex", "island"])
+    df = df.reindex(columns=expected_columns, fill_value=0)
+    return df.astype(float)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    features = PenguinFeatures(bill_length_mm=39.1, bill_depth_mm=18.7, flipper_length_mm=181,
+                               body_mass_g=3750, year=2007, sex="male", island="Torgersen")
+    rows = [features] * args.batch
+
+    cases = {
+        "pandas, 1 row": (lambda: pandas_preprocess(features, expected_columns).values, 1),
+        "encoder, 1 row": (lambda: feature_encoder.encode(features), 1),
+        f"pandas, {args.batch} rows (loop)": (
+            lambda: [pandas_preprocess(r, expected_columns).values for r in rows], args.batch),
+        f"encoder, {args.batch} rows": (lambda: feature_encoder.encode_batch(rows), args.batch),
+    }
+
+    print(f"{'case':<32}{'us/call':>12}{'us/row':>12}")
+    for name, (fn, n_rows) in cases.items():
+        number = max(1, args.repeat // n_rows)
+        seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(f"{name:<32}{seconds * 1e6:>12.1f}{seconds * 1e6 / n_rows:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark model loading: JSON vs UBJSON, and temp-file vs in-memory parsing
+
+Run from the project root:
+
+    python benchmarks/bench_model_load.py --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import xgboost as xgb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.model_registry import load_model_from_bytes  # noqa: E402
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "app", "data", "model.json")
+
+
+def load_via_temp_file(content: bytes):
+    """The old GCS path: write the download to disk, load it, delete it"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        f.write(content)
+        path = f.name
+    try:
+        model = xgb.XGBClassifier()
+        model.load_model(path)
+        return model
+    finally:
+        os.remove(path)
+
+
+def time_it(fn, repeat: int) -> dict:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": statistics.median(samples),
+        "min_ms": min(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with open(MODEL_PATH, "rb") as f:
+        json_bytes = f.read()
+    ubj_bytes = bytes(load_model_from_bytes(json_bytes).get_booster().save_raw(raw_format="ubj"))
+
+    cases = {
+        "json, temp file": lambda: load_via_temp_file(json_bytes),
+        "json, in memory": lambda: load_model_from_bytes(json_bytes),
+        "ubj, in memory": lambda: load_model_from_bytes(ubj_bytes),
+    }
+
+    print(f"model.json: {len(json_bytes) / 1024:.1f} KB, model.ubj: {len(ubj_bytes) / 1024:.1f} KB")
+    print(f"{'case':<20}{'mean ms':>10}{'p50 ms':>10}{'min ms':>10}")
+    for name, fn in cases.items():
+        result = time_it(fn, args.repeat)
+        print(f"{name:<20}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}{result['min_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
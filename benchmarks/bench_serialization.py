@@ -0,0 +1,70 @@
+"""Micro-benchmark: request parsing and response rendering, old path vs fast path
+
+Parsing:   json.loads + model_validate (FastAPI's generic body handling)
+           vs model_validate_json straight from the request bytes
+Rendering: jsonable_encoder + JSONResponse with probabilities.tolist()
+           vs FastJSONResponse (orjson, NumPy arrays written directly)
+
+Run from the project root:
+
+    python benchmarks/bench_serialization.py --rows 1 100 1000 10000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import timeit
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.fast_json import FastJSONResponse, orjson  # noqa: E402
+from app.main import BatchPredictionRequest, label_classes  # noqa: E402
+from benchmarks.payloads import batch_payload  # noqa: E402
+
+
+def per_call_us(fn, repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=loops)) / loops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"orjson: {'yes' if orjson is not None else 'not installed (stdlib fallback)'}")
+    print(f"{'rows':>6} {'stage':<8}{'old us':>12}{'fast us':>12}{'speedup':>9}")
+    rng = random.Random(0)
+    for rows in args.rows:
+        body = json.dumps(batch_payload(rows, rng, return_probabilities=True)).encode()
+        probabilities = np.random.default_rng(0).dirichlet([1, 1, 1], size=rows).astype(np.float32)
+        predictions = [label_classes[i] for i in probabilities.argmax(axis=1)]
+
+        parse_old = per_call_us(lambda: BatchPredictionRequest.model_validate(json.loads(body)), args.repeat)
+        parse_new = per_call_us(lambda: BatchPredictionRequest.model_validate_json(body), args.repeat)
+
+        def render_old():
+            return JSONResponse(jsonable_encoder({"predictions": predictions,
+                                                  "probabilities": probabilities.tolist()}))
+
+        def render_new():
+            return FastJSONResponse({"predictions": predictions, "probabilities": probabilities})
+
+        render_old_us = per_call_us(render_old, args.repeat)
+        render_new_us = per_call_us(render_new, args.repeat)
+
+        for stage, old, new in (("parse", parse_old, parse_new), ("render", render_old_us, render_new_us)):
+            print(f"{rows:>6} {stage:<8}{old:>12.1f}{new:>12.1f}{old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
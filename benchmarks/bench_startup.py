@@ -0,0 +1,93 @@
+"""Measure cold-start cost: import time breakdown and time-to-first-prediction
+
+Each trial runs in a fresh interpreter, like a Cloud Run instance scaling
+from zero, and records three phases:
+
+    import         `import app.main`
+    startup        the FastAPI lifespan (model load and warm-up)
+    first_predict  the first POST /predict once startup is done
+
+`--imports` prints where import time goes instead, grouped by top-level
+package (from `python -X importtime`). Run from the project root:
+
+    python benchmarks/bench_startup.py --trials 5
+    python benchmarks/bench_startup.py --imports
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TRIAL = """
+import json, time
+from fastapi.testclient import TestClient
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    response = client.post("/predict", json={
+        "bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+        "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen",
+    })
+    first = time.perf_counter()
+    assert response.status_code == 200, response.text
+print(json.dumps({"import": imported - started, "startup": ready - imported, "first_predict": first - ready}))
+"""
+
+
+def run_trial(env: dict) -> dict:
+    output = subprocess.run([sys.executable, "-c", TRIAL], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(top: int) -> None:
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stderr
+    self_us = defaultdict(int)
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].startswith("import time:") or "self [us]" in line:
+            continue
+        package = parts[2].strip().split(".")[0]
+        self_us[package] += int(parts[0].split(":")[1])
+
+    total = sum(self_us.values())
+    print(f"import app.main: {total / 1000:.0f} ms total")
+    for package, us in sorted(self_us.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<24} {us / 1000:8.1f} ms  {100 * us / total:5.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--imports", action="store_true", help="print the import time breakdown and exit")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--no-warmup", action="store_true", help="set MODEL_WARMUP=0 for comparison")
+    args = parser.parse_args()
+
+    if args.imports:
+        import_profile(args.top)
+        return
+
+    env = dict(os.environ, MODEL_POLL_INTERVAL_SECONDS="0")
+    if args.no_warmup:
+        env["MODEL_WARMUP"] = "0"
+    trials = [run_trial(env) for _ in range(args.trials)]
+
+    print(f"{'phase':<16}{'median ms':>12}{'min ms':>10}")
+    for phase in ("import", "startup", "first_predict"):
+        values = [t[phase] * 1000 for t in trials]
+        print(f"{phase:<16}{statistics.median(values):>12.1f}{min(values):>10.1f}")
+    totals = [sum(t.values()) * 1000 for t in trials]
+    print(f"{'total':<16}{statistics.median(totals):>12.1f}{min(totals):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark /predict throughput and memory by gunicorn worker count
+
+Starts `gunicorn -c gunicorn.conf.py app.main:app` for each worker count,
+drives it with concurrent keep-alive clients for a fixed time and reports
+requests/second plus total unique memory (USS) and shared-aware memory
+(PSS) across the master and its workers. Needs a multi-core Linux box to
+show scaling. Run from the project root:
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --clients 16 --duration 10
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PAYLOAD = json.dumps({
+    "bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+    "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen",
+})
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def client_loop(port: int, stop_at: float, counts: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    done = 0
+    headers = {"Content-Type": "application/json"}
+    while time.time() < stop_at:
+        conn.request("POST", "/predict", body=PAYLOAD, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+    counts.append(done)
+
+
+def process_tree(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        children.append(int(entry))
+            except OSError:
+                pass
+    return [pid] + children
+
+
+def memory_kb(pids: list) -> dict:
+    totals = {"Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in totals:
+                        totals[key] += int(value.split()[0])
+        except OSError:
+            pass
+    return {"pss_mb": totals["Pss"] / 1024,
+            "uss_mb": (totals["Private_Clean"] + totals["Private_Dirty"]) / 1024}
+
+
+def run(workers: int, clients: int, duration: float) -> dict:
+    port = free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), PORT=str(port),
+               MODEL_POLL_INTERVAL_SECONDS="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app", "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port)
+        stop_at = time.time() + duration
+        counts = []
+        threads = [threading.Thread(target=client_loop, args=(port, stop_at, counts)) for _ in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        memory = memory_kb(process_tree(server.pid))
+        return {"workers": workers, "rps": sum(counts) / duration, **memory}
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"cores: {os.cpu_count()}, clients: {args.clients}, duration: {args.duration}s")
+    print(f"{'workers':>8}{'req/s':>10}{'scaling':>10}{'PSS MB':>10}{'USS MB':>10}")
+    baseline = None
+    for workers in args.workers:
+        result = run(workers, args.clients, args.duration)
+        baseline = baseline or result["rps"]
+        print(f"{workers:>8}{result['rps']:>10.0f}{result['rps'] / baseline:>9.2f}x"
+              f"{result['pss_mb']:>10.0f}{result['uss_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Request payloads shared by locustfile.py and the benchmark suite
+
+Measurements are drawn from each species' observed ranges, so the mix of
+requests (and the trees they exercise) matches what PenguinAPIUser sends.
+Every generator takes an optional ``rng`` so benchmark runs can be seeded.
+"""
+import random
+
+YEARS = [2007, 2008, 2009]
+SEXES = ["male", "female"]
+
+
+def adelie_payload(rng=random) -> dict:
+    """Adelie penguin (most common)"""
+    return {
+        "bill_length_mm": rng.uniform(32.1, 46.0),
+        "bill_depth_mm": rng.uniform(15.5, 21.5),
+        "flipper_length_mm": rng.uniform(172, 210),
+        "body_mass_g": rng.uniform(2850, 4775),
+        "year": rng.choice(YEARS),
+        "sex": rng.choice(SEXES),
+        "island": rng.choice(["Torgersen", "Biscoe", "Dream"]),
+    }
+
+
+def gentoo_payload(rng=random) -> dict:
+    """Gentoo penguin"""
+    return {
+        "bill_length_mm": rng.uniform(40.9, 59.6),
+        "bill_depth_mm": rng.uniform(13.1, 17.3),
+        "flipper_length_mm": rng.uniform(203, 231),
+        "body_mass_g": rng.uniform(3950, 6300),
+        "year": rng.choice(YEARS),
+        "sex": rng.choice(SEXES),
+        "island": "Biscoe",  # Gentoo are mostly on Biscoe
+    }
+
+
+def chinstrap_payload(rng=random) -> dict:
+    """Chinstrap penguin"""
+    return {
+        "bill_length_mm": rng.uniform(40.9, 58.0),
+        "bill_depth_mm": rng.uniform(16.4, 20.8),
+        "flipper_length_mm": rng.uniform(178, 212),
+        "body_mass_g": rng.uniform(2700, 4800),
+        "year": rng.choice(YEARS),
+        "sex": rng.choice(SEXES),
+        "island": "Dream",  # Chinstrap are mostly on Dream
+    }
+
+
+def invalid_payload(rng=random) -> dict:
+    """A request that must fail validation (422)"""
+    payload = adelie_payload(rng)
+    payload["bill_length_mm"] = "invalid"  # Should be float
+    return payload
+
+
+# Same weights as the PenguinAPIUser tasks
+SPECIES_WEIGHTS = [(adelie_payload, 3), (gentoo_payload, 2), (chinstrap_payload, 2)]
+
+
+def species_payload(rng=random) -> dict:
+    """A payload from the weighted species mix"""
+    generators, weights = zip(*SPECIES_WEIGHTS)
+    return rng.choices(generators, weights=weights)[0](rng)
+
+
+def batch_payload(rows: int, rng=random, return_probabilities: bool = False) -> dict:
+    """A /predict/batch request of ``rows`` species-mix instances"""
+    return {
+        "instances": [species_payload(rng) for _ in range(rows)],
+        "return_probabilities": return_probabilities,
+    }
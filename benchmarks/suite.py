@@ -0,0 +1,225 @@
+"""Offline benchmark suite with machine-readable results and regression checks
+
+Runs without a deployed server or Locust:
+
+- micro-benchmarks of preprocessing, model loading and inference, timed
+  with timeit over several rounds, pytest-benchmark style (min, median,
+  mean, stddev, ops/s)
+- an in-process load generator driving /predict and /predict/batch
+  through httpx's ASGI transport with concurrent clients, reporting
+  throughput and latency percentiles. Payloads come from
+  benchmarks/payloads.py, the same generators locustfile.py uses.
+
+Results are written as JSON. Given a baseline (an earlier results file
+from the same machine), every metric is compared and the run exits with
+status 1 if one got worse by more than the tolerance. Run from the
+project root:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --save-baseline baseline.json
+    python benchmarks/suite.py --baseline baseline.json --tolerance 0.25
+    python benchmarks/suite.py --quick --only micro
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("MODEL_POLL_INTERVAL_SECONDS", "0")
+
+import numpy as np  # noqa: E402
+from benchmarks.payloads import batch_payload, species_payload  # noqa: E402
+
+SEED = 2004
+
+
+def measure(fn, rounds: int) -> dict:
+    """Time ``fn`` over ``rounds`` rounds of an auto-ranged number of calls"""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    per_call = [t / loops for t in timer.repeat(repeat=rounds, number=loops)]
+    median = statistics.median(per_call)
+    return {
+        "min_s": min(per_call),
+        "median_s": median,
+        "mean_s": statistics.fmean(per_call),
+        "stddev_s": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "ops_per_s": 1.0 / median,
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+def micro_benchmarks(rounds: int) -> dict:
+    from app.main import MODEL_PATH, PenguinFeatures, feature_encoder
+    from app.model_registry import load_compiled_from_bytes, load_model_from_bytes
+
+    rng = random.Random(SEED)
+    one = PenguinFeatures(**species_payload(rng))
+    hundred = [PenguinFeatures(**species_payload(rng)) for _ in range(100)]
+    with open(MODEL_PATH, "rb") as f:
+        model_json = f.read()
+    native = load_model_from_bytes(model_json)
+    native.set_params(n_jobs=1)
+    compiled = load_compiled_from_bytes(model_json)
+    X1 = feature_encoder.encode(one)
+    X100 = feature_encoder.encode_batch(hundred)
+
+    cases = {
+        "preprocess_one": lambda: feature_encoder.encode(one),
+        "preprocess_batch_100": lambda: feature_encoder.encode_batch(hundred),
+        "model_load_json": lambda: load_model_from_bytes(model_json),
+        "model_load_compiled": lambda: load_compiled_from_bytes(model_json),
+        "inference_native_1": lambda: native.predict_proba(X1),
+        "inference_native_100": lambda: native.predict_proba(X100),
+        "inference_compiled_1": lambda: compiled.predict_proba(X1),
+        "inference_compiled_100": lambda: compiled.predict_proba(X100),
+    }
+    results = {}
+    for name, fn in cases.items():
+        results[name] = measure(fn, rounds)
+        print(f"  {name:<26}{results[name]['median_s'] * 1e6:>12.1f} us/op")
+    return results
+
+
+async def drive(client, requests: list, concurrency: int) -> dict:
+    """Send ``requests`` as (path, json) from ``concurrency`` concurrent clients"""
+    latencies, errors = [], 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for path, body in pending:
+            started = time.perf_counter()
+            response = await client.post(path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+async def load_benchmarks(scale: float) -> dict:
+    import httpx
+    from app.main import app
+
+    rng = random.Random(SEED)
+    scenarios = {
+        "predict": ([("/predict", species_payload(rng)) for _ in range(int(2000 * scale))], 16),
+        "predict_batch_100": ([("/predict/batch", batch_payload(100, rng)) for _ in range(int(200 * scale))], 4),
+    }
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, (requests, concurrency) in scenarios.items():
+                await drive(client, requests[:concurrency], concurrency)  # warm-up
+                results[name] = await drive(client, requests, concurrency)
+                r = results[name]
+                print(f"  {name:<26}{r['rps']:>10.0f} req/s  p50 {r['p50_ms']:.2f} ms  "
+                      f"p95 {r['p95_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms  errors {r['errors']}")
+    return results
+
+
+def flatten(results: dict) -> dict:
+    """Comparable metrics: micro medians and load p95/throughput"""
+    metrics = {}
+    for name, r in results.get("micro", {}).items():
+        metrics[f"micro/{name}/median_s"] = r["median_s"]
+    for name, r in results.get("load", {}).items():
+        metrics[f"load/{name}/p95_ms"] = r["p95_ms"]
+        metrics[f"load/{name}/rps"] = r["rps"]
+    return metrics
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics that got worse than the baseline by more than ``tolerance``"""
+    regressions = []
+    now, before = flatten(current), flatten(baseline)
+    for key, value in now.items():
+        if key not in before or before[key] <= 0:
+            continue
+        higher_is_better = key.endswith("/rps")
+        change = (before[key] - value) / before[key] if higher_is_better else (value - before[key]) / before[key]
+        if change > tolerance:
+            regressions.append({"metric": key, "baseline": before[key], "current": value, "worse_by": change})
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=["micro", "load"], help="run one group only")
+    parser.add_argument("--quick", action="store_true", help="fewer rounds and requests (smoke test)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        }
+    }
+    if args.only in (None, "micro"):
+        print("Micro-benchmarks")
+        results["micro"] = micro_benchmarks(rounds=3 if args.quick else 7)
+    if args.only in (None, "load"):
+        print("In-process load")
+        results["load"] = asyncio.run(load_benchmarks(scale=0.1 if args.quick else 1.0))
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['metric']}: {r['baseline']:.6g} -> {r['current']:.6g} "
+                  f"({r['worse_by']:.0%} worse)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# Multi-worker serving: gunicorn -c gunicorn.conf.py app.main:app
+#
+# The app is imported and the model loaded once in the master process
+# (preload_app + when_ready), then workers are forked and share the
+# model's memory copy-on-write. Workers never touch the booster's tree
+# arrays for writing, so those pages stay shared, and adding workers costs
+# neither another model copy nor another GCS download. Each worker drops the
+# master's GCS client after the fork and opens its own connections.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any fork
+    from app.main import preload_model
+
+    preload_model()
+    server.log.info("Model preloaded in master; workers will share it")
@@ -1,11 +1,67 @@
-import random
-from locust import HttpUser, task, between
+"""Load profiles for the penguin API
+
+The default profile ("think") simulates real users: 1-3 s of think time
+between requests, with users and spawn rate from the command line. The
+other profiles measure server capacity instead and drive the run with a
+load shape. Pick one with LOAD_PROFILE:
+
+    constant    LOAD_USERS users holding LOAD_TARGET_RPS requests/s in total
+    step        LOAD_STEP_USERS more users every LOAD_STEP_SECONDS, up to LOAD_USERS
+    spike       LOAD_USERS, a burst to LOAD_SPIKE_USERS for LOAD_SPIKE_SECONDS, then back
+    soak        LOAD_USERS at constant throughput for LOAD_SOAK_SECONDS
+    saturation  LOAD_USERS users with no wait at all between requests
+
+Every run also writes per-endpoint percentiles for each stage of the
+shape (each step, spike phase, ...) to LOAD_RESULTS_DIR as CSV and JSON.
+Against a local server with no GCS access:
+
+    MODEL_POLL_INTERVAL_SECONDS=0 uvicorn app.main:app --port 8000
+    LOAD_PROFILE=step locust -f locustfile.py --headless --host http://localhost:8000
+"""
+import csv
+import json
+import logging
+import os
+import time
+from locust import HttpUser, LoadTestShape, task, between, constant, constant_throughput, events
+from benchmarks.payloads import (
+    adelie_payload, batch_payload, chinstrap_payload, gentoo_payload, invalid_payload
+)
+
+LOAD_PROFILE = os.getenv("LOAD_PROFILE", "think")
+LOAD_USERS = int(os.getenv("LOAD_USERS", "20"))
+LOAD_SPAWN_RATE = float(os.getenv("LOAD_SPAWN_RATE", "10"))
+LOAD_DURATION_SECONDS = int(os.getenv("LOAD_DURATION_SECONDS", "120"))
+LOAD_TARGET_RPS = float(os.getenv("LOAD_TARGET_RPS", "50"))
+LOAD_STEP_USERS = int(os.getenv("LOAD_STEP_USERS", "5"))
+LOAD_STEP_SECONDS = int(os.getenv("LOAD_STEP_SECONDS", "30"))
+LOAD_SPIKE_USERS = int(os.getenv("LOAD_SPIKE_USERS", "100"))
+LOAD_SPIKE_SECONDS = int(os.getenv("LOAD_SPIKE_SECONDS", "20"))
+LOAD_SOAK_SECONDS = int(os.getenv("LOAD_SOAK_SECONDS", "3600"))
+LOAD_RESULTS_DIR = os.getenv("LOAD_RESULTS_DIR", "load_results")
+# Rows per /predict/batch request, and how often that task runs relative to the others
+BATCH_ROWS = int(os.getenv("BATCH_ROWS", "50"))
+BATCH_TASK_WEIGHT = int(os.getenv("BATCH_TASK_WEIGHT", "0" if LOAD_PROFILE == "think" else "1"))
+
+PROFILES = ("think", "constant", "step", "spike", "soak", "saturation")
+if LOAD_PROFILE not in PROFILES:
+    raise ValueError(f"Unknown LOAD_PROFILE {LOAD_PROFILE!r}, expected one of {PROFILES}")
+
+
+def profile_wait_time():
+    if LOAD_PROFILE == "saturation":
+        return constant(0)
+    if LOAD_PROFILE in ("constant", "soak"):
+        # constant_throughput is per user: split the target across them
+        return constant_throughput(LOAD_TARGET_RPS / max(1, LOAD_USERS))
+    # Wait between 1-3 seconds between requests (realistic user behavior)
+    return between(1, 3)
+
 
 class PenguinAPIUser(HttpUser):
     """Simulate users making penguin predictions"""
     
-    # Wait between 1-3 seconds between requests (realistic user behavior)
-    wait_time = between(1, 3)
+    wait_time = profile_wait_time()
     
     def on_start(self):
         """Called when a user starts"""
@@ -15,15 +71,7 @@ class PenguinAPIUser(HttpUser):
     @task(3)
     def predict_adelie(self):
         """Simulate predicting Adelie penguin (most common)"""
-        payload = {
-            "bill_length_mm": random.uniform(32.1, 46.0),
-            "bill_depth_mm": random.uniform(15.5, 21.5),
-            "flipper_length_mm": random.uniform(172, 210),
-            "body_mass_g": random.uniform(2850, 4775),
-            "year": random.choice([2007, 2008, 2009]),
-            "sex": random.choice(["male", "female"]),
-            "island": random.choice(["Torgersen", "Biscoe", "Dream"])
-        }
+        payload = adelie_payload()
         
         with self.client.post("/predict", json=payload, catch_response=True) as response:
             if response.status_code == 200:
@@ -38,15 +86,7 @@ class PenguinAPIUser(HttpUser):
     @task(2)
     def predict_gentoo(self):
         """Simulate predicting Gentoo penguin"""
-        payload = {
-            "bill_length_mm": random.uniform(40.9, 59.6),
-            "bill_depth_mm": random.uniform(13.1, 17.3), 
-            "flipper_length_mm": random.uniform(203, 231),
-            "body_mass_g": random.uniform(3950, 6300),
-            "year": random.choice([2007, 2008, 2009]),
-            "sex": random.choice(["male", "female"]),
-            "island": "Biscoe"  # Gentoo are mostly on Biscoe
-        }
+        payload = gentoo_payload()
         
         with self.client.post("/predict", json=payload, catch_response=True) as response:
             if response.status_code == 200:
@@ -61,15 +101,7 @@ class PenguinAPIUser(HttpUser):
     @task(2)
     def predict_chinstrap(self):
         """Simulate predicting Chinstrap penguin"""
-        payload = {
-            "bill_length_mm": random.uniform(40.9, 58.0),
-            "bill_depth_mm": random.uniform(16.4, 20.8),
-            "flipper_length_mm": random.uniform(178, 212),
-            "body_mass_g": random.uniform(2700, 4800),
-            "year": random.choice([2007, 2008, 2009]),
-            "sex": random.choice(["male", "female"]),
-            "island": "Dream"  # Chinstrap are mostly on Dream
-        }
+        payload = chinstrap_payload()
         
         with self.client.post("/predict", json=payload, catch_response=True) as response:
             if response.status_code == 200:
@@ -81,6 +113,20 @@ class PenguinAPIUser(HttpUser):
             else:
                 response.failure(f"Got status code {response.status_code}")
     
+    @task(BATCH_TASK_WEIGHT)
+    def predict_batch(self):
+        """Score BATCH_ROWS penguins of the species mix in one request"""
+        payload = batch_payload(BATCH_ROWS)
+
+        with self.client.post("/predict/batch", json=payload, catch_response=True) as response:
+            if response.status_code == 200:
+                if len(response.json().get("predictions", [])) == BATCH_ROWS:
+                    response.success()
+                else:
+                    response.failure("Wrong number of predictions in response")
+            else:
+                response.failure(f"Got status code {response.status_code}")
+
     @task(1)
     def health_check(self):
         """Periodic health checks"""
@@ -97,18 +143,124 @@ class PenguinAPIUser(HttpUser):
     @task(1)
     def invalid_request(self):
         """Test error handling with invalid requests"""
-        invalid_payload = {
-            "bill_length_mm": "invalid",  # Should be float
-            "bill_depth_mm": 18.7,
-            "flipper_length_mm": 181,
-            "body_mass_g": 3750,
-            "year": 2007,
-            "sex": "male",
-            "island": "Torgersen"
-        }
-        
-        with self.client.post("/predict", json=invalid_payload, catch_response=True) as response:
+        with self.client.post("/predict", json=invalid_payload(), catch_response=True) as response:
             if response.status_code == 422:  # Validation error expected
                 response.success()
             else:
-                response.failure(f"Expected 422, got {response.status_code}")
\ No newline at end of file
+                response.failure(f"Expected 422, got {response.status_code}")
+
+
+class StageRecorder:
+    """Collects per-endpoint percentiles for each stage of a load shape
+
+    Locust's statistics are snapshotted and reset whenever the shape moves
+    to a new stage, so each stage is summarised on its own.
+    """
+
+    PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.rows = []
+        self.stage = None
+        self.stage_started = None
+
+    def switch(self, environment, stage: str) -> None:
+        if stage != self.stage:
+            self.flush(environment)
+            self.stage = stage
+            self.stage_started = time.time()
+
+    def flush(self, environment) -> None:
+        if self.stage is None:
+            return
+        stats = environment.stats
+        elapsed = max(time.time() - self.stage_started, 1e-9)
+        for entry in list(stats.entries.values()) + [stats.total]:
+            if not entry.num_requests:
+                continue
+            row = {
+                "profile": LOAD_PROFILE,
+                "stage": self.stage,
+                "method": entry.method or "",
+                "name": entry.name,
+                "requests": entry.num_requests,
+                "failures": entry.num_failures,
+                "rps": round(entry.num_requests / elapsed, 3),
+                "avg_ms": round(entry.avg_response_time, 3),
+            }
+            for p in self.PERCENTILES:
+                row[f"p{int(p * 100)}_ms"] = entry.get_response_time_percentile(p)
+            self.rows.append(row)
+        stats.reset_all()
+
+    def write(self) -> str:
+        os.makedirs(LOAD_RESULTS_DIR, exist_ok=True)
+        prefix = os.path.join(LOAD_RESULTS_DIR, f"{LOAD_PROFILE}-{int(time.time())}")
+        with open(f"{prefix}.json", "w") as f:
+            json.dump(self.rows, f, indent=2)
+        if self.rows:
+            with open(f"{prefix}.csv", "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+                writer.writeheader()
+                writer.writerows(self.rows)
+        return prefix
+
+
+recorder = StageRecorder()
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    if LOAD_PROFILE == "think":
+        recorder.switch(environment, "think")
+
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kwargs):
+    recorder.flush(environment)
+    prefix = recorder.write()
+    recorder.reset()
+    logging.info(f"Per-stage results written to {prefix}.json and {prefix}.csv")
+
+
+def profile_stage(run_time: float):
+    """(stage name, users) for the selected profile at ``run_time``, or None to stop"""
+    if LOAD_PROFILE in ("constant", "saturation"):
+        return (LOAD_PROFILE, LOAD_USERS) if run_time < LOAD_DURATION_SECONDS else None
+    if LOAD_PROFILE == "soak":
+        return ("soak", LOAD_USERS) if run_time < LOAD_SOAK_SECONDS else None
+    if LOAD_PROFILE == "step":
+        users = min(LOAD_USERS, LOAD_STEP_USERS * (int(run_time // LOAD_STEP_SECONDS) + 1))
+        steps_to_max = -(-LOAD_USERS // LOAD_STEP_USERS)
+        if run_time >= LOAD_STEP_SECONDS * (steps_to_max + 1):  # hold the top step once
+            return None
+        return (f"step-{users}-users", users)
+    if LOAD_PROFILE == "spike":
+        phase = LOAD_DURATION_SECONDS / 3
+        if run_time < phase:
+            return ("baseline", LOAD_USERS)
+        if run_time < phase + LOAD_SPIKE_SECONDS:
+            return ("spike", LOAD_SPIKE_USERS)
+        if run_time < 2 * phase + LOAD_SPIKE_SECONDS:
+            return ("recovery", LOAD_USERS)
+        return None
+    return None
+
+
+if LOAD_PROFILE != "think":
+    # Only defined when selected: any LoadTestShape in the file overrides -u/-r
+    class ProfileShape(LoadTestShape):
+        """Drives the run through the stages of LOAD_PROFILE"""
+
+        def tick(self):
+            stage = profile_stage(self.get_run_time())
+            if stage is None:
+                return None
+            name, users = stage
+            recorder.switch(self.runner.environment, name)
+            # Spikes arrive all at once; other shapes ramp at LOAD_SPAWN_RATE
+            spawn_rate = users if name == "spike" else LOAD_SPAWN_RATE
+            return users, spawn_rate
@@ -0,0 +1,132 @@
+# tests/test_admission.py
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.admission import AdmissionController, AdmissionRejected
+from app.main import app
+
+client = TestClient(app)
+
+SAMPLE = {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+          "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"}
+
+
+def saturated(**kwargs) -> AdmissionController:
+    """A one-slot controller whose slot is already taken"""
+    controller = AdmissionController(1, **kwargs)
+    controller.in_flight = 1
+    return controller
+
+
+class TestAdmissionController:
+    """Test the concurrency limit and bounded wait queue"""
+
+    def test_admits_up_to_limit_at_once(self):
+        """Test requests under the limit are admitted without waiting"""
+        controller = AdmissionController(2, max_queue=0)
+
+        async def scenario():
+            await controller.acquire()
+            await controller.acquire()
+            with pytest.raises(AdmissionRejected) as rejected:
+                await controller.acquire()
+            return rejected.value
+
+        rejected = asyncio.run(scenario())
+        assert controller.in_flight == 2
+        assert rejected.status_code == 429 and rejected.retry_after == 1
+        assert controller.admitted.value == 2 and controller.rejected_queue_full.value == 1
+        assert controller.queue_wait.count == 2
+        assert controller.shed_within(60) and not controller.shed_within(0)
+
+    def test_release_hands_slot_to_oldest_waiter(self):
+        """Test waiters are admitted in arrival order as slots are released"""
+        controller = AdmissionController(1, max_queue=2, max_wait_ms=1000)
+        order = []
+
+        async def request(name):
+            async with controller.slot():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(request("a"), request("b"), request("c"))
+
+        asyncio.run(scenario())
+        assert order == ["a", "b", "c"]
+        assert controller.in_flight == 0 and controller.queue_depth == 0
+        assert controller.queue_wait.sum > 0
+
+    def test_waiter_times_out_with_503(self):
+        """Test a queued request that gets no slot in time is rejected and dequeued"""
+        controller = saturated(max_queue=1, max_wait_ms=10)
+
+        async def scenario():
+            with pytest.raises(AdmissionRejected) as rejected:
+                await controller.acquire()
+            return rejected.value
+
+        assert asyncio.run(scenario()).status_code == 503
+        assert controller.queue_depth == 0 and controller.rejected_timeout.value == 1
+        controller.release()
+        assert controller.in_flight == 0
+
+    def test_cancelled_waiter_is_removed(self):
+        """Test a client that goes away while queued doesn't keep its place"""
+        controller = saturated(max_queue=1, max_wait_ms=1000)
+
+        async def scenario():
+            waiter = asyncio.ensure_future(controller.acquire())
+            await asyncio.sleep(0)
+            assert controller.queue_depth == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(scenario())
+        assert controller.queue_depth == 0 and controller.in_flight == 1
+
+    def test_disabled(self):
+        """Test a limit of 0 admits everything"""
+        controller = AdmissionController(0)
+
+        async def scenario():
+            for _ in range(100):
+                await controller.acquire()
+
+        asyncio.run(scenario())
+        assert controller.in_flight == 0 and not controller.stats()["enabled"]
+
+
+class TestLoadShedding:
+    """Test overloaded endpoints answer fast with Retry-After"""
+
+    def test_predict_queue_full_429(self):
+        """Test /predict sheds with 429 when the admission queue is full"""
+        with patch("app.main.admission", saturated(max_queue=0, retry_after_seconds=3)):
+            response = client.post("/predict", json=SAMPLE)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+
+    def test_batch_wait_timeout_503(self):
+        """Test /predict/batch gives 503 after waiting max_wait_ms for a slot"""
+        with patch("app.main.admission", saturated(max_queue=1, max_wait_ms=20)):
+            response = client.post("/predict/batch", json={"instances": [SAMPLE]})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    def test_admitted_requests_unaffected(self):
+        """Test requests under the limit are served and release their slot"""
+        controller = AdmissionController(1, max_queue=0)
+        with patch("app.main.admission", controller):
+            assert client.post("/predict", json=SAMPLE).status_code == 200
+            assert client.post("/predict/batch", json={"instances": [SAMPLE]}).status_code == 200
+        assert controller.in_flight == 0 and controller.admitted.value == 2
+
+    def test_queue_wait_metric_exposed(self):
+        """Test queue wait and shed counts are on /metrics for autoscaling"""
+        body = client.get("/metrics").text
+        assert "# TYPE penguin_admission_queue_wait_seconds histogram" in body
+        assert 'penguin_admission_rejected_total{reason="timeout"}' in body
+        assert "penguin_admission_queue_depth" in body
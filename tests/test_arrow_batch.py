@@ -0,0 +1,94 @@
+# tests/test_arrow_batch.py
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.arrow_io import ARROW_STREAM
+from app.main import app, label_classes
+
+pa = pytest.importorskip("pyarrow")
+
+client = TestClient(app)
+
+SAMPLES = [
+    {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+     "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"},
+    {"bill_length_mm": 50.0, "bill_depth_mm": 15.2, "flipper_length_mm": 230,
+     "body_mass_g": 6050, "year": 2008, "sex": "male", "island": "Biscoe"},
+    {"bill_length_mm": 46.5, "bill_depth_mm": 17.9, "flipper_length_mm": 192,
+     "body_mass_g": 3500, "year": 2009, "sex": "female", "island": "Dream"},
+]
+
+
+def to_stream(table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def post_arrow(table, query: str = ""):
+    return client.post(f"/predict/batch{query}", content=to_stream(table), headers={"content-type": ARROW_STREAM})
+
+
+def read_stream(response):
+    return pa.ipc.open_stream(response.content).read_all()
+
+
+class TestArrowBatch:
+    """Test Arrow IPC input and output on /predict/batch"""
+
+    def test_matches_json_batch(self):
+        """Test Arrow in/out gives the JSON endpoint's predictions and probabilities"""
+        response = post_arrow(pa.Table.from_pylist(SAMPLES), "?return_probabilities=true")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == ARROW_STREAM
+        result = read_stream(response)
+
+        expected = client.post("/predict/batch", json={"instances": SAMPLES, "return_probabilities": True}).json()
+        assert result.column("prediction").to_pylist() == expected["predictions"]
+        probabilities = np.column_stack([result.column(f"probability_{label}").to_numpy()
+                                         for label in label_classes])
+        np.testing.assert_allclose(probabilities, expected["probabilities"], rtol=1e-6)
+
+    def test_column_types_are_converted(self):
+        """Test float32, integer and dictionary-encoded columns in several chunks are accepted"""
+        table = pa.Table.from_pylist(SAMPLES)
+        table = table.set_column(0, "bill_length_mm", table.column("bill_length_mm").cast(pa.float32()))
+        table = table.set_column(2, "flipper_length_mm", table.column("flipper_length_mm").cast(pa.int16()))
+        table = table.set_column(6, "island", table.column("island").dictionary_encode())
+        table = pa.concat_tables([table.slice(0, 1), table.slice(1)])
+        result = read_stream(post_arrow(table))
+        assert result.column("prediction").to_pylist() == ["Adelie", "Gentoo", "Chinstrap"]
+
+    def test_top_k(self):
+        """Test top-k comes back as a list of label/probability structs"""
+        result = read_stream(post_arrow(pa.Table.from_pylist(SAMPLES), "?top_k=2"))
+        top = result.column("top_k").to_pylist()
+        assert [len(row) for row in top] == [2, 2, 2]
+        assert [row[0]["label"] for row in top] == result.column("prediction").to_pylist()
+
+    def test_invalid_rows_rejected(self):
+        """Test unknown categories and nulls are reported by row index"""
+        rows = [dict(SAMPLES[0]), dict(SAMPLES[1], island="Atlantis"), dict(SAMPLES[2], body_mass_g=None)]
+        response = post_arrow(pa.Table.from_pylist(rows))
+        assert response.status_code == 422
+        assert response.json()["detail"]["invalid_rows"] == [1, 2]
+
+    def test_missing_column_and_bad_stream(self):
+        """Test a missing feature column or a non-Arrow body gives 422"""
+        table = pa.Table.from_pylist(SAMPLES).drop_columns(["sex"])
+        assert post_arrow(table).status_code == 422
+        response = client.post("/predict/batch", content=b"not arrow", headers={"content-type": ARROW_STREAM})
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("name, column", [
+        ("bill_length_mm", pa.array([[39.1], [50.0], [46.5]], pa.list_(pa.float64()))),
+        ("sex", pa.array([{"value": "male"}, {"value": "male"}, {"value": "female"}])),
+    ])
+    def test_unsupported_column_type_rejected(self, name, column):
+        """Test a feature column of a type that can't be converted gives 422, not 500"""
+        table = pa.Table.from_pylist(SAMPLES)
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+        response = post_arrow(table)
+        assert response.status_code == 422
+        assert "Invalid Arrow input" in response.json()["detail"]
@@ -0,0 +1,104 @@
+# tests/test_artifact_cache.py
+import os
+import pytest
+from unittest.mock import patch
+from app.artifact_cache import ArtifactCache
+from app.main import MODEL_PATH
+from app.model_registry import GCSModelSource
+from test_model_hot_reload import FakeStorageClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(str(tmp_path / "cache"), max_bytes=1024)
+
+
+class TestArtifactCache:
+    """Test the content-addressed artifact cache"""
+
+    def test_round_trip(self, cache):
+        """Test stored bytes come back for the same key"""
+        cache.put("bucket/model.json@1", b"model-bytes")
+        assert cache.get("bucket/model.json@1") == b"model-bytes"
+        assert cache.hits.value == 1
+
+    def test_unknown_key_is_a_miss(self, cache):
+        """Test a key that was never stored returns None"""
+        assert cache.get("bucket/model.json@2") is None
+        assert cache.misses.value == 1
+
+    def test_identical_content_is_stored_once(self, cache):
+        """Test two keys with the same bytes share one object"""
+        cache.put("a@1", b"same")
+        cache.put("b@1", b"same")
+        assert len(os.listdir(cache.objects_dir)) == 1
+
+    def test_corrupted_object_is_discarded(self, cache):
+        """Test bytes that no longer match their hash are never served"""
+        digest = cache.put("bucket/model.json@1", b"model-bytes")
+        with open(os.path.join(cache.objects_dir, digest), "wb") as f:
+            f.write(b"truncated")
+
+        assert cache.get("bucket/model.json@1") is None
+        assert cache.corrupt.value == 1
+        assert not os.path.exists(os.path.join(cache.objects_dir, digest))
+
+    def test_least_recently_used_is_evicted(self, cache):
+        """Test the size cap evicts the artifact used longest ago"""
+        old = cache.put("old@1", b"a" * 400)
+        cache.put("used@1", b"b" * 400)
+        os.utime(os.path.join(cache.objects_dir, old), (0, 0))
+
+        cache.put("new@1", b"c" * 400)
+
+        assert cache.get("old@1") is None
+        assert cache.get("used@1") == b"b" * 400
+        assert cache.get("new@1") == b"c" * 400
+        assert cache.evictions.value == 1
+
+    def test_oversized_artifact_is_kept(self, cache):
+        """Test an artifact larger than the cap still survives its own put"""
+        cache.put("big@1", b"x" * 2048)
+        assert cache.get("big@1") == b"x" * 2048
+
+    def test_survives_a_new_instance(self, cache):
+        """Test a fresh cache over the same directory sees earlier artifacts"""
+        cache.put("bucket/model.json@1", b"model-bytes")
+        reopened = ArtifactCache(cache.directory, cache.max_bytes)
+        assert reopened.get("bucket/model.json@1") == b"model-bytes"
+
+
+class TestGCSSourceWithCache:
+    """Test GCS loads go through the artifact cache"""
+
+    @pytest.fixture
+    def fake_gcs(self):
+        with open(MODEL_PATH, "rb") as f:
+            content = f.read()
+        fake = FakeStorageClient()
+        fake.upload("model.json", content)
+        with patch('app.gcs_client.storage.Client', fake):
+            yield fake
+
+    def test_restart_with_cached_generation_skips_download(self, fake_gcs, tmp_path):
+        """Test a cold start only needs a metadata call when the artifact is cached"""
+        directory = str(tmp_path / "cache")
+        first = GCSModelSource("bucket", "model.json", artifact_cache=ArtifactCache(directory, 10**8)).load()
+        assert fake_gcs.downloads == 1
+
+        second = GCSModelSource("bucket", "model.json", artifact_cache=ArtifactCache(directory, 10**8)).load()
+
+        assert fake_gcs.downloads == 1
+        assert fake_gcs.metadata_calls == 2
+        assert second.version == first.version
+
+    def test_new_generation_is_downloaded(self, fake_gcs, tmp_path):
+        """Test an upload after caching is fetched rather than served stale"""
+        source = GCSModelSource("bucket", "model.json", artifact_cache=ArtifactCache(str(tmp_path), 10**8))
+        source.load()
+        fake_gcs.upload("model.json", fake_gcs.objects["model.json"][0])
+
+        loaded = source.load()
+
+        assert fake_gcs.downloads == 2
+        assert loaded.version == "model.json@2"
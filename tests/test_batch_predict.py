@@ -0,0 +1,73 @@
+# tests/test_batch_predict.py
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, expected_columns, preprocess_batch, preprocess_features
+from app.main import PenguinFeatures
+
+client = TestClient(app)
+
+SAMPLES = [
+    {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+     "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"},
+    {"bill_length_mm": 46.5, "bill_depth_mm": 17.9, "flipper_length_mm": 192,
+     "body_mass_g": 3500, "year": 2009, "sex": "female", "island": "Dream"},
+    {"bill_length_mm": 50.0, "bill_depth_mm": 15.2, "flipper_length_mm": 230,
+     "body_mass_g": 6050, "year": 2008, "sex": "male", "island": "Biscoe"},
+]
+
+
+class TestBatchPreprocessing:
+    """Test the vectorized batch preprocessing"""
+
+    def test_matches_single_row_preprocessing(self):
+        """Test each matrix row equals the single-row preprocessing"""
+        instances = [PenguinFeatures(**sample) for sample in SAMPLES]
+        X = preprocess_batch(instances, expected_columns)
+        assert X.dtype == np.float32
+        assert X.shape == (len(SAMPLES), len(expected_columns))
+        for row, features in enumerate(instances):
+            expected = preprocess_features(features, expected_columns).values[0]
+            np.testing.assert_array_equal(X[row], expected.astype(np.float32))
+
+
+class TestBatchEndpoint:
+    """Test the /predict/batch endpoint"""
+
+    def test_batch_matches_single_endpoint(self):
+        """Test batch labels equal the single endpoint's, in input order"""
+        response = client.post("/predict/batch", json={"instances": SAMPLES})
+        assert response.status_code == 200
+        singles = [client.post("/predict", json=s).json()["prediction"] for s in SAMPLES]
+        assert response.json()["predictions"] == singles
+        assert "probabilities" not in response.json()
+
+    def test_batch_probabilities(self):
+        """Test probabilities are returned on request, one row per instance"""
+        response = client.post("/predict/batch",
+                               json={"instances": SAMPLES, "return_probabilities": True})
+        assert response.status_code == 200
+        probabilities = response.json()["probabilities"]
+        assert len(probabilities) == len(SAMPLES)
+        for row in probabilities:
+            assert len(row) == 3
+            assert sum(row) == pytest.approx(1.0, abs=1e-5)
+
+    def test_large_batch(self):
+        """Test thousands of rows are scored in one request"""
+        instances = SAMPLES * 1000
+        response = client.post("/predict/batch", json={"instances": instances})
+        assert response.status_code == 200
+        assert len(response.json()["predictions"]) == len(instances)
+
+    def test_empty_batch(self):
+        """Test an empty batch is rejected"""
+        response = client.post("/predict/batch", json={"instances": []})
+        assert response.status_code == 422
+
+    def test_invalid_row_reports_position(self):
+        """Test a bad row is reported with its index"""
+        bad = dict(SAMPLES[0], island="invalid_island")
+        response = client.post("/predict/batch", json={"instances": [SAMPLES[0], bad]})
+        assert response.status_code == 422
+        assert any(error["loc"][:3] == ["body", "instances", 1] for error in response.json()["detail"])
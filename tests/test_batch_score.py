@@ -0,0 +1,122 @@
+# tests/test_batch_score.py
+import os
+import random
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.batch_score import main, score_file
+from app.main import app, label_classes
+from benchmarks.payloads import species_payload
+
+client = TestClient(app)
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+@pytest.fixture
+def survey(tmp_path):
+    rng = random.Random(0)
+    frame = pd.DataFrame([species_payload(rng) for _ in range(250)])
+    frame.loc[3, "sex"] = "unknown"
+    frame.loc[7, "bill_length_mm"] = None
+    path = tmp_path / "survey.csv"
+    frame.to_csv(path, index=False)
+    return frame, path
+
+
+def expected_predictions(frame):
+    valid = frame.drop(index=[3, 7])
+    predictions = client.post("/predict/batch", json={"instances": valid.to_dict("records")}).json()["predictions"]
+    return dict(zip(valid.index, predictions))
+
+
+class TestBatchScore:
+    """Test offline batch scoring of CSV/Parquet files"""
+
+    def test_csv_in_process(self, survey, tmp_path):
+        """Test in-process scoring in small chunks matches /predict/batch"""
+        frame, path = survey
+        result = score_file(str(path), str(tmp_path / "scored.csv"), workers=0, chunk_rows=64,
+                            return_probabilities=True)
+        assert result["rows"] == 250 and result["invalid_rows"] == 2
+        assert result["rows_per_second"] > 0
+
+        scored = pd.read_csv(tmp_path / "scored.csv")
+        assert list(scored.columns[:len(frame.columns)]) == list(frame.columns)
+        assert [f"probability_{label}" for label in label_classes] == list(scored.columns[-3:])
+        assert scored["prediction"].isna().tolist() == [i in (3, 7) for i in range(250)]
+        assert scored["prediction"].dropna().to_dict() == expected_predictions(frame)
+
+    def test_process_pool_matches_in_process(self, survey, tmp_path):
+        """Test worker processes produce the same file, in input order"""
+        _, path = survey
+        score_file(str(path), str(tmp_path / "inline.csv"), workers=0, chunk_rows=100)
+        result = score_file(str(path), str(tmp_path / "pool.csv"), workers=2, chunk_rows=100)
+        assert result["workers"] == 2
+        assert (tmp_path / "inline.csv").read_bytes() == (tmp_path / "pool.csv").read_bytes()
+
+    def test_parquet_round_trip(self, survey, tmp_path):
+        """Test Parquet input and output"""
+        pytest.importorskip("pyarrow")
+        frame, _ = survey
+        source = tmp_path / "survey.parquet"
+        frame.to_parquet(source, index=False)
+        score_file(str(source), str(tmp_path / "scored.parquet"), workers=0, chunk_rows=64)
+        scored = pd.read_parquet(tmp_path / "scored.parquet")
+        assert scored["prediction"].dropna().to_dict() == expected_predictions(frame)
+
+    def test_parquet_schema_fixed_across_chunks(self, survey, tmp_path):
+        """Test an all-invalid chunk and drifting pandas dtypes still write one Parquet schema"""
+        pytest.importorskip("pyarrow")
+        frame, _ = survey
+        frame = frame.assign(note="checked")
+        frame.loc[64:127, "sex"] = "unknown"
+        frame.loc[64:127, "note"] = None
+        path = tmp_path / "drift.csv"
+        frame.to_csv(path, index=False)
+        result = score_file(str(path), str(tmp_path / "scored.parquet"), workers=0, chunk_rows=64,
+                            return_probabilities=True)
+        assert result["invalid_rows"] == 66
+        scored = pd.read_parquet(tmp_path / "scored.parquet")
+        assert len(scored) == 250
+        assert scored["prediction"].iloc[64:128].isna().all()
+        assert scored["note"].iloc[:64].eq("checked").all() and scored["note"].iloc[64:128].isna().all()
+
+    def test_parquet_output_nulls_non_numeric_features(self, survey, tmp_path):
+        """Test a CSV feature value that isn't a number gives a null prediction, not a failed run"""
+        pytest.importorskip("pyarrow")
+        frame, _ = survey
+        frame = frame.astype({"bill_length_mm": object})
+        frame.loc[10, "bill_length_mm"] = "abc"
+        path = tmp_path / "typo.csv"
+        frame.to_csv(path, index=False)
+        result = score_file(str(path), str(tmp_path / "scored.parquet"), workers=0, chunk_rows=64)
+        assert result["rows"] == 250 and result["invalid_rows"] == 3
+        scored = pd.read_parquet(tmp_path / "scored.parquet")
+        assert scored["prediction"].isna().tolist() == [i in (3, 7, 10) for i in range(250)]
+        assert pd.isna(scored.loc[10, "bill_length_mm"]) and scored["bill_length_mm"].dtype == "float64"
+
+    def test_missing_columns(self, tmp_path):
+        """Test an input without the model's columns is refused"""
+        path = tmp_path / "bad.csv"
+        pd.DataFrame({"island": ["Dream"]}).to_csv(path, index=False)
+        with pytest.raises(ValueError, match="bill_length_mm"):
+            score_file(str(path), str(tmp_path / "out.csv"), workers=0)
+
+    def test_cli_reports_throughput(self, survey, tmp_path, capsys):
+        """Test the command line entry point prints rows/s"""
+        _, path = survey
+        main([str(path), str(tmp_path / "scored.csv"), "--workers", "0"])
+        assert "Scored 250 rows (2 invalid)" in capsys.readouterr().out
+
+    def test_does_not_import_the_api(self, survey, tmp_path):
+        """Test scoring a file never builds the FastAPI app"""
+        _, path = survey
+        script = (f"import sys\nfrom app.batch_score import score_file\n"
+                  f"score_file({str(path)!r}, {str(tmp_path / 'scored.csv')!r}, workers=0)\n"
+                  "print(sorted({'app.main', 'fastapi'} & set(sys.modules)))")
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        assert output.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,139 @@
+# tests/test_batching.py
+import asyncio
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.batching import MicroBatcher, QueueFullError
+from app.main import app, batcher, feature_encoder, predict_proba, PenguinFeatures
+
+
+class RecordingModel:
+    """predict_fn that records the batch sizes it was called with"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, X):
+        self.calls.append(len(X))
+        return X * 2
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestMicroBatcher:
+    """Test coalescing single rows into batched model calls"""
+
+    def test_concurrent_rows_share_one_call(self):
+        """Test rows submitted together are predicted in one call"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=8, max_wait_ms=50)
+
+        async def scenario():
+            rows = [np.full(3, i, dtype=np.float32) for i in range(8)]
+            return await asyncio.gather(*(batcher.submit(r) for r in rows))
+
+        results = run(scenario())
+        assert model.calls == [8]
+        # every caller gets its own row back, in order
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result, np.full(3, 2 * i))
+
+    def test_batches_capped_at_max_size(self):
+        """Test a burst larger than max_batch_size is split"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=50)
+
+        async def scenario():
+            await asyncio.gather(*(batcher.submit(np.zeros(2)) for _ in range(10)))
+
+        run(scenario())
+        assert model.calls == [4, 4, 2]
+
+    def test_partial_batch_flushed_after_max_wait(self):
+        """Test a lone row is not held longer than max_wait_ms"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, max_batch_size=64, max_wait_ms=5)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await batcher.submit(np.zeros(2))
+            return loop.time() - started
+
+        assert run(scenario()) < 1.0
+        assert model.calls == [1]
+
+    def test_queue_depth_limit(self):
+        """Test submits beyond max_queue_depth are rejected"""
+        batcher = MicroBatcher(RecordingModel(), max_batch_size=64, max_wait_ms=50, max_queue_depth=3)
+
+        async def scenario():
+            return await asyncio.gather(*(batcher.submit(np.zeros(2)) for _ in range(5)),
+                                        return_exceptions=True)
+
+        results = run(scenario())
+        assert sum(isinstance(r, QueueFullError) for r in results) == 2
+        assert batcher.stats()["rejected"] == 2
+
+    def test_model_error_propagates_to_callers(self):
+        """Test a failing model call fails every caller in the batch"""
+        def broken(X):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(broken, max_batch_size=2, max_wait_ms=50)
+
+        async def scenario():
+            return await asyncio.gather(batcher.submit(np.zeros(2)), batcher.submit(np.zeros(2)),
+                                        return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in run(scenario()))
+
+    def test_batch_size_histogram(self):
+        """Test batch sizes are recorded in the histogram"""
+        batcher = MicroBatcher(RecordingModel(), max_batch_size=4, max_wait_ms=50)
+
+        async def scenario():
+            await asyncio.gather(*(batcher.submit(np.zeros(2)) for _ in range(6)))
+
+        run(scenario())
+        stats = batcher.stats()
+        assert stats["rows"] == 6
+        assert stats["batch_size"]["count"] == 2
+        assert stats["batch_size"]["buckets"]["2"] == 1
+        assert stats["batch_size"]["buckets"]["4"] == 2
+
+    def test_matches_unbatched_prediction(self):
+        """Test batched probabilities equal a direct model call"""
+        features = PenguinFeatures(bill_length_mm=46.5, bill_depth_mm=17.9, flipper_length_mm=192,
+                                   body_mass_g=3500, year=2007, sex="female", island="Dream")
+        X = feature_encoder.encode(features)
+        direct = predict_proba(X)[0]
+        batched = run(MicroBatcher(predict_proba).submit(X[0]))
+        np.testing.assert_allclose(batched, direct)
+
+
+class TestBatchingEndpoints:
+    """Test /predict through the batcher and the stats endpoint"""
+
+    def test_stats_endpoint(self):
+        """Test batching stats are exposed for tuning"""
+        client = TestClient(app)
+        client.post("/predict", json={"bill_length_mm": 39.1, "bill_depth_mm": 18.7,
+                                      "flipper_length_mm": 181, "body_mass_g": 3750,
+                                      "year": 2007, "sex": "male", "island": "Torgersen"})
+        response = client.get("/stats")
+        assert response.status_code == 200
+        batching = response.json()["batching"]
+        assert batching["rows"] >= 1
+        assert batching["batch_size"]["count"] >= 1
+
+    def test_predict_queue_full_returns_503(self, monkeypatch):
+        """Test a saturated queue sheds load with 503"""
+        monkeypatch.setattr(batcher, "max_queue_depth", 0)
+        client = TestClient(app)
+        response = client.post("/predict", json={"bill_length_mm": 39.1, "bill_depth_mm": 18.7,
+                                                 "flipper_length_mm": 181, "body_mass_g": 3750,
+                                                 "year": 2007, "sex": "male", "island": "Torgersen"})
+        assert response.status_code == 503
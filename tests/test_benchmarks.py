@@ -0,0 +1,82 @@
+# tests/test_benchmarks.py
+import asyncio
+import random
+import httpx
+from app.main import app, PenguinFeatures
+from benchmarks.payloads import (
+    batch_payload, chinstrap_payload, gentoo_payload, invalid_payload, species_payload
+)
+from benchmarks.suite import compare, drive
+
+
+class TestPayloads:
+    """Test the shared load-test payload generators"""
+
+    def test_species_payloads_are_valid(self):
+        """Test every generated payload passes request validation"""
+        rng = random.Random(0)
+        for _ in range(50):
+            PenguinFeatures(**species_payload(rng))
+
+    def test_species_specific_islands(self):
+        """Test species generators keep their island"""
+        assert gentoo_payload()["island"] == "Biscoe"
+        assert chinstrap_payload()["island"] == "Dream"
+
+    def test_seeded_payloads_repeat(self):
+        """Test the same seed gives the same requests"""
+        assert batch_payload(5, random.Random(1)) == batch_payload(5, random.Random(1))
+
+    def test_invalid_payload(self):
+        """Test the invalid payload carries a non-numeric measurement"""
+        assert invalid_payload()["bill_length_mm"] == "invalid"
+
+
+class TestRegressionCheck:
+    """Test comparing results against a baseline"""
+
+    BASELINE = {
+        "micro": {"preprocess_one": {"median_s": 1.0}},
+        "load": {"predict": {"p95_ms": 10.0, "rps": 1000.0}},
+    }
+
+    def test_within_tolerance(self):
+        """Test small slowdowns are not flagged"""
+        current = {
+            "micro": {"preprocess_one": {"median_s": 1.1}},
+            "load": {"predict": {"p95_ms": 11.0, "rps": 900.0}},
+        }
+        assert compare(current, self.BASELINE, tolerance=0.25) == []
+
+    def test_slower_and_lower_throughput_flagged(self):
+        """Test latency increases and throughput drops are both regressions"""
+        current = {
+            "micro": {"preprocess_one": {"median_s": 2.0}},
+            "load": {"predict": {"p95_ms": 10.0, "rps": 500.0}},
+        }
+        flagged = {r["metric"] for r in compare(current, self.BASELINE, tolerance=0.25)}
+        assert flagged == {"micro/preprocess_one/median_s", "load/predict/rps"}
+
+    def test_new_metrics_are_ignored(self):
+        """Test metrics missing from the baseline cannot regress"""
+        current = {"micro": {"new_case": {"median_s": 5.0}}}
+        assert compare(current, self.BASELINE, tolerance=0.25) == []
+
+
+class TestLoadGenerator:
+    """Test the in-process ASGI load generator"""
+
+    def test_drive_reports_latency_and_throughput(self):
+        """Test concurrent requests against the app are all counted"""
+        rng = random.Random(0)
+        requests = [("/predict", species_payload(rng)) for _ in range(20)]
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                return await drive(client, requests, concurrency=4)
+
+        result = asyncio.run(run())
+        assert result["requests"] == 20
+        assert result["errors"] == 0
+        assert result["rps"] > 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
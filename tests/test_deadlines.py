@@ -0,0 +1,126 @@
+# tests/test_deadlines.py
+import asyncio
+import time
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.admission import AdmissionController
+from app.batching import MicroBatcher
+from app.deadlines import DeadlineExceeded
+from app.executor import InferenceExecutor
+from app.main import app, deadline_dropped, request_deadline, score_batch, PenguinFeatures
+
+client = TestClient(app)
+
+SAMPLE = {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+          "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"}
+
+
+def past() -> float:
+    return time.perf_counter() - 1
+
+
+def request_with(headers: dict) -> Request:
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+
+class TestRequestDeadline:
+    """Test where a request's deadline comes from"""
+
+    def test_header_sooner_than_default_wins(self):
+        """Test the client timeout applies when shorter than the server default"""
+        with patch("app.main.REQUEST_TIMEOUT_MS", 30000):
+            started = time.perf_counter()
+            deadline = request_deadline(request_with({"X-Request-Timeout-Ms": "250"}))
+            assert 0.2 < deadline - started < 0.3
+            deadline = request_deadline(request_with({"X-Request-Timeout-Ms": "60000"}))
+            assert 29.9 < deadline - started < 30.1
+
+    def test_no_deadline_without_default_or_header(self):
+        """Test a server default of 0 and no header means no deadline"""
+        with patch("app.main.REQUEST_TIMEOUT_MS", 0):
+            assert request_deadline(request_with({})) is None
+
+    @pytest.mark.parametrize("value", ["soon", "0", "-5", "nan"])
+    def test_bad_header_is_400(self, value):
+        """Test a malformed timeout header is rejected"""
+        response = client.post("/predict", json=SAMPLE, headers={"X-Request-Timeout-Ms": value})
+        assert response.status_code == 400
+
+
+class TestDeadlineEnforcement:
+    """Test expired work is dropped before the expensive stages"""
+
+    def test_expired_predict_is_504_and_counted(self):
+        """Test a request whose deadline passes during parsing never reaches the model"""
+        dropped_before = deadline_dropped["parse"].value
+        with patch("app.main.batcher.submit") as submit:
+            response = client.post("/predict", json=SAMPLE, headers={"X-Request-Timeout-Ms": "0.001"})
+        assert response.status_code == 504
+        submit.assert_not_called()
+        assert deadline_dropped["parse"].value == dropped_before + 1
+        assert 'penguin_deadline_dropped_total{stage="parse"}' in client.get("/metrics").text
+
+    def test_server_default_applies_to_batch(self):
+        """Test REQUEST_TIMEOUT_MS bounds requests that send no header"""
+        with patch("app.main.REQUEST_TIMEOUT_MS", 0.001):
+            response = client.post("/predict/batch", json={"instances": [SAMPLE]})
+        assert response.status_code == 504
+
+    def test_generous_deadline_is_served(self):
+        """Test requests within their deadline are unaffected"""
+        response = client.post("/predict", json=SAMPLE, headers={"X-Request-Timeout-Ms": "10000"})
+        assert response.status_code == 200
+
+    def test_batch_checked_before_inference(self):
+        """Test a batch that expires while encoding skips the model call"""
+        with patch("app.main.predict_proba") as predict:
+            with pytest.raises(DeadlineExceeded) as dropped:
+                score_batch([PenguinFeatures(**SAMPLE)], deadline=past())
+        assert dropped.value.stage == "inference"
+        predict.assert_not_called()
+
+    def test_micro_batch_skips_expired_rows(self):
+        """Test rows whose deadline passed in the queue are left out of the batch"""
+        calls = []
+        batcher = MicroBatcher(lambda X: calls.append(len(X)) or X, max_batch_size=8, max_wait_ms=20)
+
+        async def scenario():
+            return await asyncio.gather(batcher.submit(np.zeros(2), deadline=past()),
+                                        batcher.submit(np.ones(2), deadline=time.perf_counter() + 10),
+                                        return_exceptions=True)
+
+        expired, live = asyncio.run(scenario())
+        assert isinstance(expired, DeadlineExceeded) and expired.stage == "batch_queue"
+        np.testing.assert_array_equal(live, np.ones(2))
+        assert calls == [1] and batcher.expired.value == 1
+
+    def test_executor_skips_expired_calls(self):
+        """Test a call still waiting for a pool thread after its deadline is never run"""
+        executor = InferenceExecutor(1)
+        calls = []
+
+        async def scenario():
+            with pytest.raises(DeadlineExceeded, match="executor_queue"):
+                await executor.run_before(past(), calls.append, 1)
+            return await executor.run_before(None, lambda: "ran")
+
+        assert asyncio.run(scenario()) == "ran"
+        assert calls == []
+        executor.shutdown()
+
+    def test_admission_wait_bounded_by_deadline(self):
+        """Test a queued request gives up at its deadline, not max_wait_ms, and isn't counted as shed"""
+        controller = AdmissionController(1, max_queue=1, max_wait_ms=5000)
+        controller.in_flight = 1
+
+        async def scenario():
+            started = time.perf_counter()
+            with pytest.raises(DeadlineExceeded, match="admission"):
+                await controller.acquire(deadline=started + 0.02)
+            return time.perf_counter() - started
+
+        assert asyncio.run(scenario()) < 1
+        assert controller.rejected_timeout.value == 0 and controller.queue_depth == 0
@@ -0,0 +1,79 @@
+# tests/test_executor.py
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.executor import InferenceExecutor, xgboost_threads
+from app.main import app, batcher, model_registry, XGBOOST_NTHREAD
+
+SAMPLE = {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+          "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"}
+
+
+class TestInferenceExecutor:
+    """Test the dedicated inference thread pool"""
+
+    @pytest.mark.parametrize("pool_size, cpus, expected", [
+        (1, 8, 8), (4, 8, 2), (3, 8, 2), (8, 8, 1), (16, 8, 1), (4, 1, 1),
+    ])
+    def test_xgboost_threads_split_cores(self, pool_size, cpus, expected):
+        """Test XGBoost threads times pool size never exceeds the cores"""
+        assert xgboost_threads(pool_size, cpus) == expected
+
+    def test_run_uses_pool_thread(self):
+        """Test work is executed off the event loop thread"""
+        executor = InferenceExecutor(2)
+
+        async def scenario():
+            return await executor.run(lambda: threading.current_thread().name)
+
+        try:
+            assert asyncio.run(scenario()).startswith("inference")
+        finally:
+            executor.shutdown()
+
+    def test_pool_created_lazily(self):
+        """Test no threads exist until the first submission"""
+        executor = InferenceExecutor(2)
+        assert executor._pool is None
+        assert executor.submit(lambda: 1).result() == 1
+        executor.shutdown()
+        assert executor._pool is None
+
+    def test_model_uses_coordinated_threads(self):
+        """Test the served model is configured with the coordinated nthread"""
+        assert model_registry.get_model().get_params()["n_jobs"] == XGBOOST_NTHREAD
+
+
+class TestEventLoopNotBlocked:
+    """Test slow inference does not stall other endpoints"""
+
+    def test_health_responds_during_slow_inference(self, monkeypatch):
+        """Test /health answers while a prediction is stuck in the model"""
+        release = threading.Event()
+        entered = threading.Event()
+        real_predict = batcher.predict_fn
+
+        def slow_predict(X):
+            entered.set()
+            release.wait(5)
+            return real_predict(X)
+
+        monkeypatch.setattr(batcher, "predict_fn", slow_predict)
+        with TestClient(app) as client:
+            responses = []
+            worker = threading.Thread(target=lambda: responses.append(client.post("/predict", json=SAMPLE)))
+            worker.start()
+            try:
+                assert entered.wait(5)
+                started = time.perf_counter()
+                health = client.get("/health")
+                elapsed = time.perf_counter() - started
+            finally:
+                release.set()
+                worker.join(5)
+
+        assert health.status_code == 200
+        assert elapsed < 1.0
+        assert responses[0].status_code == 200
@@ -0,0 +1,70 @@
+# tests/test_fast_json.py
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+from app.fast_json import FastJSONResponse, parse_body
+from app.main import app, PenguinFeatures
+
+client = TestClient(app)
+
+PENGUIN = {
+    "bill_length_mm": 39.1,
+    "bill_depth_mm": 18.7,
+    "flipper_length_mm": 181,
+    "body_mass_g": 3750,
+    "year": 2007,
+    "sex": "male",
+    "island": "Torgersen",
+}
+
+
+class TestFastJSONResponse:
+    """Test the orjson-backed response class"""
+
+    def test_renders_numpy_arrays(self):
+        """Test NumPy arrays are written without tolist()"""
+        response = FastJSONResponse({"probabilities": np.array([[0.25, 0.75]], dtype=np.float32)})
+        assert json.loads(response.body) == {"probabilities": [[0.25, 0.75]]}
+
+    def test_stdlib_fallback(self):
+        """Test the same output is produced when orjson is not installed"""
+        with patch("app.fast_json.orjson", None):
+            response = FastJSONResponse({"labels": ["Adelie"], "probabilities": np.array([0.5, 0.5])})
+        assert json.loads(response.body) == {"labels": ["Adelie"], "probabilities": [0.5, 0.5]}
+
+
+class TestParseBody:
+    """Test validating request bytes directly"""
+
+    def test_valid_body(self):
+        """Test bytes are validated straight into the model"""
+        features = parse_body(PenguinFeatures, json.dumps(PENGUIN).encode())
+        assert features.island.value == "Torgersen"
+
+    def test_errors_point_into_the_body(self):
+        """Test validation errors keep FastAPI's body-prefixed locations"""
+        with pytest.raises(RequestValidationError) as error:
+            parse_body(PenguinFeatures, json.dumps({**PENGUIN, "sex": "unknown"}).encode())
+        assert error.value.errors()[0]["loc"] == ("body", "sex")
+
+    def test_invalid_field_reported_by_api(self):
+        """Test the 422 response names the offending field"""
+        response = client.post("/predict", json={**PENGUIN, "bill_length_mm": "invalid"})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "bill_length_mm"]
+
+
+class TestDocumentedSchemas:
+    """Test the OpenAPI document still describes request and response bodies"""
+
+    def test_predict_schemas(self):
+        """Test /predict documents its input fields and response model"""
+        operation = client.get("/openapi.json").json()["paths"]["/predict"]["post"]
+        body_schema = operation["requestBody"]["content"]["application/json"]["schema"]
+        assert set(body_schema["required"]) == set(PENGUIN)
+        assert body_schema["properties"]["island"]["enum"] == ["Torgersen", "Biscoe", "Dream"]
+        response_schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+        assert response_schema == {"$ref": "#/components/schemas/PredictionResponse"}
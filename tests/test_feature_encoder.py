@@ -0,0 +1,98 @@
+# tests/test_feature_encoder.py
+import numpy as np
+import pytest
+from enum import Enum
+from pydantic import BaseModel
+from app.feature_encoder import FeatureEncoder
+from app.main import PenguinFeatures, Island, Sex, expected_columns, feature_encoder
+
+
+def make_features(**overrides):
+    values = dict(bill_length_mm=39.1, bill_depth_mm=18.7, flipper_length_mm=181,
+                  body_mass_g=3750, year=2007, sex=Sex.Male, island=Island.Torgersen)
+    values.update(overrides)
+    return PenguinFeatures(**values)
+
+
+class TestFeatureEncoderCompile:
+    """Test compiling the encoder from columns.json"""
+
+    def test_numeric_fields_mapped(self):
+        """Test numeric inputs map to their columns and unused inputs are skipped"""
+        numeric = dict(feature_encoder.numeric)
+        assert numeric["bill_length_mm"] == expected_columns.index("bill_length_mm")
+        assert "year" not in numeric  # the model was not trained on year
+
+    def test_enum_members_map_to_existing_columns(self):
+        """Test every sex/island value resolves to a real one-hot column"""
+        lookups = dict(feature_encoder.categorical)
+        assert lookups["sex"] == {"male": expected_columns.index("sex_Male"),
+                                  "female": expected_columns.index("sex_Female")}
+        assert set(lookups["island"]) == {island.value for island in Island}
+
+    def test_missing_one_hot_column_raises(self):
+        """Test an enum value with no matching column fails at compile time"""
+        columns = [c for c in expected_columns if c != "island_Dream"]
+        with pytest.raises(ValueError, match="island_Dream"):
+            FeatureEncoder.compile(PenguinFeatures, columns)
+
+    def test_exact_match_preferred_over_case_insensitive(self):
+        """Test an exact column name wins over a case-folded one"""
+        class Color(str, Enum):
+            Red = "red"
+
+        class Row(BaseModel):
+            color: Color
+
+        encoder = FeatureEncoder.compile(Row, ["color_Red", "color_red"])
+        assert dict(encoder.categorical)["color"] == {"red": 1}
+
+
+class TestFeatureEncoding:
+    """Test encoding rows into the feature matrix"""
+
+    def test_encode_single_row(self):
+        """Test a single row is encoded with the right one-hot columns set"""
+        X = feature_encoder.encode(make_features(sex=Sex.Female, island=Island.Biscoe))
+        assert X.shape == (1, len(expected_columns))
+        assert X.dtype == np.float32
+        row = dict(zip(expected_columns, X[0]))
+        assert row["sex_Female"] == 1.0 and row["sex_Male"] == 0.0
+        assert row["island_Biscoe"] == 1.0
+        assert row["island_Dream"] == 0.0 and row["island_Torgersen"] == 0.0
+        assert row["bill_length_mm"] == pytest.approx(39.1)
+
+    def test_encode_into_reuses_buffer(self):
+        """Test encoding into a preallocated row clears stale values"""
+        out = np.full(len(expected_columns), 7.0, dtype=np.float32)
+        feature_encoder.encode_into(make_features(), out)
+        assert out.sum() == pytest.approx(39.1 + 18.7 + 181 + 3750 + 2, rel=1e-6)
+
+    def test_encode_batch_matches_single_rows(self):
+        """Test batch encoding equals stacking single-row encodings"""
+        rows = [make_features(sex=sex, island=island) for sex in Sex for island in Island]
+        X = feature_encoder.encode_batch(rows)
+        expected = np.vstack([feature_encoder.encode(r) for r in rows])
+        np.testing.assert_array_equal(X, expected)
+        # exactly one sex and one island column per row
+        assert (X[:, 4:].sum(axis=1) == 2).all()
+
+    def test_encode_columns_matches_encode_batch(self):
+        """Test column-oriented encoding equals row encoding and flags invalid rows"""
+        rows = [make_features(sex=sex, island=island) for sex in Sex for island in Island]
+        columns = {name: np.array([getattr(r, name) for r in rows], dtype=np.float32)
+                   for name, _ in feature_encoder.numeric}
+        for name, _ in feature_encoder.categorical:
+            categories = sorted({getattr(r, name).value for r in rows})
+            columns[name] = (np.array([categories.index(getattr(r, name).value) for r in rows]), categories)
+        X, valid = feature_encoder.encode_columns(columns)
+        np.testing.assert_array_equal(X, feature_encoder.encode_batch(rows))
+        assert valid.all()
+
+        columns["bill_length_mm"][0] = np.nan
+        codes, categories = columns["island"]
+        codes[1] = len(categories)
+        columns["island"] = (codes, categories + ["Atlantis"])
+        columns["sex"][0][2] = -1  # missing
+        _, valid = feature_encoder.encode_columns(columns)
+        assert valid.tolist() == [False, False, False] + [True] * (len(rows) - 3)
@@ -0,0 +1,213 @@
+# tests/test_gcs_client.py
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse, parse_qs
+import pytest
+from app.gcs_client import CircuitBreaker, CircuitOpenError, SharedStorageClient
+from app.main import MODEL_PATH
+from app.model_registry import GCSModelSource, LocalFileModelSource, ModelRegistry
+
+
+class FakeGCSServer(ThreadingHTTPServer):
+    """Minimal local stand-in for the GCS JSON API (metadata + media download)"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeGCSHandler)
+        self.objects = {}  # (bucket, name) -> (content, generation)
+        self.fail_next = 0  # answer this many requests with 503
+        self.requests = []
+        self.connections = set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def upload(self, bucket, name, content):
+        generation = self.objects.get((bucket, name), (None, 0))[1] + 1
+        self.objects[(bucket, name)] = (content, generation)
+
+
+class FakeGCSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        parsed = urlparse(self.path)
+        server.requests.append(parsed.path)
+        if server.fail_next > 0:
+            server.fail_next -= 1
+            return self._send(503, b'{"error": {"code": 503, "message": "unavailable"}}')
+
+        # /storage/v1/b/<bucket>/o/<object> or /download/storage/v1/b/<bucket>/o/<object>
+        parts = parsed.path.split("/")
+        bucket, name = parts[parts.index("b") + 1], unquote(parts[parts.index("o") + 1])
+        if (bucket, name) not in server.objects:
+            return self._send(404, b'{"error": {"code": 404, "message": "Not Found"}}')
+
+        content, generation = server.objects[(bucket, name)]
+        if parse_qs(parsed.query).get("alt") == ["media"]:
+            return self._send(200, content, "application/octet-stream",
+                              {"x-goog-generation": str(generation)})
+        metadata = {"bucket": bucket, "name": name, "generation": str(generation),
+                    "etag": f"etag-{generation}", "size": str(len(content))}
+        self._send(200, json.dumps(metadata).encode())
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def fake_gcs(monkeypatch):
+    server = FakeGCSServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", server.url)
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "test-project")
+    with open(MODEL_PATH, "rb") as f:
+        server.upload("penguins", "model.json", f.read())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fast_client(**kwargs):
+    kwargs.setdefault("retry_initial", 0.01)
+    kwargs.setdefault("retry_maximum", 0.02)
+    kwargs.setdefault("retry_budget", 2)
+    kwargs.setdefault("request_timeout", 2)
+    return SharedStorageClient(**kwargs)
+
+
+class TestCircuitBreaker:
+    """Test the circuit breaker state machine"""
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: 0.0)
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                breaker.call(lambda: (_ for _ in ()).throw(RuntimeError("down")))
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "never called")
+
+    def test_half_open_trial_closes_on_success(self):
+        """Test one trial call after the reset timeout closes the circuit"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.state == "open"
+        now[0] = 31.0
+        assert breaker.state == "half-open"
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_half_open_trial_failure_reopens(self):
+        """Test a failed trial call reopens the circuit for another timeout"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 31.0
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+    def test_success_resets_failure_count(self):
+        """Test failures must be consecutive to open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+
+class TestSharedStorageClient:
+    """Test the pooled client against a local fake GCS server"""
+
+    def test_client_created_once(self, fake_gcs):
+        """Test every call reuses a single client"""
+        client = fast_client()
+        first = client.client
+        client.blob_generation("penguins", "model.json")
+        client.download("penguins", "model.json")
+        assert client.client is first
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_forked_child_creates_its_own_client(self, fake_gcs):
+        """Test a forked worker drops the parent's pooled client and makes a new one"""
+        client = fast_client()
+        parent = client.client
+        pid = os.fork()
+        if pid == 0:
+            fresh = client._client is None and client.blob_generation("penguins", "model.json") == 1
+            os._exit(0 if fresh and client.client is not parent else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert client.client is parent
+
+    def test_metadata_and_download(self, fake_gcs):
+        """Test generation lookups and downloads hit the fake server"""
+        client = fast_client()
+        assert client.blob_generation("penguins", "model.json") == 1
+        content, generation = client.download("penguins", "model.json")
+        assert content == fake_gcs.objects[("penguins", "model.json")][0]
+        assert generation == 1
+
+    def test_transient_errors_retried(self, fake_gcs):
+        """Test 503s are retried within the budget"""
+        fake_gcs.fail_next = 2
+        client = fast_client()
+        assert client.blob_generation("penguins", "model.json") == 1
+        assert client.breaker.failures == 0
+
+    def test_environment_not_mutated(self, fake_gcs, monkeypatch, tmp_path):
+        """Test credentials are never written to GOOGLE_APPLICATION_CREDENTIALS"""
+        import os
+        monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+        source = GCSModelSource("penguins", "model.json", client=fast_client())
+        source.load()
+        assert "GOOGLE_APPLICATION_CREDENTIALS" not in os.environ
+
+    def test_circuit_opens_and_serves_last_good_model(self, fake_gcs):
+        """Test a GCS outage stops calls and keeps the last GCS model live"""
+        client = fast_client(retry_budget=0.05, breaker=CircuitBreaker(2, reset_timeout=60))
+        registry = ModelRegistry([GCSModelSource("penguins", "model.json", client=client),
+                                  LocalFileModelSource(MODEL_PATH)])
+        good = registry.get()
+        assert good.source == "gs://penguins/model.json"
+
+        fake_gcs.fail_next = 10 ** 6
+        for _ in range(2):
+            assert registry.refresh() is False
+        assert client.breaker.state == "open"
+
+        calls_before = len(fake_gcs.requests)
+        assert registry.refresh() is False
+        assert len(fake_gcs.requests) == calls_before  # circuit open: no request sent
+        assert registry.get() is good  # not downgraded to the bundled file
+        assert client.failures.value == 3  # two failed checks plus one refused by the circuit
+
+    def test_recovers_from_local_fallback(self, fake_gcs):
+        """Test a registry started on the local file upgrades once GCS answers"""
+        client = fast_client(retry_budget=0.05)
+        registry = ModelRegistry([GCSModelSource("penguins", "model.json", client=client),
+                                  LocalFileModelSource(MODEL_PATH)])
+        fake_gcs.fail_next = 10 ** 6
+        assert registry.get().source == MODEL_PATH
+        assert registry.fallbacks.value == 1
+
+        fake_gcs.fail_next = 0
+        assert registry.refresh() is True
+        assert registry.get().source == "gs://penguins/model.json"
@@ -72,7 +72,7 @@ class TestGCSIntegration:
         assert 'Chinstrap' in labels
         assert 'Gentoo' in labels
 
-    @patch('app.main.open', side_effect=FileNotFoundError("File not found"))
+    @patch('app.penguin_model.open', side_effect=FileNotFoundError("File not found"))
     def test_load_columns_and_labels_file_error(self, mock_open):
         """Test error handling when metadata files are missing"""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,77 @@
+# tests/test_health.py
+from unittest.mock import PropertyMock, patch
+from fastapi.testclient import TestClient
+from app.admission import AdmissionController
+from app.main import app, MODEL_PATH
+from app.model_registry import LocalFileModelSource, ModelRegistry
+
+client = TestClient(app)
+
+SAMPLE = {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+          "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"}
+
+
+class TestHealthProbes:
+    """Test the liveness and readiness probes"""
+
+    def test_liveness_always_ok(self):
+        """Test liveness does not depend on the model"""
+        with patch("app.main.model_registry", ModelRegistry([LocalFileModelSource(MODEL_PATH)])):
+            response = client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_not_ready_while_loading(self):
+        """Test readiness is 503 before a model is loaded"""
+        with patch("app.main.model_registry", ModelRegistry([LocalFileModelSource(MODEL_PATH)])):
+            response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "loading"
+        assert response.json()["model_loaded"] is False
+
+    def test_not_ready_until_warmed_up(self):
+        """Test a loaded but cold model is not ready yet"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        registry.load()
+        with patch("app.main.model_registry", registry):
+            assert client.get("/health/ready").status_code == 503
+            registry.warm_up()
+            response = client.get("/health/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["warmed_up"] is True
+        assert body["model_version"] == registry.version
+
+    def test_not_ready_while_shedding(self):
+        """Test readiness stops traffic while admission control is rejecting requests"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        registry.warm_up()
+        controller = AdmissionController(1, max_queue=0)
+        controller.in_flight = 1
+        with patch("app.main.model_registry", registry), patch("app.main.admission", controller):
+            assert client.get("/health/ready").status_code == 200
+            assert client.post("/predict", json=SAMPLE).status_code == 429
+            response = client.get("/health/ready")
+            assert response.status_code == 503
+            assert response.json()["status"] == "saturated" and response.json()["shedding"] is True
+            with patch("app.main.READINESS_SHED_WINDOW_SECONDS", 0):
+                assert client.get("/health/ready").status_code == 200
+
+    def test_not_ready_when_admission_queue_deep(self):
+        """Test readiness stops traffic once enough requests wait for an inference slot"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        registry.warm_up()
+        with patch("app.main.model_registry", registry), patch("app.main.READINESS_MAX_QUEUE_DEPTH", 4), \
+                patch.object(AdmissionController, "queue_depth", new_callable=PropertyMock, return_value=4):
+            response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "saturated"
+        assert response.json()["queue_depth"] == 4
+
+    def test_ready_after_startup(self):
+        """Test the app is ready once its lifespan has run"""
+        with TestClient(app) as started:
+            response = started.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["model_loaded"] is True
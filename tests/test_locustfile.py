@@ -0,0 +1,102 @@
+# tests/test_locustfile.py
+import importlib
+import os
+import sys
+import types
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+def fake_locust() -> types.ModuleType:
+    """Just enough of locust's API for locustfile.py to import
+
+    Importing the real locust monkey-patches the process with gevent,
+    which hangs the rest of the suite, so the shapes are tested without it.
+    """
+    module = types.ModuleType("locust")
+
+    class LoadTestShape:
+        runner = None
+
+        def get_run_time(self):
+            return 0
+
+    module.HttpUser = type("HttpUser", (), {})
+    module.LoadTestShape = LoadTestShape
+    module.task = lambda weight=1: (lambda f: f)
+    module.between = module.constant = module.constant_throughput = lambda *args: args
+    listener = types.SimpleNamespace(add_listener=lambda f: f)
+    module.events = types.SimpleNamespace(test_start=listener, test_stop=listener)
+    return module
+
+
+def load_profile(**env):
+    with patch.dict(os.environ, env), patch.dict(sys.modules, {"locust": fake_locust()}):
+        sys.modules.pop("locustfile", None)
+        try:
+            return importlib.import_module("locustfile")
+        finally:
+            sys.modules.pop("locustfile", None)
+
+
+def tick(module, run_time: float):
+    shape = module.ProfileShape()
+    shape.runner = MagicMock()
+    shape.get_run_time = lambda: run_time
+    return shape.tick()
+
+
+class TestLoadProfiles:
+    """Test the load shapes selected by LOAD_PROFILE"""
+
+    def test_think_profile_has_no_shape(self):
+        """Test the default profile leaves users and spawn rate to the command line"""
+        module = load_profile(LOAD_PROFILE="think")
+        assert not hasattr(module, "ProfileShape")
+        assert module.BATCH_TASK_WEIGHT == 0
+
+    def test_step_profile_ramps_then_stops(self):
+        """Test the step shape adds users each step and holds the top step once"""
+        module = load_profile(LOAD_PROFILE="step", LOAD_USERS="10", LOAD_STEP_USERS="5", LOAD_STEP_SECONDS="10")
+        assert module.profile_stage(0) == ("step-5-users", 5)
+        assert module.profile_stage(15) == ("step-10-users", 10)
+        assert module.profile_stage(25) == ("step-10-users", 10)
+        assert module.profile_stage(30) is None
+
+    def test_spike_profile_phases(self):
+        """Test the spike shape goes baseline, spike, recovery"""
+        module = load_profile(LOAD_PROFILE="spike", LOAD_USERS="5", LOAD_SPIKE_USERS="50",
+                              LOAD_SPIKE_SECONDS="10", LOAD_DURATION_SECONDS="30")
+        assert [module.profile_stage(t)[0] for t in (0, 12, 25)] == ["baseline", "spike", "recovery"]
+        assert module.profile_stage(50) is None
+
+    def test_unknown_profile_rejected(self):
+        """Test a typo in LOAD_PROFILE fails fast"""
+        with pytest.raises(ValueError):
+            load_profile(LOAD_PROFILE="stepp")
+
+
+class TestProfileShape:
+    """Test the LoadTestShape that drives non-think profiles"""
+
+    def test_tick_ramps_at_spawn_rate_and_records_stage(self):
+        """Test tick returns (users, spawn rate) and switches the recorder's stage"""
+        module = load_profile(LOAD_PROFILE="step", LOAD_USERS="10", LOAD_STEP_USERS="5",
+                              LOAD_STEP_SECONDS="10", LOAD_SPAWN_RATE="2")
+        with patch.object(module.recorder, "switch") as switch:
+            assert tick(module, 15) == (10, 2.0)
+        assert switch.call_args.args[1] == "step-10-users"
+
+    def test_spike_spawns_all_at_once(self):
+        """Test the spike phase spawns every user in one second"""
+        module = load_profile(LOAD_PROFILE="spike", LOAD_USERS="5", LOAD_SPIKE_USERS="50",
+                              LOAD_SPIKE_SECONDS="10", LOAD_DURATION_SECONDS="30")
+        with patch.object(module.recorder, "switch"):
+            assert tick(module, 12) == (50, 50)
+
+    def test_tick_stops_after_last_stage(self):
+        """Test tick returns None to end the run"""
+        module = load_profile(LOAD_PROFILE="constant", LOAD_DURATION_SECONDS="60")
+        with patch.object(module.recorder, "switch") as switch:
+            assert tick(module, 60) is None
+        switch.assert_not_called()
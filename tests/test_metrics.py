@@ -0,0 +1,108 @@
+# tests/test_metrics.py
+import threading
+from fastapi.testclient import TestClient
+from app.main import app, MODEL_PATH
+from app.metrics import Counter, Histogram, MetricsRegistry
+from app.model_registry import LocalFileModelSource, ModelRegistry, ModelSource
+
+client = TestClient(app)
+
+PENGUIN = {
+    "bill_length_mm": 39.1,
+    "bill_depth_mm": 18.7,
+    "flipper_length_mm": 181,
+    "body_mass_g": 3750,
+    "year": 2007,
+    "sex": "male",
+    "island": "Torgersen",
+}
+
+
+class FailingSource(ModelSource):
+    name = "failing"
+
+    def load(self, parse=None):
+        raise RuntimeError("source unavailable")
+
+
+def sample(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not in metrics output")
+
+
+class TestMetricPrimitives:
+    """Test the lock-free counter and histogram"""
+
+    def test_counter_sums_across_threads(self):
+        """Test increments from many threads are never lost"""
+        counter = Counter()
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.value == 80000
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations fill cumulative buckets and the +Inf bucket"""
+        histogram = Histogram([0.1, 1.0])
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+        assert snapshot["count"] == 3
+        assert snapshot["sum"] == 5.55
+
+    def test_timer_observes_duration(self):
+        """Test the time() context manager records one observation"""
+        histogram = Histogram([1.0])
+        with histogram.time():
+            pass
+        assert histogram.count == 1
+
+    def test_render_exposition_format(self):
+        """Test counters and labelled histograms render as Prometheus text"""
+        registry = MetricsRegistry()
+        counter = registry.counter("loads_total", "Loads", Counter())
+        counter.inc(2)
+        registry.histogram("stage_seconds", "Stages", Histogram([0.5]), {"stage": "parse"}).observe(0.1)
+        text = registry.render()
+        assert "# TYPE loads_total counter" in text
+        assert "loads_total 2" in text
+        assert 'stage_seconds_bucket{stage="parse",le="0.5"} 1' in text
+        assert 'stage_seconds_count{stage="parse"} 1' in text
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint"""
+
+    def test_stage_histograms_after_predict(self):
+        """Test a prediction is recorded in every stage"""
+        before = client.get("/metrics").text
+        assert client.post("/predict", json=PENGUIN).status_code == 200
+        after = client.get("/metrics").text
+        for stage in ("parse", "preprocess", "model_fetch", "inference", "serialization"):
+            key = f'penguin_stage_seconds_count{{stage="{stage}"}}'
+            assert sample(after, key) > sample(before, key)
+
+    def test_content_type(self):
+        """Test the response uses the Prometheus text format"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "penguin_model_loads_total" in response.text
+        assert "penguin_gcs_failures_total" in response.text
+
+    def test_fallback_load_is_counted(self):
+        """Test loading from the local file after a failed source counts as a fallback"""
+        registry = ModelRegistry([FailingSource(), LocalFileModelSource(MODEL_PATH)])
+        registry.load()
+        assert registry.loads.value == 1
+        assert registry.fallbacks.value == 1
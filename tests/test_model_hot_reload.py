@@ -0,0 +1,147 @@
+# tests/test_model_hot_reload.py
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.main import MODEL_PATH
+from app.model_registry import GCSModelSource, LocalFileModelSource, ModelRegistry, poll_for_updates
+
+
+class FakeBlob:
+    """In-memory stand-in for google.cloud.storage.Blob"""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.generation = None
+        self.etag = None
+
+    def download_as_bytes(self, **kwargs):
+        content, generation = self.store.objects[self.name]
+        self.store.downloads += 1
+        self.generation = generation
+        return content
+
+
+class FakeBucket:
+    def __init__(self, store):
+        self.store = store
+
+    def blob(self, name):
+        return FakeBlob(self.store, name)
+
+    def get_blob(self, name, **kwargs):
+        self.store.metadata_calls += 1
+        if name not in self.store.objects:
+            return None
+        blob = FakeBlob(self.store, name)
+        blob.generation = self.store.objects[name][1]
+        return blob
+
+
+class FakeStorageClient:
+    """Fake storage.Client keeping objects as {name: (content, generation)}"""
+
+    def __init__(self):
+        self.objects = {}
+        self.downloads = 0
+        self.metadata_calls = 0
+        self._next_generation = 1
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def bucket(self, name):
+        return FakeBucket(self)
+
+    def upload(self, name, content):
+        self.objects[name] = (content, self._next_generation)
+        self._next_generation += 1
+
+
+@pytest.fixture
+def model_bytes():
+    with open(MODEL_PATH, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def fake_gcs(model_bytes):
+    fake = FakeStorageClient()
+    fake.upload("model.json", model_bytes)
+    with patch('app.gcs_client.storage.Client', fake):
+        yield fake
+
+
+class TestHotReload:
+    """Test picking up new model uploads without a restart"""
+
+    def test_refresh_without_change_skips_download(self, fake_gcs):
+        """Test an unchanged generation only costs a metadata call"""
+        registry = ModelRegistry([GCSModelSource("bucket", "model.json")])
+        registry.load()
+        assert fake_gcs.downloads == 1
+
+        assert registry.refresh() is False
+        assert fake_gcs.downloads == 1
+        assert fake_gcs.metadata_calls == 1
+
+    def test_refresh_swaps_new_generation(self, fake_gcs, model_bytes):
+        """Test a new upload is downloaded and swapped in"""
+        registry = ModelRegistry([GCSModelSource("bucket", "model.json")])
+        old = registry.get()
+        assert old.version == "model.json@1"
+
+        fake_gcs.upload("model.json", model_bytes)
+        assert registry.refresh() is True
+
+        new = registry.get()
+        assert new.version == "model.json@2"
+        assert new.model is not old.model
+        assert fake_gcs.downloads == 2
+
+    def test_old_model_stays_usable_after_swap(self, fake_gcs, model_bytes):
+        """Test a request holding the old model can still predict after a swap"""
+        registry = ModelRegistry([GCSModelSource("bucket", "model.json")])
+        in_flight = registry.get_model()
+
+        fake_gcs.upload("model.json", model_bytes)
+        registry.refresh()
+
+        import numpy as np
+        assert len(in_flight.predict(np.zeros((1, 9), dtype=np.float32))) == 1
+
+    def test_failed_reload_keeps_current_model(self, fake_gcs):
+        """Test a broken upload leaves the live model in place"""
+        registry = ModelRegistry([GCSModelSource("bucket", "model.json")])
+        current = registry.get()
+
+        fake_gcs.upload("model.json", b"not a model")
+        assert registry.refresh() is False
+        assert registry.get() is current
+
+    def test_metadata_failure_falls_through_to_next_source(self, fake_gcs):
+        """Test an unreachable GCS source defers to the local file"""
+        registry = ModelRegistry([
+            GCSModelSource("bucket", "missing.json"),
+            LocalFileModelSource(MODEL_PATH),
+        ])
+        assert registry.refresh() is True
+        assert registry.get().source == MODEL_PATH
+        assert registry.refresh() is False
+
+    def test_poller_picks_up_upload(self, fake_gcs, model_bytes):
+        """Test the background poller swaps in a new upload"""
+        registry = ModelRegistry([GCSModelSource("bucket", "model.json")])
+        registry.load()
+        fake_gcs.upload("model.json", model_bytes)
+
+        async def run():
+            task = asyncio.create_task(poll_for_updates(registry, 0.01))
+            for _ in range(200):
+                if registry.get().version == "model.json@2":
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+
+        asyncio.run(run())
+        assert registry.get().version == "model.json@2"
@@ -0,0 +1,170 @@
+# tests/test_model_registry.py
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from app.main import app, model_registry, MODEL_PATH
+from app.model_registry import (
+    GCSModelSource, LocalFileModelSource, ModelRegistry, ModelSource,
+    detect_model_format, load_from_sources, load_model_from_bytes
+)
+
+
+class FailingSource(ModelSource):
+    name = "failing"
+
+    def load(self, parse=None):
+        raise RuntimeError("source unavailable")
+
+
+class TestModelSources:
+    """Test the pluggable model sources"""
+
+    def test_local_source_loads_model(self):
+        """Test the local file source returns a usable model and a version"""
+        loaded = LocalFileModelSource(MODEL_PATH).load()
+        assert loaded.model is not None
+        assert loaded.version.startswith("model.json@")
+        assert loaded.source == MODEL_PATH
+
+    def test_local_source_version_is_stable(self):
+        """Test the same file always reports the same version"""
+        source = LocalFileModelSource(MODEL_PATH)
+        assert source.load().version == source.load().version
+
+    @patch('app.gcs_client.storage.Client')
+    def test_gcs_source_uses_blob_generation(self, mock_client):
+        """Test the GCS source versions the model by blob generation"""
+        with open(MODEL_PATH, "rb") as f:
+            content = f.read()
+        mock_blob = MagicMock()
+        mock_blob.download_as_bytes.return_value = content
+        mock_blob.generation = 42
+        mock_client.return_value.bucket.return_value.blob.return_value = mock_blob
+
+        loaded = GCSModelSource("bucket", "model.json").load()
+        assert loaded.version == "model.json@42"
+        assert loaded.source == "gs://bucket/model.json"
+
+    def test_fallback_to_next_source(self):
+        """Test a failing source falls through to the next one"""
+        loaded = load_from_sources([FailingSource(), LocalFileModelSource(MODEL_PATH)])
+        assert loaded.source == MODEL_PATH
+        assert loaded.load_time_seconds > 0
+
+    def test_all_sources_fail(self):
+        """Test an error is raised when no source can load"""
+        with pytest.raises(RuntimeError):
+            load_from_sources([FailingSource()])
+
+
+class TestModelRegistry:
+    """Test the process-wide model registry"""
+
+    def test_registry_loads_once(self):
+        """Test repeated lookups reuse the same model without reloading"""
+        source = LocalFileModelSource(MODEL_PATH)
+        registry = ModelRegistry([source])
+        with patch.object(source, "load", wraps=source.load) as load:
+            first = registry.get_model()
+            second = registry.get_model()
+        assert first is second
+        assert load.call_count == 1
+
+    def test_registry_info_before_load(self):
+        """Test info reports an unloaded registry"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        assert registry.info() == {"loaded": False}
+        assert not registry.is_loaded
+
+    def test_registry_info_after_load(self):
+        """Test info reports version and load time"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        registry.load()
+        info = registry.info()
+        assert info["loaded"] is True
+        assert info["version"].startswith("model.json@")
+        assert info["load_time_seconds"] > 0
+
+
+class TestModelEndpoint:
+    """Test the model info endpoint and startup loading"""
+
+    def test_lifespan_loads_model(self):
+        """Test the model is loaded at startup and reported by /model"""
+        with TestClient(app) as client:
+            assert model_registry.is_loaded
+            response = client.get("/model")
+        assert response.status_code == 200
+        assert response.json()["loaded"] is True
+
+    def test_predict_does_not_reload_model(self):
+        """Test /predict serves from the registry without loading again"""
+        sample_data = {
+            "bill_length_mm": 39.1,
+            "bill_depth_mm": 18.7,
+            "flipper_length_mm": 181,
+            "body_mass_g": 3750,
+            "year": 2007,
+            "sex": "male",
+            "island": "Torgersen"
+        }
+        with TestClient(app) as client:
+            with patch('app.model_registry.load_from_sources') as load:
+                for _ in range(3):
+                    assert client.post("/predict", json=sample_data).status_code == 200
+        load.assert_not_called()
+
+
+class TestInMemoryLoading:
+    """Test loading models from memory buffers without touching disk"""
+
+    def setup_method(self):
+        with open(MODEL_PATH, "rb") as f:
+            self.json_bytes = f.read()
+        self.ubj_bytes = bytes(
+            load_model_from_bytes(self.json_bytes).get_booster().save_raw(raw_format="ubj")
+        )
+
+    def test_detect_model_format(self):
+        """Test JSON and UBJSON payloads are told apart"""
+        assert detect_model_format(self.json_bytes) == "json"
+        assert detect_model_format(self.ubj_bytes) == "ubj"
+
+    def test_detect_model_format_rejects_garbage(self):
+        """Test non-model payloads are rejected before reaching XGBoost"""
+        with pytest.raises(ValueError):
+            detect_model_format(b"not a model")
+
+    @pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+    def test_load_from_buffer_types(self, wrap):
+        """Test bytes, bytearray and memoryview buffers all load"""
+        model = load_model_from_bytes(wrap(self.json_bytes))
+        assert model.get_booster().num_features() == 9
+
+    def test_ubj_matches_json_predictions(self):
+        """Test the UBJSON model predicts exactly like the JSON one"""
+        import numpy as np
+        X = np.array([[39.1, 18.7, 181, 3750, 0, 1, 0, 0, 1],
+                      [46.1, 13.2, 211, 4500, 0, 1, 1, 0, 0]], dtype=np.float32)
+        json_model = load_model_from_bytes(self.json_bytes)
+        ubj_model = load_model_from_bytes(self.ubj_bytes)
+        assert (json_model.predict_proba(X) == ubj_model.predict_proba(X)).all()
+
+    @patch('app.gcs_client.storage.Client')
+    def test_gcs_load_writes_no_files(self, mock_client, tmp_path, monkeypatch):
+        """Test a GCS load never opens a file for writing"""
+        mock_blob = MagicMock()
+        mock_blob.download_as_bytes.return_value = self.ubj_bytes
+        mock_blob.generation = 7
+        mock_client.return_value.bucket.return_value.blob.return_value = mock_blob
+
+        import builtins
+        real_open = builtins.open
+
+        def guarded_open(file, mode="r", *args, **kwargs):
+            assert "w" not in mode and "a" not in mode, f"unexpected write to {file}"
+            return real_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", guarded_open)
+        loaded = GCSModelSource("bucket", "model.ubj").load()
+        assert loaded.version == "model.ubj@7"
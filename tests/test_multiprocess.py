@@ -0,0 +1,77 @@
+# tests/test_multiprocess.py
+import importlib.util
+import os
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.main import model_registry, preload_model
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def load_gunicorn_config():
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", os.path.join(ROOT, "gunicorn.conf.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestGunicornConfig:
+    """Test the pre-fork serving configuration"""
+
+    def test_preload_enabled(self):
+        """Test the app is imported once in the master"""
+        config = load_gunicorn_config()
+        assert config.preload_app is True
+        assert config.worker_class == "uvicorn.workers.UvicornWorker"
+
+    @patch.dict(os.environ, {"WEB_CONCURRENCY": "3", "PORT": "9000"})
+    def test_workers_and_port_from_env(self):
+        """Test worker count and port follow the environment"""
+        config = load_gunicorn_config()
+        assert config.workers == 3
+        assert config.bind == "0.0.0.0:9000"
+
+    def test_when_ready_preloads_model(self):
+        """Test the master hook loads the model before workers fork"""
+        config = load_gunicorn_config()
+        server = type("Server", (), {"log": type("Log", (), {"info": lambda self, msg: None})()})()
+        with patch("app.main.preload_model") as preload:
+            config.when_ready(server)
+        preload.assert_called_once()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+class TestForkedWorkers:
+    """Test workers forked after preloading share the parent's model"""
+
+    def test_forked_worker_serves_without_loading(self):
+        """Test a forked child predicts with the inherited model and never reloads"""
+        preload_model()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            status = 1
+            try:
+                os.close(read_fd)
+                with patch("app.model_registry.load_from_sources", side_effect=AssertionError("reload")):
+                    probabilities = model_registry.get_model().predict_proba(np.zeros((1, 9), dtype=np.float32))
+                os.write(write_fd, str(probabilities.shape).encode())
+                status = 0
+            finally:
+                os._exit(status)
+
+        os.close(write_fd)
+        output = os.read(read_fd, 100).decode()
+        os.close(read_fd)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert output == "(1, 3)"
+
+    def test_preload_starts_no_threads(self):
+        """Test preloading leaves no extra threads to be lost across fork"""
+        import threading
+        before = threading.active_count()
+        preload_model()
+        assert threading.active_count() == before
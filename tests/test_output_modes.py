@@ -0,0 +1,71 @@
+# tests/test_output_modes.py
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app, label_classes, predict_proba
+
+client = TestClient(app)
+
+SAMPLES = [
+    {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+     "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"},
+    {"bill_length_mm": 50.0, "bill_depth_mm": 15.2, "flipper_length_mm": 230,
+     "body_mass_g": 6050, "year": 2008, "sex": "male", "island": "Biscoe"},
+]
+
+
+class TestSingleOutputModes:
+    """Test probability and top-k output on /predict"""
+
+    def test_default_is_label_only(self):
+        """Test the response is unchanged without the options"""
+        assert client.post("/predict", json=SAMPLES[0]).json() == {"prediction": "Adelie"}
+
+    def test_probabilities_for_every_class(self):
+        """Test probabilities are keyed by label and agree with the prediction"""
+        body = client.post("/predict?return_probabilities=true", json=SAMPLES[0]).json()
+        probabilities = body["probabilities"]
+        assert set(probabilities) == set(label_classes)
+        assert sum(probabilities.values()) == pytest.approx(1.0, abs=1e-5)
+        assert max(probabilities, key=probabilities.get) == body["prediction"]
+
+    def test_top_k_sorted_by_probability(self):
+        """Test top-k lists the k most likely classes, prediction first"""
+        body = client.post("/predict?top_k=2", json=SAMPLES[1]).json()
+        top = body["top_k"]
+        assert len(top) == 2
+        assert top[0]["label"] == body["prediction"]
+        assert top[0]["probability"] >= top[1]["probability"]
+
+    def test_top_k_larger_than_classes(self):
+        """Test k beyond the number of classes returns every class"""
+        body = client.post("/predict?top_k=10", json=SAMPLES[0]).json()
+        assert [entry["label"] for entry in body["top_k"]][0] == "Adelie"
+        assert len(body["top_k"]) == len(label_classes)
+
+    def test_top_k_must_be_positive(self):
+        """Test top_k=0 is rejected"""
+        assert client.post("/predict?top_k=0", json=SAMPLES[0]).status_code == 422
+
+
+class TestBatchOutputModes:
+    """Test probability and top-k output on /predict/batch"""
+
+    def test_one_model_call_for_all_outputs(self):
+        """Test labels, probabilities and top-k come from a single inference call"""
+        with patch("app.main.predict_proba", wraps=predict_proba) as model_call:
+            response = client.post("/predict/batch", json={
+                "instances": SAMPLES, "return_probabilities": True, "top_k": 3,
+            })
+        assert response.status_code == 200
+        assert model_call.call_count == 1
+
+        body = response.json()
+        for label, probabilities, top in zip(body["predictions"], body["probabilities"], body["top_k"]):
+            assert top[0]["label"] == label
+            assert [entry["probability"] for entry in top] == pytest.approx(sorted(probabilities, reverse=True))
+
+    def test_invalid_top_k(self):
+        """Test a non-positive top_k fails validation"""
+        response = client.post("/predict/batch", json={"instances": SAMPLES, "top_k": 0})
+        assert response.status_code == 422
@@ -0,0 +1,107 @@
+# tests/test_prediction_cache.py
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app, batcher, model_registry, prediction_cache, PenguinFeatures
+from app.prediction_cache import PredictionCache
+
+SAMPLE = {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+          "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"}
+
+
+def features(**overrides):
+    return PenguinFeatures(**dict(SAMPLE, **overrides))
+
+
+class TestCacheKey:
+    """Test canonicalisation of inputs into cache keys"""
+
+    def test_rounding_merges_close_measurements(self):
+        """Test values equal after rounding share a key"""
+        cache = PredictionCache(10, float_decimals=1)
+        assert cache.key(features(bill_length_mm=39.14)) == cache.key(features(bill_length_mm=39.06))
+        assert cache.key(features(bill_length_mm=39.14)) != cache.key(features(bill_length_mm=39.2))
+
+    def test_exact_keys_without_rounding(self):
+        """Test float_decimals=None keeps floats exact"""
+        cache = PredictionCache(10, float_decimals=None)
+        assert cache.key(features(bill_length_mm=39.14)) != cache.key(features(bill_length_mm=39.13))
+
+    def test_key_is_hashable_and_uses_enum_values(self):
+        """Test keys are plain hashable tuples"""
+        key = PredictionCache(10).key(features())
+        hash(key)
+        assert "male" in key and "Torgersen" in key
+
+
+class TestCacheBehaviour:
+    """Test LRU, TTL and version invalidation"""
+
+    def test_hit_and_miss_counters(self):
+        """Test lookups are counted as hits and misses"""
+        cache = PredictionCache(10)
+        assert cache.get("a", "v1") is None
+        cache.put("a", "v1", 1)
+        assert cache.get("a", "v1") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = PredictionCache(2)
+        cache.get("a", "v1")
+        cache.put("a", "v1", 1)
+        cache.put("b", "v1", 2)
+        cache.get("a", "v1")  # a is now most recent
+        cache.put("c", "v1", 3)
+        assert cache.get("b", "v1") is None
+        assert cache.get("a", "v1") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = PredictionCache(10, ttl_seconds=5)
+        cache.get("a", "v1")
+        with patch("app.prediction_cache.time.monotonic", return_value=100.0):
+            cache.put("a", "v1", 1)
+        with patch("app.prediction_cache.time.monotonic", return_value=104.0):
+            assert cache.get("a", "v1") == 1
+        with patch("app.prediction_cache.time.monotonic", return_value=106.0):
+            assert cache.get("a", "v1") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_new_model_version_invalidates(self):
+        """Test a model version change empties the cache"""
+        cache = PredictionCache(10)
+        cache.get("a", "v1")
+        cache.put("a", "v1", 1)
+        assert cache.get("a", "v2") is None
+        assert len(cache) == 0
+        assert cache.stats()["invalidations"] == 1
+
+    def test_put_from_stale_version_ignored(self):
+        """Test results computed under an old model are not stored"""
+        cache = PredictionCache(10)
+        cache.get("a", "v2")
+        cache.put("a", "v1", 1)
+        assert cache.get("a", "v2") is None
+
+
+class TestCachedEndpoint:
+    """Test /predict served from the cache"""
+
+    def test_repeated_input_skips_model(self, monkeypatch):
+        """Test a repeated request is answered without inference"""
+        monkeypatch.setattr(prediction_cache, "max_entries", 100)
+        monkeypatch.setattr(prediction_cache, "_entries", type(prediction_cache._entries)())
+        client = TestClient(app)
+        model_registry.get()
+
+        first = client.post("/predict", json=SAMPLE).json()
+        with patch.object(batcher, "submit", side_effect=AssertionError("model called")):
+            second = client.post("/predict", json=SAMPLE).json()
+
+        assert first == second
+        stats = client.get("/stats").json()["prediction_cache"]
+        assert stats["hits"] >= 1
+        assert stats["model_version"] == model_registry.version
@@ -0,0 +1,86 @@
+# tests/test_profiling.py
+import os
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.admission import AdmissionController
+from app.main import app
+from app.profiling import RequestProfiler
+
+client = TestClient(app)
+
+PENGUIN = {
+    "bill_length_mm": 39.1,
+    "bill_depth_mm": 18.7,
+    "flipper_length_mm": 181,
+    "body_mass_g": 3750,
+    "year": 2007,
+    "sex": "male",
+    "island": "Torgersen",
+}
+TOKEN = {"X-Profile-Token": "secret"}
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+    with patch("app.main.PROFILE_TOKEN", "secret"), patch("app.main.profiler", profiler):
+        yield profiler
+
+
+class TestRequestProfiler:
+    """Test on-demand profiling of /predict"""
+
+    def test_disabled_without_token(self):
+        """Test the admin endpoint does not exist unless PROFILE_TOKEN is set"""
+        with patch("app.main.PROFILE_TOKEN", ""):
+            assert client.post("/admin/profile", headers=TOKEN).status_code == 404
+
+    def test_wrong_token_rejected(self, profiler):
+        """Test a bad token cannot arm the profiler"""
+        response = client.post("/admin/profile", headers={"X-Profile-Token": "guess"})
+        assert response.status_code == 403
+        assert profiler.remaining == 0
+
+    def test_profiles_only_the_next_n_requests(self, profiler):
+        """Test exactly N requests are captured and merged"""
+        assert client.post("/admin/profile?requests=2", headers=TOKEN).json() == {"profiling": 2}
+        for _ in range(3):
+            response = client.post("/predict", json=PENGUIN)
+            assert response.status_code == 200
+            assert response.json() == {"prediction": "Adelie"}
+
+        report = client.get("/admin/profile", headers=TOKEN).json()
+        assert report["captured"] == 2
+        assert report["remaining"] == 0
+        assert report["complete"] is True
+        assert "predict_proba" in report["stats"]
+        assert "score_profiled" in report["stats"]
+
+    def test_stats_saved_when_complete(self, profiler, tmp_path):
+        """Test the merged profile is written to the output directory"""
+        client.post("/admin/profile?requests=1", headers=TOKEN)
+        client.post("/predict", json=PENGUIN)
+        saved_to = client.get("/admin/profile", headers=TOKEN).json()["saved_to"]
+        assert saved_to is not None
+        assert os.path.dirname(saved_to) == str(tmp_path)
+        assert os.path.getsize(saved_to) > 0
+
+    def test_shed_request_keeps_its_slot(self, profiler):
+        """Test a profiled request rejected by admission control leaves the slot for the next one"""
+        client.post("/admin/profile?requests=1", headers=TOKEN)
+        shedding = AdmissionController(1, max_queue=0)
+        shedding.in_flight = 1
+        with patch("app.main.admission", shedding):
+            assert client.post("/predict", json=PENGUIN).status_code == 429
+        assert client.post("/predict", json=PENGUIN, headers={"X-Request-Timeout-Ms": "0.001"}).status_code == 504
+        assert profiler.remaining == 1
+        assert client.post("/predict", json=PENGUIN).status_code == 200
+
+        report = client.get("/admin/profile", headers=TOKEN).json()
+        assert report["captured"] == 1 and report["complete"] is True
+        assert report["saved_to"] is not None
+
+    def test_idle_profiler_claims_nothing(self):
+        """Test an unarmed profiler never takes a request"""
+        assert RequestProfiler().claim() is False
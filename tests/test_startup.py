@@ -0,0 +1,63 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.main import app, model_registry, MODEL_PATH
+from app.model_registry import LocalFileModelSource, ModelRegistry, load_compiled_from_bytes
+from app.tree_engine import CompiledTreeModel
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def modules_after(code: str) -> list:
+    """Heavy modules present in a fresh interpreter after running ``code``"""
+    script = code + (
+        "\nimport sys, json"
+        "\nprint(json.dumps([m for m in ('xgboost', 'pandas', 'sklearn', 'google.cloud.storage')"
+        " if m in sys.modules]))"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    """Test heavy dependencies stay off the startup path"""
+
+    def test_importing_app_skips_heavy_modules(self):
+        """Test importing app.main loads neither xgboost, pandas nor the GCS client"""
+        assert modules_after("import app.main") == []
+
+    def test_compiled_backend_never_imports_xgboost(self):
+        """Test a JSON model reaches the compiled evaluator without xgboost"""
+        loaded = modules_after(
+            "from app.model_registry import LocalFileModelSource, ModelRegistry\n"
+            f"ModelRegistry([LocalFileModelSource({MODEL_PATH!r})], backend='compiled').warm_up()"
+        )
+        assert "xgboost" not in loaded
+
+
+class TestWarmUp:
+    """Test the model is warmed up before serving"""
+
+    def test_compiled_parser_reads_json(self):
+        """Test the xgboost-free parser returns a working compiled model"""
+        with open(MODEL_PATH, "rb") as f:
+            model = load_compiled_from_bytes(f.read())
+        assert isinstance(model, CompiledTreeModel)
+        assert model.n_features_in_ == 9
+
+    def test_registry_warm_up(self):
+        """Test warming up loads the model and marks the registry warm"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)])
+        assert registry.warm_up() >= 0
+        assert registry.is_loaded
+        assert registry.warmed_up
+
+    def test_lifespan_warms_up_before_serving(self):
+        """Test the model is warm by the time the app accepts requests"""
+        with TestClient(app) as client:
+            assert model_registry.warmed_up
+            assert client.get("/health").status_code == 200
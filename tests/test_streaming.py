@@ -0,0 +1,148 @@
+# tests/test_streaming.py
+import asyncio
+import json
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app, score_batch, stream_rows, stream_row_errors
+from app.streaming import iter_lines
+
+client = TestClient(app)
+
+SAMPLES = [
+    {"bill_length_mm": 39.1, "bill_depth_mm": 18.7, "flipper_length_mm": 181,
+     "body_mass_g": 3750, "year": 2007, "sex": "male", "island": "Torgersen"},
+    {"bill_length_mm": 50.0, "bill_depth_mm": 15.2, "flipper_length_mm": 230,
+     "body_mass_g": 6050, "year": 2008, "sex": "male", "island": "Biscoe"},
+]
+NDJSON = {"content-type": "application/x-ndjson"}
+CSV = {"content-type": "text/csv"}
+CSV_HEADER = "island,sex,year,bill_length_mm,bill_depth_mm,flipper_length_mm,body_mass_g\n"
+
+
+def ndjson_body(rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def csv_body(rows) -> bytes:
+    lines = [",".join(str(row[name]) for name in CSV_HEADER.strip().split(",")) for row in rows]
+    return (CSV_HEADER + "\n".join(lines) + "\n").encode()
+
+
+def in_pieces(body: bytes, size: int):
+    """Request body sent as many small chunks, splitting lines"""
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def read_lines(chunks, max_line_bytes=65536):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_lines(source(), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+class TestIterLines:
+    """Test incremental line splitting"""
+
+    def test_lines_split_across_chunks(self):
+        """Test lines are reassembled whatever the chunk boundaries, with CRLF stripped"""
+        assert read_lines([b"ab", b"c\r\nde", b"f\n", b"g"]) == [(1, b"abc"), (2, b"def"), (3, b"g")]
+
+    def test_overlong_line_is_dropped(self):
+        """Test a line over the limit is yielded as None without being buffered"""
+        lines = read_lines([b"ok\n", b"x" * 10, b"x" * 10, b"\nfine\n"], max_line_bytes=8)
+        assert lines == [(1, b"ok"), (2, None), (3, b"fine")]
+
+
+class TestStreamPredict:
+    """Test the streaming NDJSON/CSV endpoint"""
+
+    def test_ndjson_matches_batch_endpoint(self):
+        """Test streamed predictions agree with /predict/batch, one record per line"""
+        response = client.post("/predict/stream", content=in_pieces(ndjson_body(SAMPLES * 3), 17), headers=NDJSON)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        batch = client.post("/predict/batch", json={"instances": SAMPLES * 3}).json()
+        assert [r["line"] for r in records] == [1, 2, 3, 4, 5, 6]
+        assert [r["prediction"] for r in records] == batch["predictions"]
+
+    def test_ndjson_probabilities(self):
+        """Test return_probabilities adds a label-keyed probability map"""
+        response = client.post("/predict/stream?return_probabilities=true", content=ndjson_body(SAMPLES),
+                               headers=NDJSON)
+        record = json.loads(response.text.splitlines()[0])
+        assert max(record["probabilities"], key=record["probabilities"].get) == record["prediction"]
+
+    def test_invalid_rows_are_reported_inline(self):
+        """Test bad rows become error records and the rest are still scored"""
+        bad = dict(SAMPLES[0], sex="unknown")
+        body = ndjson_body([SAMPLES[0]]) + b"{not json\n\n" + ndjson_body([bad, SAMPLES[1]])
+        errors_before = stream_row_errors.value
+        records = [json.loads(line) for line in client.post("/predict/stream", content=body,
+                                                            headers=NDJSON).text.splitlines()]
+        assert [r["line"] for r in records] == [1, 2, 4, 5]
+        assert "error" in records[1] and "sex" in records[2]["error"]
+        assert records[3]["prediction"] == "Gentoo"
+        assert stream_row_errors.value - errors_before == 2
+
+    def test_csv_in_csv_out(self):
+        """Test a CSV body is scored and answered as CSV"""
+        response = client.post("/predict/stream?return_probabilities=true",
+                               content=in_pieces(csv_body(SAMPLES), 5), headers=CSV)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0] == "line,prediction,probability_Adelie,probability_Chinstrap,probability_Gentoo,error"
+        assert [line.split(",")[:2] for line in lines[1:]] == [["2", "Adelie"], ["3", "Gentoo"]]
+
+    def test_csv_header_missing_columns(self):
+        """Test a CSV header without the required columns is rejected before streaming"""
+        response = client.post("/predict/stream", content=b"island,sex\nDream,male\n", headers=CSV)
+        assert response.status_code == 422
+        assert "bill_length_mm" in response.json()["detail"]
+
+    def test_empty_csv_body(self):
+        """Test a CSV body with no header row at all is a 422, not a server error"""
+        response = client.post("/predict/stream", content=b"", headers=CSV)
+        assert response.status_code == 422
+        assert response.json()["detail"] == "CSV body has no header row"
+
+    def test_empty_ndjson_body(self):
+        """Test an empty NDJSON body streams back no records"""
+        response = client.post("/predict/stream", content=b"", headers=NDJSON)
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_malformed_csv_row_is_reported_inline(self):
+        """Test a stray carriage return breaks only its own row, not the stream"""
+        lines = csv_body(SAMPLES).decode().splitlines(keepends=True)
+        body = (lines[0] + lines[1] + lines[2].replace("Biscoe", "Bis\rcoe") + lines[1]).encode()
+        response = client.post("/predict/stream", content=body, headers=CSV)
+        assert response.status_code == 200
+        rows = response.text.splitlines()[1:]
+        assert [row.split(",")[0] for row in rows] == ["2", "3", "4"]
+        assert rows[0].split(",")[1] == "Adelie" and rows[2].split(",")[1] == "Adelie"
+        assert "malformed CSV record" in rows[1]
+
+    def test_malformed_csv_header(self):
+        """Test a stray carriage return in the header row is a 422"""
+        body = CSV_HEADER.replace("island", "is\rland").encode() + csv_body(SAMPLES).split(b"\n", 1)[1]
+        assert client.post("/predict/stream", content=body, headers=CSV).status_code == 422
+
+    def test_unsupported_content_type(self):
+        """Test a plain JSON body is refused with 415"""
+        assert client.post("/predict/stream", json=SAMPLES[0]).status_code == 415
+
+    def test_scored_in_fixed_size_chunks(self):
+        """Test the model is called once per STREAM_CHUNK_ROWS rows, not once per body"""
+        rows_before = stream_rows.value
+        with patch("app.main.STREAM_CHUNK_ROWS", 4), patch("app.main.score_batch", wraps=score_batch) as score:
+            response = client.post("/predict/stream", content=ndjson_body(SAMPLES * 5), headers=NDJSON)
+        assert len(response.text.splitlines()) == 10
+        assert [len(call.args[0]) for call in score.call_args_list] == [4, 4, 2]
+        assert stream_rows.value - rows_before == 10
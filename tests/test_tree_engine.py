@@ -0,0 +1,141 @@
+# tests/test_tree_engine.py
+import json
+import numpy as np
+import pytest
+import xgboost as xgb
+from unittest.mock import patch
+from app.main import MODEL_PATH, expected_columns
+from app.model_registry import LocalFileModelSource, ModelRegistry
+from app.tree_engine import CompiledTreeModel, HybridTreeModel
+
+# Per-species measurement ranges (Palmer Penguins), as used by the load tests
+SPECIES_RANGES = [
+    ((32.1, 46.0), (15.5, 21.5), (172, 210), (2850, 4775)),  # Adelie
+    ((40.9, 58.0), (16.4, 20.8), (178, 212), (2700, 4800)),  # Chinstrap
+    ((40.9, 59.6), (13.1, 17.3), (203, 231), (3950, 6300)),  # Gentoo
+]
+
+
+def penguin_rows(n_per_species=300, seed=0):
+    rng = np.random.default_rng(seed)
+    blocks = []
+    for ranges in SPECIES_RANGES:
+        numeric = np.column_stack([rng.uniform(lo, hi, n_per_species) for lo, hi in ranges])
+        sex = rng.integers(0, 2, n_per_species)
+        island = rng.integers(0, 3, n_per_species)
+        one_hot = np.zeros((n_per_species, 5))
+        one_hot[np.arange(n_per_species), sex] = 1
+        one_hot[np.arange(n_per_species), 2 + island] = 1
+        blocks.append(np.hstack([numeric, one_hot]))
+    return np.vstack(blocks).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def xgb_model():
+    model = xgb.XGBClassifier()
+    model.load_model(MODEL_PATH)
+    return model
+
+
+@pytest.fixture(scope="module")
+def compiled(xgb_model):
+    return CompiledTreeModel.from_booster(xgb_model)
+
+
+class TestCompiledAgreement:
+    """Test the compiled backend agrees with XGBoost"""
+
+    def test_structure(self, compiled):
+        """Test the flattened model matches the trained ensemble"""
+        assert compiled.n_features_in_ == len(expected_columns)
+        assert compiled.n_classes == 3
+        assert len(compiled.roots) == 300  # 100 rounds x 3 classes
+        assert compiled.max_depth == 3
+
+    def test_probabilities_match(self, xgb_model, compiled):
+        """Test predict_proba agrees within float32 tolerance on penguin-like data"""
+        X = penguin_rows()
+        np.testing.assert_allclose(compiled.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+        np.testing.assert_array_equal(compiled.predict(X), xgb_model.predict(X))
+
+    def test_split_thresholds_exact(self, xgb_model, compiled):
+        """Test values exactly on a split threshold follow XGBoost (x < t goes left)"""
+        X = penguin_rows(20)
+        X = np.repeat(X, 2, axis=0)
+        thresholds = compiled.threshold[~compiled.is_leaf]
+        features = compiled.feature[~compiled.is_leaf]
+        for i in range(0, len(X), 2):
+            j = i % len(thresholds)
+            X[i, features[j]] = thresholds[j]
+        np.testing.assert_allclose(compiled.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_missing_values_use_default_direction(self, xgb_model, compiled):
+        """Test NaN inputs follow each split's default branch"""
+        X = penguin_rows(50)
+        X[::3, 0] = np.nan
+        X[1::4, 2] = np.nan
+        np.testing.assert_allclose(compiled.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_single_row(self, xgb_model, compiled):
+        """Test a single row gives the same answer"""
+        X = penguin_rows(1)[:1]
+        np.testing.assert_allclose(compiled.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_binary_logistic(self):
+        """Test a binary:logistic model compiles and agrees"""
+        X = penguin_rows(100, seed=1)
+        y = (X[:, 0] > 45).astype(int)
+        model = xgb.XGBClassifier(n_estimators=20, max_depth=4, verbosity=0).fit(X, y)
+        compiled = CompiledTreeModel.from_booster(model)
+        X_test = penguin_rows(40, seed=2)
+        np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), atol=1e-6)
+
+    def test_unsupported_model_rejected(self, xgb_model):
+        """Test a model the compiled evaluator can't represent raises ValueError"""
+        model = json.loads(bytes(xgb_model.get_booster().save_raw(raw_format="json")))
+        model["learner"]["objective"]["name"] = "multi:softmax"
+        with pytest.raises(ValueError, match="multi:softmax"):
+            CompiledTreeModel.from_json(model)
+
+    def test_wrong_shape_rejected(self, compiled):
+        """Test inputs with the wrong number of features are rejected"""
+        with pytest.raises(ValueError):
+            compiled.predict_proba(np.zeros((1, 4), dtype=np.float32))
+
+
+class TestBackendSelection:
+    """Test choosing the compiled backend through the registry"""
+
+    def test_registry_compiled_backend(self, xgb_model):
+        """Test the registry serves a compiled model when configured"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)], backend="compiled")
+        model = registry.get_model()
+        assert isinstance(model, CompiledTreeModel)
+        assert registry.info()["backend"] == "compiled"
+        X = penguin_rows(5)
+        np.testing.assert_allclose(model.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_auto_backend_dispatches_by_batch_size(self, xgb_model):
+        """Test the auto backend uses the compiled path only for small batches"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)], backend="auto")
+        model = registry.get_model()
+        assert isinstance(model, HybridTreeModel)
+        small, large = penguin_rows(1)[:4], penguin_rows(20)
+        assert model._pick(small) is model.compiled
+        assert model._pick(large) is model.native
+        for X in (small, large):
+            np.testing.assert_allclose(model.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_auto_backend_falls_back_to_native(self, xgb_model):
+        """Test auto serves the native model when it can't be compiled"""
+        registry = ModelRegistry([LocalFileModelSource(MODEL_PATH)], backend="auto")
+        with patch("app.tree_engine.CompiledTreeModel.from_json", side_effect=ValueError("unsupported")):
+            model = registry.get_model()
+        assert isinstance(model, xgb.XGBClassifier)
+        X = penguin_rows(2)
+        np.testing.assert_allclose(model.predict_proba(X), xgb_model.predict_proba(X), atol=1e-6)
+
+    def test_unknown_backend_rejected(self):
+        """Test a misspelt backend fails fast"""
+        with pytest.raises(ValueError):
+            ModelRegistry([LocalFileModelSource(MODEL_PATH)], backend="treelite")
@@ -57,3 +57,7 @@ print(classification_report(y_test, model.predict(X_test), target_names=label_en
 # Save trained model
 model.save_model("app/data/model.json")
 print("Model saved to app/data/model.json")
+
+# Binary UBJSON copy: same model, faster to parse at serving time
+model.save_model("app/data/model.ubj")
+print("Model saved to app/data/model.ubj")